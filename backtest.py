@@ -0,0 +1,185 @@
+# BACKTESTING
+# Replays archived weeks from the history store: how the SMASH/LEVERAGE/CHALK
+# calls and the lineups actually played scored once real points came in.
+#
+# Each (season, week, platform) is scored independently, so stale weeks run
+# in parallel worker processes. Results are cached in the same SQLite file
+# against the week's revision (bumped whenever its players, actuals or
+# lineups change), so adding a week costs one week of compute.
+#
+# Usage: python backtest.py [--db fantasy_history.db] [--period "All Time"] [--workers N]
+
+import argparse
+import os
+import sqlite3
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from history_store import DEFAULT_PATH, PERIODS
+from optimizer import DEFAULT_SALARY_CAP, ROSTER_SLOTS
+from platforms import get_rules
+from simulation import build_field
+
+# A play "hits" when it scores at least this share of its projection
+SUCCESS_THRESHOLD = 0.9
+
+# Simulated contest each week's lineups are entered into
+BACKTEST_FIELD_SIZE = 5000
+
+# (top share of the field, payout as a multiple of the entry fee), best first.
+# Roughly a large-field GPP: pays the top 20% and returns 83% of entry fees.
+PAYOUT_TIERS = [(0.001, 150.0), (0.01, 20.0), (0.05, 5.0), (0.20, 2.0)]
+
+BACKTEST_PLAY_TYPES = {'smash': 'SMASH_PLAY', 'leverage': 'LEVERAGE_PLAY', 'chalk': 'CHALK_PLAY'}
+
+# =====================================
+# ONE WEEK
+# =====================================
+
+def payout_multiple(finish_share):
+    """Entry-fee multiple for finishing in the top finish_share of the field"""
+    for top_share, multiple in PAYOUT_TIERS:
+        if finish_share <= top_share:
+            return multiple
+    return 0.0
+
+def score_week(players, lineups, field_size=BACKTEST_FIELD_SIZE, salary_cap=DEFAULT_SALARY_CAP, seed=0,
+               roster_slots=ROSTER_SLOTS):
+    """Backtest metrics for one week's archived players and played lineups"""
+    projected = players['projected_points'].to_numpy(dtype=np.float64)
+    actual = players['actual_points'].to_numpy(dtype=np.float64)
+    ownership = players['ownership_pct'].to_numpy(dtype=np.float64)
+    play_types = players['play_type'].to_numpy(dtype=object)
+    scored = ~np.isnan(actual)
+    hit = scored & (actual >= projected * SUCCESS_THRESHOLD)
+
+    metrics = {'players': len(players), 'players_scored': int(scored.sum())}
+    for label, play_type in BACKTEST_PLAY_TYPES.items():
+        mask = (play_types == play_type) & scored
+        metrics[f'{label}_plays'] = int(mask.sum())
+        metrics[f'{label}_success_rate'] = float(100 * hit[mask].mean()) if mask.any() else None
+
+    recommended = np.isin(play_types, ['SMASH_PLAY', 'LEVERAGE_PLAY'])
+    own = np.nan_to_num(ownership)
+    metrics['avg_ownership'] = float(own[recommended].mean()) if recommended.any() else None
+    # Average ownership of a player in a field roster: ownership-weighted mean
+    metrics['field_avg_ownership'] = float((own ** 2).sum() / own.sum()) if own.sum() > 0 else None
+    rec_scored = recommended & scored
+    metrics['points_vs_projection'] = (float(100 * actual[rec_scored].sum() / projected[rec_scored].sum())
+                                       if rec_scored.any() and projected[rec_scored].sum() > 0 else None)
+
+    metrics.update({'lineups': 0, 'lineup_avg_points': None, 'lineup_avg_ownership': None, 'roi': None})
+    if len(lineups) == 0 or not scored.any():
+        return metrics
+
+    # Lineups as rows of player positions (players missing from the slate are dropped)
+    row_of = pd.Series(np.arange(len(players)), index=players['player_name'].to_numpy())
+    row_of = row_of[~row_of.index.duplicated()]
+    lineup_rows = lineups.assign(row=lineups['player_name'].map(row_of)).dropna(subset=['row'])
+    points_now = np.nan_to_num(actual)
+    lineup_points = lineup_rows.groupby('lineup_id')['row'].agg(lambda rows: points_now[rows.astype(int)].sum())
+    lineup_own = lineup_rows.groupby('lineup_id')['row'].agg(lambda rows: own[rows.astype(int)].mean())
+    metrics['lineups'] = int(len(lineup_points))
+    metrics['lineup_avg_points'] = float(lineup_points.mean())
+    metrics['lineup_avg_ownership'] = float(lineup_own.mean())
+
+    # Enter every lineup into an ownership-drawn field scored with real points
+    try:
+        field = build_field(players, field_size, salary_cap=salary_cap, seed=seed, roster_slots=roster_slots)
+    except ValueError:
+        return metrics
+    if len(field) == 0:
+        return metrics
+    field_points = np.sort(points_now[field].sum(axis=1))
+    beaten_by = len(field_points) - np.searchsorted(field_points, lineup_points.to_numpy(), side='right')
+    finish_share = (beaten_by + 1) / (len(field_points) + 1)
+    payouts = np.array([payout_multiple(share) for share in finish_share])
+    metrics['roi'] = float(100 * (payouts.mean() - 1))
+    metrics['avg_finish_pct'] = float(100 * finish_share.mean())
+    return metrics
+
+def _backtest_task(db_path, season, week, platform, field_size):
+    """Worker: read one week straight from SQLite and score it"""
+    conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+    try:
+        key = (season, week, platform)
+        players = pd.read_sql_query(
+            "SELECT player_name, position, ownership_pct, projected_points, estimated_salary, play_type, actual_points "
+            "FROM player_weeks WHERE season = ? AND week = ? AND platform = ?", conn, params=key)
+        # The simulated field is the platform's classic contest, so that's the lineups it scores
+        lineups = pd.read_sql_query(
+            "SELECT lineup_id, player_name FROM lineups WHERE season = ? AND week = ? AND platform = ? AND contest = ?",
+            conn, params=key + (platform,))
+    finally:
+        conn.close()
+    for col in ('ownership_pct', 'projected_points', 'estimated_salary', 'actual_points'):
+        players[col] = pd.to_numeric(players[col], errors='coerce')
+    # Same seed every time a week is rescored, so cached and fresh results agree
+    seed = zlib.crc32(f'{season}-{week}-{platform}'.encode())
+    try:
+        rules = get_rules(platform)
+    except ValueError:
+        rules = get_rules()  # platform we have no rules for: score it as DraftKings classic
+    return score_week(players, lineups, field_size, rules.salary_cap, seed, rules.roster_slots)
+
+# =====================================
+# ALL WEEKS
+# =====================================
+
+_last_run = {}
+
+def last_run():
+    """How many weeks the most recent run_backtest served and how many it recomputed"""
+    return dict(_last_run)
+
+def run_backtest(store, period='All Time', platform=None, workers=None, field_size=BACKTEST_FIELD_SIZE):
+    """Per-week backtest results for a period; only weeks whose data changed get rescored"""
+    revisions = store.week_revisions(period, platform)
+    cached = store.backtest_cache()
+
+    results, stale = {}, []
+    for season, week, platform_, revision in revisions.itertuples(index=False):
+        key = (int(season), int(week), platform_)
+        hit = cached.get(key)
+        if hit is not None and hit[0] == revision:
+            results[key] = hit[1]
+        else:
+            stale.append((key, int(revision)))
+
+    if stale:
+        tasks = [(store.path,) + key + (field_size,) for key, _ in stale]
+        workers = min(workers or os.cpu_count() or 1, len(tasks))
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                fresh = list(pool.map(_backtest_task, *zip(*tasks)))
+        else:
+            fresh = [_backtest_task(*task) for task in tasks]
+
+        store.save_backtests((key, revision, metrics) for (key, revision), metrics in zip(stale, fresh))
+        results.update((key, metrics) for (key, _), metrics in zip(stale, fresh))
+
+    _last_run.update({'weeks': len(results), 'weeks_computed': len(stale)})
+    if not results:
+        return pd.DataFrame()
+    perf = pd.DataFrame([{'season': k[0], 'week': k[1], 'platform': k[2], **m} for k, m in results.items()])
+    perf = perf.sort_values(['season', 'week', 'platform'], ignore_index=True)
+    perf['label'] = perf['season'].astype(str) + ' W' + perf['week'].astype(str)
+    return perf
+
+if __name__ == '__main__':
+    from history_store import HistoryStore
+
+    parser = argparse.ArgumentParser(description="Backtest archived weeks")
+    parser.add_argument('--db', default=DEFAULT_PATH)
+    parser.add_argument('--period', default='All Time', choices=list(PERIODS))
+    parser.add_argument('--platform')
+    parser.add_argument('--workers', type=int)
+    args = parser.parse_args()
+
+    history = HistoryStore(args.db)
+    perf = run_backtest(history, args.period, args.platform, args.workers)
+    print(perf.drop(columns='label').to_string(index=False) if len(perf) else "No archived weeks")
+    print(f"✅ {last_run()['weeks']} weeks ({last_run()['weeks_computed']} recomputed)")
@@ -0,0 +1,243 @@
+# APP BENCHMARK SUITE
+# Times the app's hot paths on synthetic slates and writes the results to
+# JSON, so a run on one commit can be compared against another.
+#
+# Per slate size:
+#   load_csv / load_columnar   cold load_player_data from each file format
+#   load_unchanged             the per-rerun check when the file hasn't changed
+#   derived_build              DerivedData (rescoring, indexes, sorted views)
+#   contrarian_filter          Contrarian page filter/sort + table build
+#   contrarian_slider          contrarian_view at every ownership slider value (per call)
+#   player_pool / optimize_lineup   optimizer pool prep and one exact lineup
+#   app_cold                   first run of app.py on a fresh server
+#   cold_start:<name>          new process (imports included) to a first page
+#   page:<name>                warm rerun of app.py on each page
+# app.py runs as a plain script with Streamlit stubbed out (streamlit_stub.py).
+#
+# Usage: python benchmarks/bench_app.py [--sizes 20 500 5000 50000] [--repeat 5]
+#                                      [--output FILE.json] [--compare OLD.json]
+
+import argparse
+import json
+import os
+import platform
+import runpy
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+APP_PATH = os.path.join(REPO_DIR, 'app.py')
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+# The stub has to be in place before any app module imports streamlit
+from streamlit_stub import install  # noqa: E402
+
+stub = install()
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from columnar import write_columnar  # noqa: E402
+from data_loader import DataStore  # noqa: E402
+from derived import DerivedData  # noqa: E402
+from optimizer import optimize_lineup, prepare_player_pool  # noqa: E402
+from shared_compute import SHARED  # noqa: E402
+from synthetic_slate import make_slate  # noqa: E402
+from tables import render_player_table  # noqa: E402
+from views import PAGES  # noqa: E402  (navigation label -> page name)
+
+DEFAULT_SIZES = [20, 500, 5000, 50000]
+STRATEGY = 'Tournament (GPP)'
+
+# Container spin-up straight onto a table page and onto a chart page
+COLD_START_PAGES = ["🔥 Contrarian Opportunities", "📊 Player Deep Dive"]
+
+# Child process for cold starts: nothing imported but the stub before app.py runs
+COLD_START_SCRIPT = """
+import runpy, sys
+sys.path[:0] = [{repo!r}, {bench!r}]
+import streamlit_stub
+streamlit_stub.install().values['main_navigation'] = {page!r}
+runpy.run_path({app!r}, run_name='__main__')
+"""
+
+# Results slower than this multiple of the baseline get flagged by --compare
+REGRESSION_RATIO = 1.2
+
+# =====================================
+# TIMING
+# =====================================
+
+def timed(func, repeat, setup=None):
+    """Wall times in ms of `repeat` calls (setup runs untimed before each) plus the last result"""
+    times, result = [], None
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        result = func()
+        times.append((time.perf_counter() - start) * 1000)
+    return times, result
+
+def record(results, name, size, times, **extra):
+    entry = {
+        'benchmark': name,
+        'players': size,
+        'best_ms': round(min(times), 3),
+        'median_ms': round(statistics.median(times), 3),
+        'runs': len(times),
+        **extra,
+    }
+    results.append(entry)
+    print(f"{size:>7,} {name:<28} {entry['median_ms']:>10.2f} {entry['best_ms']:>10.2f}")
+    return entry
+
+def run_app(page):
+    stub.values['main_navigation'] = page
+    runpy.run_path(APP_PATH, run_name='__main__')
+
+def cold_start(page, workdir):
+    script = COLD_START_SCRIPT.format(repo=REPO_DIR, bench=BENCH_DIR, page=page, app=APP_PATH)
+    subprocess.run([sys.executable, '-c', script], cwd=workdir, check=True, capture_output=True)
+
+# =====================================
+# ONE SLATE SIZE
+# =====================================
+
+def bench_size(size, repeat, seed, results):
+    slate = make_slate(size, seed=seed)
+    workdir = tempfile.mkdtemp(prefix=f'bench_{size}_')
+    os.chdir(workdir)  # the app reads/writes fantasy_data.csv, its snapshot and history here
+    csv_path = os.path.join(workdir, 'fantasy_data.csv')
+    cols_path = os.path.join(workdir, 'fantasy_data.cols')
+    slate.to_csv(csv_path, index=False)
+
+    # Loading: touching the file forces the content hash a real refresh pays for
+    times, df = timed(lambda: DataStore().load(csv_path, cols_path), repeat, setup=lambda: os.utime(csv_path))
+    record(results, 'load_csv', size, times)
+
+    write_columnar(df, cols_path)
+    times, _ = timed(lambda: DataStore().load(csv_path, cols_path), repeat)
+    record(results, 'load_columnar', size, times)
+
+    store = DataStore()
+    store.load(csv_path, cols_path)
+    times, _ = timed(lambda: store.load(csv_path, cols_path), repeat)
+    record(results, 'load_unchanged', size, times)
+    df = store.df
+
+    times, derived = timed(lambda: DerivedData(df), repeat)
+    record(results, 'derived_build', size, times)
+
+    def contrarian_page():
+        filtered = derived.contrarian_view('All', 'All', 25)
+        render_player_table(filtered, key='contrarian_table')
+        return len(filtered)
+
+    times, rows = timed(contrarian_page, repeat)
+    record(results, 'contrarian_filter', size, times, rows=rows)
+
+    def slider_sweep():
+        for max_ownership in range(51):
+            derived.contrarian_view('WR', 'All', max_ownership)
+
+    times, _ = timed(slider_sweep, repeat)
+    record(results, 'contrarian_slider', size, [t / 51 for t in times])
+
+    times, pool = timed(lambda: prepare_player_pool(df, STRATEGY), repeat)
+    record(results, 'player_pool', size, times)
+
+    times, lineup = timed(lambda: optimize_lineup(df, STRATEGY, pool=pool), repeat)
+    record(results, 'optimize_lineup', size, times, solved='Error' not in lineup.columns)
+
+    # Whole script, as the Streamlit server would run it
+    stub.clear_caches()
+    SHARED.clear()
+    times, _ = timed(lambda: run_app(next(iter(PAGES))), 1)
+    record(results, 'app_cold', size, times)
+    for page, name in PAGES.items():
+        run_app(page)  # first visit fills the page's caches
+        times, _ = timed(lambda: run_app(page), repeat)
+        record(results, f'page:{name}', size, times)
+    for page in COLD_START_PAGES:
+        times, _ = timed(lambda: cold_start(page, workdir), repeat)
+        record(results, f'cold_start:{PAGES[page]}', size, times)
+
+    os.chdir(REPO_DIR)
+    shutil.rmtree(workdir, ignore_errors=True)
+
+# =====================================
+# REPORTING
+# =====================================
+
+def git_commit():
+    """Short commit hash of the tree being measured (suffixed -dirty with local changes)"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=REPO_DIR,
+                               capture_output=True, text=True).stdout.strip()
+        return commit + ('-dirty' if dirty else '')
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+def compare(report, baseline_path):
+    """Print median times against a previous report, flagging regressions"""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    old = {(r['benchmark'], r['players']): r['median_ms'] for r in baseline['results']}
+
+    print(f"\nvs {baseline.get('commit', baseline_path)}")
+    print(f"{'players':>7} {'benchmark':<28} {'old ms':>10} {'new ms':>10} {'ratio':>7}")
+    for r in report['results']:
+        before = old.get((r['benchmark'], r['players']))
+        if before is None:
+            continue
+        ratio = r['median_ms'] / before if before > 0 else float('inf')
+        flag = '  ⚠️ slower' if ratio > REGRESSION_RATIO else ''
+        print(f"{r['players']:>7,} {r['benchmark']:<28} {before:>10.2f} {r['median_ms']:>10.2f} {ratio:>6.2f}x{flag}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the app's hot paths on synthetic slates")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="JSON file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument('--compare', help="earlier JSON report to compare against")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    report = {
+        'commit': commit,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'machine': platform.platform(),
+        'cpus': os.cpu_count(),
+        'repeat': args.repeat,
+        'results': [],
+    }
+
+    print(f"{'players':>7} {'benchmark':<28} {'median ms':>10} {'best ms':>10}")
+    for size in args.sizes:
+        bench_size(size, args.repeat, args.seed, report['results'])
+
+    output = args.output or os.path.join(BENCH_DIR, 'results', f'{commit}.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Wrote {len(report['results'])} results to {output}")
+
+    if args.compare:
+        compare(report, args.compare)
+
+if __name__ == '__main__':
+    main()
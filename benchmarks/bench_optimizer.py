@@ -0,0 +1,74 @@
+# OPTIMIZER BENCHMARK
+# Compares the exact solver against the legacy greedy pass, then times
+# multi-lineup generation.
+#
+# Usage: python benchmarks/bench_optimizer.py [--players 390] [--repeat 5] [--lineups 150] [--min-unique 3] [--workers 1 4 16]
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from optimizer import DEFAULT_SALARY_CAP, prepare_player_pool, solve_exact, solve_greedy, solve_many  # noqa: E402
+from synthetic_slate import make_slate  # noqa: E402
+
+STRATEGIES = ['Tournament (GPP)', 'Cash Game', 'Ultra Contrarian']
+
+def time_solver(solver, work_df, repeat):
+    """Best-of-N wall time and the resulting lineup"""
+    best = float('inf')
+    lineup = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        lineup = solver(work_df, DEFAULT_SALARY_CAP)
+        best = min(best, time.perf_counter() - start)
+    return best, lineup
+
+def describe(lineup):
+    """Players, salary and optimizer score of a lineup (or a failure marker)"""
+    if lineup is None or len(lineup) == 0:
+        return 0, 0, float('nan')
+    return len(lineup), lineup['estimated_salary'].sum(), lineup['optimizer_score'].sum()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--players', type=int, default=390)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--lineups', type=int, default=150)
+    parser.add_argument('--min-unique', type=int, default=3)
+    parser.add_argument('--max-exposure', type=float, default=1.0)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1])
+    args = parser.parse_args()
+
+    slate = make_slate(args.players, seed=args.seed)
+    print(f"Slate: {len(slate)} players, cap ${DEFAULT_SALARY_CAP:,}\n")
+    print(f"{'strategy':<18} {'solver':<7} {'ms':>8} {'players':>8} {'salary':>8} {'score':>9}")
+
+    for strategy in STRATEGIES:
+        work_df = prepare_player_pool(slate, strategy)
+        for name, solver in [('greedy', solve_greedy), ('exact', solve_exact)]:
+            seconds, lineup = time_solver(solver, work_df, args.repeat)
+            players, salary, score = describe(lineup)
+            print(f"{strategy:<18} {name:<7} {seconds * 1000:>8.1f} {players:>8} {salary:>8,.0f} {score:>9.1f}")
+
+    print(f"\n{args.lineups} lineups, min unique {args.min_unique}, max exposure {args.max_exposure:.0%}\n")
+    print(f"{'strategy':<18} {'workers':>7} {'seconds':>8} {'built':>6} {'ms/lineup':>10} {'best':>8} {'worst':>8}")
+
+    for strategy in STRATEGIES:
+        work_df = prepare_player_pool(slate, strategy)
+        scores = work_df['optimizer_score'].to_numpy()
+        for workers in args.workers:
+            start = time.perf_counter()
+            lineups = solve_many(work_df, args.lineups, DEFAULT_SALARY_CAP, args.min_unique, args.max_exposure,
+                                 workers=workers)
+            seconds = time.perf_counter() - start
+            totals = [scores[[player for player, _ in lineup]].sum() for lineup in lineups] or [float('nan')]
+            per_lineup = seconds / max(len(lineups), 1) * 1000
+            print(f"{strategy:<18} {workers:>7} {seconds:>8.2f} {len(lineups):>6} {per_lineup:>10.1f} "
+                  f"{max(totals):>8.1f} {min(totals):>8.1f}")
+
+if __name__ == '__main__':
+    main()
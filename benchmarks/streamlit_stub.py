@@ -0,0 +1,168 @@
+# STREAMLIT STUB
+# Just enough of the streamlit module to run app.py as a plain script, so
+# benchmarks time the app's own work and not the Streamlit runtime.
+#
+# Widgets return their default (or a value from `values`, by key), output
+# calls do nothing, and cache_data/cache_resource memoize in-process like a
+# long-running server would. Install before anything imports streamlit:
+#
+#   stub = install()
+#   stub.values['main_navigation'] = "🔥 Contrarian Opportunities"
+
+import functools
+import sys
+import types
+from collections import OrderedDict
+
+class Block:
+    """Stand-in for containers/elements: a context manager where every call is a no-op"""
+
+    def __init__(self, st=None):
+        self._st = st
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __call__(self, *args, **kwargs):
+        return Block(self._st)
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        # Widgets inside columns/sidebars behave like top-level ones
+        if self._st is not None and name in WIDGETS:
+            return getattr(self._st, name)
+        return Block(self._st)
+
+    def __iter__(self):
+        return iter(())
+
+class SessionState(dict):
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        self[name] = value
+
+WIDGETS = {'selectbox', 'radio', 'multiselect', 'slider', 'number_input', 'checkbox', 'toggle', 'text_input',
+           'button', 'download_button', 'columns', 'tabs'}
+
+def _arg(args, kwargs, position, name, default=None):
+    if name in kwargs:
+        return kwargs[name]
+    return args[position] if len(args) > position else default
+
+class StreamlitStub(types.ModuleType):
+    """Module object standing in for `streamlit`"""
+
+    def __init__(self):
+        super().__init__('streamlit')
+        self.values = {}  # widget key -> value to return instead of the default
+        self.session_state = SessionState()
+        self.sidebar = Block(self)
+        self.column_config = Block()
+        self.query_params = {}
+        self._caches = {}  # function name -> {call args: result}
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        # markdown, metric, dataframe, plotly_chart, spinner, expander, ...
+        return Block(self)
+
+    def _value(self, kwargs, default):
+        value = self.values.get(kwargs.get('key'), default)
+        if kwargs.get('key') is not None:
+            self.session_state[kwargs['key']] = value
+        return value
+
+    # Widgets -----------------------------------------------------------
+
+    def selectbox(self, label, options=(), index=0, *args, **kwargs):
+        options = list(options)
+        default = options[index] if options and index is not None else None
+        return self._value(kwargs, default)
+
+    radio = selectbox
+
+    def multiselect(self, label, options=(), default=None, *args, **kwargs):
+        return self._value(kwargs, list(default or []))
+
+    def slider(self, label, *args, **kwargs):
+        low = _arg(args, kwargs, 0, 'min_value', 0)
+        return self._value(kwargs, _arg(args, kwargs, 2, 'value', low))
+
+    number_input = slider
+
+    def checkbox(self, label, value=False, *args, **kwargs):
+        return self._value(kwargs, value)
+
+    toggle = checkbox
+
+    def text_input(self, label, value='', *args, **kwargs):
+        return self._value(kwargs, value)
+
+    def button(self, label, *args, **kwargs):
+        return self._value(kwargs, False)
+
+    download_button = button
+
+    def columns(self, spec, *args, **kwargs):
+        n_columns = spec if isinstance(spec, int) else len(spec)
+        return [Block(self) for _ in range(n_columns)]
+
+    def tabs(self, labels, *args, **kwargs):
+        return [Block(self) for _ in labels]
+
+    # Runtime -------------------------------------------------------------
+
+    def _cache(self, func=None, **options):
+        """cache_data / cache_resource: memoize on the call arguments
+
+        Results are stored per function name, so they survive the script
+        re-running (and re-decorating) the way Streamlit's do.
+        """
+        def decorate(f):
+            store = self._caches.setdefault(f.__qualname__, OrderedDict())
+            limit = options.get('max_entries')
+
+            @functools.wraps(f)
+            def cached(*args, **kwargs):
+                key = (args, tuple(sorted(kwargs.items())))
+                if key in store:
+                    store.move_to_end(key)
+                    return store[key]
+                value = store[key] = f(*args, **kwargs)
+                if limit and len(store) > limit:
+                    store.popitem(last=False)
+                return value
+
+            cached.clear = store.clear
+            return cached
+        return decorate(func) if callable(func) else decorate
+
+    cache_data = _cache
+    cache_resource = _cache
+
+    def clear_caches(self):
+        """Forget every cached result (a cold server)"""
+        for store in self._caches.values():
+            store.clear()
+
+    def fragment(self, func=None, **kwargs):
+        return func if callable(func) else (lambda f: f)
+
+    def rerun(self):
+        pass
+
+def install():
+    """Put a fresh stub in sys.modules['streamlit'] and return it"""
+    stub = StreamlitStub()
+    sys.modules['streamlit'] = stub
+    return stub
@@ -0,0 +1,61 @@
+# SYNTHETIC SLATE GENERATOR
+# Builds fake player pools in the fantasy_data.csv schema for benchmarks.
+
+import numpy as np
+import pandas as pd
+
+# Players per team on a typical DraftKings main slate
+TEAM_DEPTH = {'QB': 2, 'RB': 4, 'WR': 6, 'TE': 3}
+
+# (mean points for the position's best player, decay per depth-chart spot)
+POSITION_PROJECTIONS = {'QB': (24.0, 0.93), 'RB': (21.0, 0.90), 'WR': (22.0, 0.93), 'TE': (16.0, 0.88)}
+
+def make_slate(n_players=390, seed=0, platform='DraftKings', data_date='2025-09-07'):
+    """Generate a synthetic slate with roughly n_players rows"""
+    rng = np.random.default_rng(seed)
+    per_team = sum(TEAM_DEPTH.values())
+    n_teams = max(2, int(np.ceil(n_players / per_team)))
+
+    rows = []
+    for team in range(n_teams):
+        # Teams play in pairs: T000 vs T001, T002 vs T003, ...
+        team_name, opponent = f"T{team:03d}", f"T{team ^ 1:03d}"
+        for position, depth in TEAM_DEPTH.items():
+            top, decay = POSITION_PROJECTIONS[position]
+            for spot in range(depth):
+                rows.append((f"{position} Player {team:03d}-{spot}", position, team_name, opponent,
+                             top * decay ** (spot * 4) * rng.uniform(0.7, 1.1)))
+    frame = pd.DataFrame(rows[:n_players], columns=['player_name', 'position', 'team', 'opponent', 'projected_points'])
+    frame['projected_points'] = frame['projected_points'].round(1)
+
+    # Salary tracks projection with noise, on DraftKings' $100 grid
+    salary = 2500 + frame['projected_points'] * 260 + rng.normal(0, 450, len(frame))
+    frame['estimated_salary'] = (np.clip(salary, 2500, 9800) / 100).round() * 100
+
+    frame['player_rank'] = frame.groupby('position')['projected_points'].rank(ascending=False, method='first').astype(int)
+
+    # Ownership concentrates on the best values
+    value = frame['projected_points'] / (frame['estimated_salary'] / 1000)
+    ownership = np.exp(value.to_numpy() * 1.4 + rng.normal(0, 0.4, len(frame)))
+    frame['ownership_pct'] = (ownership / ownership.sum() * 800).clip(0.1, 60).round(1)
+
+    frame['platform'] = platform
+    frame['contrarian_score'] = (20 * (11 - frame['player_rank'])).clip(lower=0) - 2 * frame['ownership_pct']
+    frame['play_type'] = np.select(
+        [
+            (frame['player_rank'] <= 3) & (frame['ownership_pct'] < 15),
+            (frame['player_rank'] <= 5) & (frame['ownership_pct'] < 20),
+            (frame['player_rank'] <= 5) & (frame['ownership_pct'] >= 25),
+        ],
+        ['SMASH_PLAY', 'LEVERAGE_PLAY', 'CHALK_PLAY'],
+        default='NEUTRAL',
+    )
+    frame['data_date'] = data_date
+    frame['created_at'] = f"{data_date} 12:00:00"
+    frame['points_per_dollar'] = frame['projected_points'] / (frame['estimated_salary'] / 1000)
+    frame['recommendation'] = ''
+
+    columns = ['player_name', 'position', 'team', 'opponent', 'player_rank', 'ownership_pct', 'platform', 'contrarian_score',
+               'play_type', 'projected_points', 'estimated_salary', 'data_date', 'created_at',
+               'points_per_dollar', 'recommendation']
+    return frame[columns]
@@ -0,0 +1,127 @@
+# CHARTS
+# Figures for the Deep Dive, Analytics and Performance pages, built once per
+# data key and chart parameters (shared_compute) instead of every rerun.
+#
+# Big datasets are thinned before they reach the browser:
+# - scatters/lines over MAX_CHART_POINTS keep evenly spaced points within each
+#   color group (every play type / series keeps its range and shape)
+# - scatters/lines over WEBGL_POINTS draw with WebGL (scattergl)
+# - box plots over WEBGL_POINTS ship precomputed quartiles, not every value
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from metrics import timer
+from shared_compute import shared
+from tables import PLAY_TYPE_COLORS
+
+# Most points a scatter or line chart sends to the browser
+MAX_CHART_POINTS = 5000
+
+# Above this many points, WebGL traces / precomputed box stats
+WEBGL_POINTS = 1000
+
+# =====================================
+# HELPERS
+# =====================================
+
+def cached_figure(ctx, name, params, build):
+    """build() once per data key and params, shared by every session"""
+    def timed_build():
+        with timer('chart_seconds', chart=name):
+            return build()
+    return shared(ctx, f'chart:{name}', params, timed_build)
+
+def downsample(frame, max_points=MAX_CHART_POINTS, group=None, order=None):
+    """At most ~max_points rows, evenly spaced along `order` within each `group` (same rows every time)"""
+    if len(frame) <= max_points:
+        return frame
+    if order is not None:
+        frame = frame.sort_values(order, kind='stable')
+    groups = frame.groupby(group, sort=False, observed=True).indices.values() if group else [np.arange(len(frame))]
+    keep = []
+    for rows in groups:
+        n_keep = min(len(rows), max(1, round(max_points * len(rows) / len(frame))))
+        keep.append(rows[np.unique(np.linspace(0, len(rows) - 1, n_keep).round().astype(int))])
+    return frame.iloc[np.sort(np.concatenate(keep))]
+
+def _shown_note(shown, total):
+    return f" ({len(shown):,} of {total:,} shown)" if len(shown) < total else ""
+
+def frame_signature(frame):
+    """Content hash for chart data that isn't tied to the data key (e.g. backtest results)"""
+    return int(pd.util.hash_pandas_object(frame, index=False).sum()) if len(frame) else 0
+
+# =====================================
+# FIGURES
+# =====================================
+
+def landscape_figure(plot_df, hover_cols):
+    """Deep Dive ownership-vs-rank scatter (size = contrarian score)"""
+    shown = downsample(plot_df, group='play_type', order='player_rank')
+    # Deep-ranked players score below zero, which isn't a marker size; hover keeps the real score
+    shown = shown.assign(point_size=shown['contrarian_score'].clip(lower=0))
+    fig = px.scatter(
+        shown,
+        x='player_rank',
+        y='ownership_pct',
+        color='play_type',
+        size='point_size',
+        hover_data={**dict.fromkeys(hover_cols, True), 'contrarian_score': ':.1f', 'point_size': False},
+        title="Fantasy Landscape: Ownership vs Rank (Size = Contrarian Score)" + _shown_note(shown, len(plot_df)),
+        color_discrete_map=PLAY_TYPE_COLORS,
+        labels={
+            'player_rank': 'Expert Ranking',
+            'ownership_pct': 'Ownership Percentage (%)',
+            'play_type': 'Play Type'
+        },
+        render_mode='webgl' if len(shown) > WEBGL_POINTS else 'auto',
+    )
+    fig.update_layout(
+        height=500,
+        showlegend=True,
+        xaxis_title="Expert Ranking (Lower = Better)",
+        yaxis_title="Ownership Percentage (%)"
+    )
+    return fig
+
+def box_figure(df, x, y, title):
+    """Box plot per x; big frames send quartiles/fences instead of every value"""
+    if len(df) <= WEBGL_POINTS:
+        return px.box(df, x=x, y=y, title=title)
+
+    keys, stats = [], []
+    for key, values in df.groupby(x, sort=False, observed=True)[y]:
+        values = values.to_numpy(dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            continue
+        q1, median, q3 = np.percentile(values, [25, 50, 75])
+        reach = 1.5 * (q3 - q1)
+        keys.append(key)
+        stats.append((q1, median, q3, values[values >= q1 - reach].min(), values[values <= q3 + reach].max()))
+    q1, median, q3, lower, upper = (list(col) for col in zip(*stats)) if stats else ([],) * 5
+    fig = go.Figure(go.Box(x=keys, q1=q1, median=median, q3=q3, lowerfence=lower, upperfence=upper,
+                           marker_color=px.colors.qualitative.Plotly[0]))
+    fig.update_layout(title=title, xaxis_title=x, yaxis_title=y)
+    return fig
+
+def play_type_pie(df):
+    """Analytics play type mix"""
+    play_type_counts = df['play_type'].value_counts()
+    return px.pie(values=play_type_counts.values, names=play_type_counts.index, title="Play Type Distribution")
+
+def value_scatter(df):
+    """Analytics salary vs projected points (size = value)"""
+    shown = downsample(df, group='play_type', order='estimated_salary')
+    return px.scatter(shown, x='estimated_salary', y='projected_points', color='play_type', size='value',
+                      title="Salary vs Projected Points (Size = Value)" + _shown_note(shown, len(df)),
+                      render_mode='webgl' if len(shown) > WEBGL_POINTS else 'auto')
+
+def line_figure(frame, x, y, title):
+    """Line chart of y columns over x, thinned evenly when there are too many points"""
+    shown = downsample(frame, max(2, MAX_CHART_POINTS // max(1, len(y))))
+    return px.line(shown, x=x, y=y, title=title + _shown_note(shown, len(frame)),
+                   render_mode='webgl' if len(shown) * len(y) > WEBGL_POINTS else 'auto')
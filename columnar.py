@@ -0,0 +1,136 @@
+# COLUMNAR DATA FORMAT
+# Typed, memory-mapped snapshot of fantasy_data.csv written by the weekly refresh.
+#
+# Layout: a directory with one .npy file per column plus manifest.json.
+# Numeric columns are stored already coerced; text columns are dictionary
+# encoded (int codes + the distinct values in the manifest), so loading is
+# a handful of np.load(mmap_mode='r') calls instead of a CSV parse. Each
+# column's content hash is recorded so a reload can skip unchanged columns.
+#
+# Usage: python columnar.py [fantasy_data.csv] [fantasy_data.cols]
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_PATH = 'fantasy_data.cols'
+FORMAT_VERSION = 1
+
+# Low-cardinality text columns that load as pandas categoricals
+CATEGORICAL_COLUMNS = ['position', 'play_type', 'platform', 'team', 'opponent', 'game']
+
+# Numeric columns and the fill value load_data would apply
+NUMERIC_DEFAULTS = {
+    'player_rank': 999,
+    'ownership_pct': 15.0,
+    'projected_points': 10.0,
+    'estimated_salary': 5000,
+    'contrarian_score': 50.0,
+}
+
+def _code_dtype(n_values):
+    """Smallest signed int that holds every code plus -1 for missing"""
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_values < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+def _numeric_column(values, default=None):
+    """Coerce to numbers, filling gaps and storing whole numbers as int"""
+    values = pd.to_numeric(values, errors='coerce')
+    if default is not None:
+        values = values.fillna(default)
+    if values.notna().all() and (values == values.round()).all():
+        # No narrower than int32 so salary sums and products can't overflow
+        values = pd.to_numeric(values, downcast='integer').to_numpy()
+        return values.astype(np.promote_types(values.dtype, np.int32))
+    return values.to_numpy(dtype=np.float64)
+
+def write_columnar(df, path=DEFAULT_PATH):
+    """Write df as a columnar snapshot directory; replaces any existing one"""
+    tmp_path = path + '.tmp'
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    columns = []
+    for i, col in enumerate(df.columns):
+        series = df[col]
+        entry = {'name': col, 'file': f'{i:03d}.npy'}
+
+        if col in NUMERIC_DEFAULTS or pd.api.types.is_numeric_dtype(series):
+            values = _numeric_column(series, NUMERIC_DEFAULTS.get(col))
+            entry['kind'] = 'numeric'
+        else:
+            codes, uniques = pd.factorize(series.astype(object), sort=True)
+            values = codes.astype(_code_dtype(len(uniques)))
+            entry['kind'] = 'category' if col in CATEGORICAL_COLUMNS else 'text'
+            entry['values'] = [str(v) for v in uniques]
+
+        np.save(os.path.join(tmp_path, entry['file']), values)
+        # Content hash per column lets readers skip columns that didn't change
+        digest = hashlib.sha1(np.ascontiguousarray(values).tobytes())
+        digest.update(json.dumps(entry.get('values', [])).encode())
+        entry['sha1'] = digest.hexdigest()
+        columns.append(entry)
+
+    manifest = {'format': FORMAT_VERSION, 'rows': len(df), 'columns': columns}
+    with open(os.path.join(tmp_path, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f)
+
+    # Swap directories so a reader never sees a half-written snapshot
+    old_path = path + '.old'
+    shutil.rmtree(old_path, ignore_errors=True)
+    if os.path.exists(path):
+        os.rename(path, old_path)
+    os.rename(tmp_path, path)
+    shutil.rmtree(old_path, ignore_errors=True)
+    return path
+
+def read_manifest(path=DEFAULT_PATH):
+    with open(os.path.join(path, 'manifest.json')) as f:
+        manifest = json.load(f)
+    if manifest.get('format') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported columnar format {manifest.get('format')} in {path}")
+    return manifest
+
+def load_columnar(path=DEFAULT_PATH, columns=None):
+    """Load a columnar snapshot; numeric columns stay memory-mapped until written to"""
+    manifest = read_manifest(path)
+
+    data = {}
+    for entry in manifest['columns']:
+        if columns is not None and entry['name'] not in columns:
+            continue
+        values = np.load(os.path.join(path, entry['file']), mmap_mode='r')
+
+        if entry['kind'] == 'numeric':
+            data[entry['name']] = values
+        elif entry['kind'] == 'category':
+            data[entry['name']] = pd.Categorical.from_codes(values, categories=entry['values'])
+        else:
+            # Code -1 (missing) lands on the trailing NaN
+            lookup = np.array(entry['values'] + [np.nan], dtype=object)
+            data[entry['name']] = lookup[values]
+
+    return pd.DataFrame(data, copy=False)
+
+def columnar_is_fresh(csv_path, path=DEFAULT_PATH):
+    """True when a snapshot exists and is at least as new as the CSV"""
+    manifest = os.path.join(path, 'manifest.json')
+    if not os.path.exists(manifest):
+        return False
+    if not os.path.exists(csv_path):
+        return True
+    return os.path.getmtime(manifest) >= os.path.getmtime(csv_path)
+
+if __name__ == '__main__':
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else 'fantasy_data.csv'
+    out_path = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_PATH
+    frame = pd.read_csv(csv_path)
+    write_columnar(frame, out_path)
+    print(f"✅ Wrote {len(frame):,} rows x {len(frame.columns)} columns to {out_path}")
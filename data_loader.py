@@ -0,0 +1,189 @@
+# DATA LOADING
+# Versioned, incremental loading of the player data for load_data.
+#
+# The data version comes from the file itself (content hash, re-checked only
+# when the file's size/mtime change), so a refresh shows up on the next rerun
+# and an untouched file is never parsed twice. A new CSV version is parsed in
+# full (finding the changed rows would mean parsing them all anyway); a new
+# columnar snapshot only re-reads the columns whose manifest hash changed.
+
+import hashlib
+import os
+import threading
+
+import pandas as pd
+
+from columnar import DEFAULT_PATH as COLUMNAR_PATH
+from columnar import NUMERIC_DEFAULTS, columnar_is_fresh, load_columnar, read_manifest
+from platforms import DEFAULT_PLATFORM, normalize_platforms
+
+DATA_FILE = 'fantasy_data.csv'
+
+# Columns every page expects, with the default used when a file lacks one
+REQUIRED_COLUMNS = {
+    'player_name': 'Unknown Player',
+    'position': 'FLEX',
+    'player_rank': 999,
+    'ownership_pct': 15.0,
+    'projected_points': 10.0,
+    'estimated_salary': 5000,
+    'play_type': 'NEUTRAL',
+    'contrarian_score': 50.0,
+    'platform': DEFAULT_PLATFORM,
+    'team': '',
+    'opponent': '',
+    'game': '',
+}
+
+# Other spellings of the team columns seen in feeds (first match wins)
+TEAM_ALIASES = {
+    'team': ['posteam', 'team_abbr', 'player_team'],
+    'opponent': ['opp', 'defteam', 'opponent_team'],
+}
+
+# =====================================
+# DATA VERSIONS
+# =====================================
+
+# path -> ((mtime_ns, size), sha1) so unchanged files are never re-hashed
+_file_hashes = {}
+
+def file_version(path):
+    """Content hash of a file, recomputed only when its size or mtime changes"""
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _file_hashes.get(path)
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    _file_hashes[path] = (signature, digest.hexdigest())
+    return digest.hexdigest()
+
+def data_version(csv_path=DATA_FILE, columnar_path=COLUMNAR_PATH):
+    """Version string of whichever file load_player_data would read"""
+    if columnar_is_fresh(csv_path, columnar_path):
+        # The manifest carries every column's hash, so it versions the snapshot
+        return 'cols:' + file_version(os.path.join(columnar_path, 'manifest.json'))
+    if os.path.exists(csv_path):
+        return 'csv:' + file_version(csv_path)
+    return 'missing'
+
+# =====================================
+# CLEANING
+# =====================================
+
+def game_key(team, opponent):
+    """Same key for both sides of a game ('BUF/KC' for KC vs BUF); '' without both teams"""
+    if not team or not opponent:
+        return ''
+    return '/'.join(sorted([team, opponent]))
+
+def add_team_columns(df):
+    """team/opponent from whichever alias the file uses, plus a game key for each row"""
+    for col, aliases in TEAM_ALIASES.items():
+        if col not in df.columns:
+            source = next((alias for alias in aliases if alias in df.columns), None)
+            if source is not None:
+                df[col] = df[source]
+    if 'team' not in df.columns:
+        return df
+
+    for col in ('team', 'opponent'):
+        if col in df.columns:
+            df[col] = df[col].astype(object).fillna('').astype(str).str.strip().str.upper().to_numpy()
+    if 'opponent' in df.columns:
+        # Vectorized game_key: feeds spell games every which way, so always rebuild it
+        team, opponent = df['team'], df['opponent']
+        first, second = team.where(team < opponent, opponent), opponent.where(team < opponent, team)
+        df['game'] = (first + '/' + second).where((team != '') & (opponent != ''), '').to_numpy()
+    return df
+
+def add_required_columns(df):
+    """Fill in any required column the file doesn't have"""
+    add_team_columns(df)
+    for col, default_val in REQUIRED_COLUMNS.items():
+        if col not in df.columns:
+            df[col] = default_val
+    return df
+
+def clean_numeric_columns(df):
+    """Coerce the numeric columns, filling bad values with their defaults"""
+    for col, fill in NUMERIC_DEFAULTS.items():
+        df[col] = pd.to_numeric(df[col], errors='coerce').fillna(fill)
+    return df
+
+# =====================================
+# INCREMENTAL STORE
+# =====================================
+
+class DataStore:
+    """The last loaded frame plus what's needed to merge the next version"""
+
+    def __init__(self):
+        self.version = None
+        self.kind = None
+        self.df = None
+        self.column_hashes = {}
+        self.last_reload = {}
+        self._lock = threading.Lock()
+
+    def load(self, csv_path=DATA_FILE, columnar_path=COLUMNAR_PATH, version=None):
+        """Frame for the current data version; raises FileNotFoundError if there's no data"""
+        version = version or data_version(csv_path, columnar_path)
+        with self._lock:
+            if version == self.version:
+                return self.df
+            if version == 'missing':
+                raise FileNotFoundError(csv_path)
+
+            if version.startswith('cols:'):
+                df = self._load_columnar(columnar_path)
+            else:
+                df = self._load_csv(csv_path)
+
+            df = add_required_columns(df)
+            # One spelling per platform so per-platform partitions line up with platforms.py
+            df['platform'] = normalize_platforms(df['platform'])
+            self.df = df
+            self.version = version
+            return self.df
+
+    def _load_csv(self, csv_path):
+        raw = pd.read_csv(csv_path)
+        self.kind = 'csv'
+        self.last_reload = {'source': 'csv', 'rows': len(raw)}
+        return clean_numeric_columns(add_required_columns(raw))
+
+    def _load_columnar(self, columnar_path):
+        manifest = read_manifest(columnar_path)
+        hashes = {entry['name']: entry.get('sha1') for entry in manifest['columns']}
+
+        reusable = self.kind == 'cols' and self.df is not None and len(self.df) == manifest['rows']
+        changed = [
+            name for name, digest in hashes.items()
+            if not reusable or digest is None or self.column_hashes.get(name) != digest
+        ]
+
+        loaded = load_columnar(columnar_path, columns=changed)
+        df = pd.DataFrame(
+            {name: loaded[name] if name in changed else self.df[name] for name in hashes},
+            copy=False,
+        )
+
+        self.kind, self.column_hashes = 'cols', hashes
+        self.last_reload = {'source': 'columnar', 'rows': len(df), 'columns_changed': len(changed)}
+        return df
+
+_store = DataStore()
+
+def load_player_data(csv_path=DATA_FILE, columnar_path=COLUMNAR_PATH, version=None):
+    """Current player data, re-read only when its version changes (columnar: only the changed columns)"""
+    return _store.load(csv_path, columnar_path, version)
+
+def last_reload():
+    """What the most recent reload had to rebuild"""
+    return dict(_store.last_reload)
@@ -0,0 +1,220 @@
+# DERIVED DATA
+# Everything the pages compute from the player data, built once per data
+# version and shared read-only by every session and rerun.
+
+import numpy as np
+import pandas as pd
+
+from data_loader import NUMERIC_DEFAULTS
+from optimizer import clean_player_pool, score_player_pool
+from platforms import salary_units
+from player_index import PlayerIndex
+from scoring import score_arrays, score_players
+
+# Play types the Deep Dive landscape chart knows how to color
+PLOT_PLAY_TYPES = ['SMASH_PLAY', 'LEVERAGE_PLAY', 'CHALK_PLAY', 'NEUTRAL', 'AVOID']
+
+class DerivedData:
+    """Cleaned frame plus precomputed views for one data version
+
+    Views are plain row selections of `frame`; treat everything here as
+    read-only (add columns to a copy, never to these frames).
+    """
+
+    def __init__(self, df, players=None, rescore=True):
+        frame = df.reset_index(drop=True).copy()
+
+        # Numeric columns are coerced once here instead of on every page
+        for col in NUMERIC_DEFAULTS:
+            if col in frame.columns:
+                frame[col] = pd.to_numeric(frame[col], errors='coerce')
+
+        # Scores/play types always match the ownership we actually have
+        if rescore:
+            frame = score_players(frame)
+        # Rescoring writes play types as strings; keep the column categorical like the loaded one
+        if 'play_type' in frame.columns and not isinstance(frame['play_type'].dtype, pd.CategoricalDtype):
+            frame['play_type'] = frame['play_type'].astype('category')
+
+        if 'projected_points' in frame.columns and 'estimated_salary' in frame.columns:
+            units = salary_units(frame['platform']) if 'platform' in frame.columns else 1000
+            salary_k = frame['estimated_salary'] / units
+            frame['value'] = (frame['projected_points'] / salary_k).where(salary_k > 0)
+            if 'points_per_dollar' not in frame.columns:
+                frame['points_per_dollar'] = frame['value']
+
+        self.frame = frame
+        # Names don't change between live ownership updates, so the index carries over
+        self.players = players if players is not None else PlayerIndex(frame)
+        self.player_names = self.players.names
+
+        # Row positions per position / play type, best contrarian score first
+        order = np.arange(len(frame))
+        if 'contrarian_score' in frame.columns:
+            order = np.argsort(-frame['contrarian_score'].fillna(-np.inf).to_numpy(), kind='stable')
+        self._by_contrarian = order
+        self._position_rows = self._group_rows('position', order)
+        self._play_type_rows = self._group_rows('play_type', order)
+        self._game_rows = self._group_rows('game', order)
+        # Stacks and game views need team data
+        self.has_teams = 'team' in frame.columns and bool((frame['team'].astype(object) != '').any())
+        self._team_rows = self._group_rows('team', order) if self.has_teams else {}
+
+        self.play_type_counts = {key: len(rows) for key, rows in self._play_type_rows.items()}
+
+        self._plot_frame = None
+        self._cube = None
+        self._latest_update = None
+        self._platform_names = None
+        self._pools = {}
+        self._platforms = {}
+
+    def _group_rows(self, col, order):
+        """Row positions of each value of col, kept in `order`"""
+        if col not in self.frame.columns:
+            return {}
+        values = self.frame[col].astype(object).to_numpy()[order]
+        return {key: order[values == key] for key in pd.unique(values)}
+
+    def _rows(self, position=None, play_types=None, by_contrarian=False, game=None):
+        """Row positions matching the filters, contrarian-sorted or in file order"""
+        rows = self._by_contrarian
+        if game is not None:
+            rows = self._game_rows.get(game, rows[:0])
+        if position not in (None, 'All'):
+            position_rows = self._position_rows.get(position, rows[:0])
+            rows = position_rows if game is None else rows[np.isin(rows, position_rows)]
+        if play_types is not None:
+            wanted = np.concatenate([self._play_type_rows.get(p, rows[:0]) for p in play_types] or [rows[:0]])
+            rows = rows[np.isin(rows, wanted)]
+        return rows if by_contrarian else np.sort(rows)
+
+    def rows(self, position=None, play_types=None, by_contrarian=False, game=None, teams=None):
+        """Row positions behind view() (optionally only some teams), for callers that filter further"""
+        rows = self._rows(position, play_types, by_contrarian, game)
+        if teams is not None:
+            wanted = np.concatenate([self._team_rows.get(t, rows[:0]) for t in teams] or [rows[:0]])
+            rows = rows[np.isin(rows, wanted)]
+        return rows
+
+    def view(self, position=None, play_types=None, by_contrarian=False, game=None):
+        """Players at a position, in a set of play types and/or in one game (data_loader.game_key)"""
+        return self.frame.iloc[self._rows(position, play_types, by_contrarian, game)]
+
+    @property
+    def contrarian_cube(self):
+        """(position, play_type) -> (rows by contrarian score, those by ownership, sorted ownership)
+
+        'All' stands for any position / play type. Built the first time the
+        Contrarian page needs it, so a max-ownership filter is a binary
+        search on the sorted ownership instead of a filter + sort.
+        """
+        if self._cube is None:
+            frame = self.frame
+            ownership = (frame['ownership_pct'].to_numpy(dtype=np.float64) if 'ownership_pct' in frame.columns
+                         else np.full(len(frame), np.nan))
+            cube = {}
+            for position in ['All', *self._position_rows]:
+                for play_type in ['All', *self._play_type_rows]:
+                    rows = self._rows(position, None if play_type == 'All' else [play_type], by_contrarian=True)
+                    owned = ownership[rows]
+                    order = np.argsort(owned, kind='stable')  # NaN ownership sorts last, so it's never "under" a max
+                    cube[(position, play_type)] = (rows, order, owned[order])
+            self._cube = cube
+        return self._cube
+
+    def contrarian_view(self, position=None, play_type=None, max_ownership=None):
+        """Contrarian page list: filtered and sorted by contrarian_score"""
+        bucket = self.contrarian_cube.get((position or 'All', play_type or 'All'))
+        if bucket is None:
+            return self.frame.iloc[:0]
+        rows, by_ownership, owned = bucket
+        if max_ownership is not None:
+            # Players at or under the max are a prefix of the ownership order; sorting
+            # their bucket positions puts them back in contrarian order
+            matches = np.searchsorted(owned, max_ownership, side='right')
+            if matches < len(rows):
+                rows = rows[np.sort(by_ownership[:matches])]
+        return self.frame.iloc[rows]
+
+    @property
+    def plot_frame(self):
+        """Rows the landscape chart can draw: numeric rank/ownership/score, known play type"""
+        if self._plot_frame is None:
+            required = ['player_rank', 'ownership_pct', 'play_type', 'contrarian_score']
+            plot_df = self.frame.dropna(subset=[c for c in required if c in self.frame.columns])
+            if 'play_type' in plot_df.columns:
+                plot_df = plot_df[plot_df['play_type'].isin(PLOT_PLAY_TYPES)]
+            self._plot_frame = plot_df
+        return self._plot_frame
+
+    @property
+    def latest_update(self):
+        """Newest updated_at in the data (None without the column), for the freshness banner"""
+        if 'updated_at' not in self.frame.columns:
+            return None
+        if self._latest_update is None:
+            self._latest_update = pd.to_datetime(self.frame['updated_at'].max())
+        return self._latest_update
+
+    def player(self, name, platform=None, week=None):
+        """A player's row (first match unless platform/week narrow it), or None"""
+        row = self.players.find(name, platform, week)
+        return None if row is None else self.frame.iloc[row]
+
+    def with_ownership(self, rows, ownership):
+        """New DerivedData with ownership replaced at row positions; only those rows get rescored"""
+        frame = self.frame.copy()
+        frame['ownership_pct'] = frame['ownership_pct'].to_numpy(dtype=np.float64, copy=True)
+        frame.iloc[rows, frame.columns.get_loc('ownership_pct')] = ownership
+
+        scored = score_arrays(frame['player_rank'].to_numpy(dtype=np.float64)[rows], ownership)
+        for col, values in scored.items():
+            if isinstance(frame[col].dtype, pd.CategoricalDtype):
+                column = frame[col].array.copy()
+                column = column.add_categories([value for value in pd.unique(values) if value not in column.categories])
+            else:
+                column = frame[col].to_numpy(dtype=values.dtype, copy=True)
+            column[rows] = values
+            frame[col] = column
+        return DerivedData(frame, players=self.players, rescore=False)
+
+    @property
+    def platforms(self):
+        """Platforms in the data, in file order"""
+        if 'platform' not in self.frame.columns:
+            return []
+        if self._platform_names is None:
+            self._platform_names = list(pd.unique(self.frame['platform'].astype(object)))
+        return self._platform_names
+
+    @property
+    def teams(self):
+        """Team abbreviations in the data (empty without team columns)"""
+        return self._team_rows.keys() - {''}
+
+    def for_platform(self, platform):
+        """DerivedData for one platform's rows (built once, then reused every rerun)
+
+        Pages filter and optimize the partition, so a multi-platform file
+        costs one platform's worth of work per rerun. Returns self when the
+        data only has that platform and None when it has none of it.
+        """
+        if platform not in self._platforms:
+            platforms = self.platforms
+            if platforms == [platform] or not platforms:
+                self._platforms[platform] = self
+            elif platform not in platforms:
+                self._platforms[platform] = None
+            else:
+                rows = np.flatnonzero(self.frame['platform'].astype(object).to_numpy() == platform)
+                self._platforms[platform] = DerivedData(self.frame.iloc[rows], rescore=False)
+        return self._platforms[platform]
+
+    def player_pool(self, strategy):
+        """Optimizer-ready pool for a strategy (cleaned once, scored once per strategy)"""
+        if strategy not in self._pools:
+            if None not in self._pools:
+                self._pools[None] = clean_player_pool(self.frame)
+            self._pools[strategy] = score_player_pool(self._pools[None], strategy)
+        return self._pools[strategy]
@@ -0,0 +1,327 @@
+# HISTORY STORE
+# Every weekly refresh archived in an indexed SQLite file, keyed by
+# season/week/platform/player, so Performance Tracking can query any period
+# without keeping old CSVs around.
+#
+# Usage:
+#   python history_store.py fantasy_data.csv                 # archive this week's slate
+#   python history_store.py results.csv --actuals            # record actual points
+#   python history_store.py lineups.csv --lineups            # record the lineups you played
+#   python history_store.py sd.csv --lineups --contest "DraftKings Showdown"
+#   (all take --season/--week when the file has no season/week columns)
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+from datetime import date, timedelta
+
+import pandas as pd
+
+from platforms import get_rules
+
+DEFAULT_PATH = os.environ.get('HISTORY_DB', 'fantasy_history.db')
+
+PERIODS = {'This Season': 'season', 'Last 4 Weeks': 'last_4', 'All Time': 'all'}
+
+# Archived columns and their SQLite types (season/week/platform/player_name are the key)
+HISTORY_COLUMNS = {
+    'position': 'TEXT',
+    'team': 'TEXT',
+    'opponent': 'TEXT',
+    'player_rank': 'INTEGER',
+    'ownership_pct': 'REAL',
+    'projected_points': 'REAL',
+    'estimated_salary': 'INTEGER',
+    'contrarian_score': 'REAL',
+    'play_type': 'TEXT',
+    'actual_points': 'REAL',
+    'data_date': 'TEXT',
+}
+
+# Played lineups; contest is the format they were entered in (platforms.PLATFORMS name)
+LINEUPS_TABLE = """CREATE TABLE IF NOT EXISTS lineups (
+    season INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    platform TEXT NOT NULL,
+    contest TEXT NOT NULL,
+    lineup_id INTEGER NOT NULL,
+    player_name TEXT NOT NULL,
+    roster_slot TEXT,
+    PRIMARY KEY (season, week, platform, contest, lineup_id, player_name)
+) WITHOUT ROWID"""
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS player_weeks (
+    season INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    platform TEXT NOT NULL,
+    player_name TEXT NOT NULL,
+    {', '.join(f'{col} {kind}' for col, kind in HISTORY_COLUMNS.items())},
+    PRIMARY KEY (season, week, platform, player_name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_player_weeks_play_type ON player_weeks (play_type, season, week);
+CREATE INDEX IF NOT EXISTS idx_player_weeks_player ON player_weeks (player_name, season, week);
+{LINEUPS_TABLE};
+CREATE TABLE IF NOT EXISTS week_revisions (
+    season INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    platform TEXT NOT NULL,
+    revision INTEGER NOT NULL,
+    PRIMARY KEY (season, week, platform)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS backtest_weeks (
+    season INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    platform TEXT NOT NULL,
+    revision INTEGER NOT NULL,
+    metrics TEXT NOT NULL,
+    PRIMARY KEY (season, week, platform)
+) WITHOUT ROWID;
+"""
+
+# =====================================
+# SEASON / WEEK
+# =====================================
+
+def season_kickoff(season):
+    """Thursday after Labor Day (first Monday of September)"""
+    first = date(season, 9, 1)
+    labor_day = first + timedelta(days=(0 - first.weekday()) % 7)
+    return labor_day + timedelta(days=3)
+
+def nfl_week(day):
+    """(season, week) a date falls in; spring/summer (preseason) data counts as week 1 of the coming season"""
+    day = pd.Timestamp(day).date()
+    season = day.year if day.month >= 3 else day.year - 1
+    week = (day - season_kickoff(season)).days // 7 + 1
+    return season, int(min(max(week, 1), 22))
+
+def add_season_week(df, season=None, week=None):
+    """Copy of df with season/week columns: explicit values, then the file's own, then data_date"""
+    out = df.copy()
+    if season is not None:
+        out['season'] = season
+    if week is not None:
+        out['week'] = week
+    if 'season' not in out.columns or 'week' not in out.columns:
+        dates = pd.to_datetime(out['data_date'], errors='coerce') if 'data_date' in out.columns else None
+        today = nfl_week(date.today())
+        if dates is None or dates.isna().all():
+            pairs = pd.DataFrame([today] * len(out), columns=['season', 'week'], index=out.index)
+        else:
+            # Few distinct dates per file, so map each once
+            lookup = {d: nfl_week(d) for d in dates.dropna().unique()}
+            pairs = pd.DataFrame([lookup.get(d, today) for d in dates], columns=['season', 'week'], index=out.index)
+        for col in ('season', 'week'):
+            if col not in out.columns:
+                out[col] = pairs[col]
+    return out
+
+# =====================================
+# STORE
+# =====================================
+
+class HistoryStore:
+    """SQLite archive of weekly player rows (one connection, shared across threads)"""
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(SCHEMA)
+        self._add_missing_columns()
+        self._key_lineups_by_contest()
+        self._lock = threading.Lock()
+
+    def _add_missing_columns(self):
+        """Bring archives made before a column was added up to HISTORY_COLUMNS"""
+        existing = {row[1] for row in self._conn.execute("PRAGMA table_info(player_weeks)")}
+        for col, kind in HISTORY_COLUMNS.items():
+            if col not in existing:
+                self._conn.execute(f"ALTER TABLE player_weeks ADD COLUMN {col} {kind}")
+
+    def _key_lineups_by_contest(self):
+        """Lineups archived before contests were tracked were the platform's classic contest"""
+        existing = {row[1] for row in self._conn.execute("PRAGMA table_info(lineups)")}
+        if 'contest' in existing:
+            return
+        # The primary key changes, so rebuild the table
+        with self._conn:
+            self._conn.execute("ALTER TABLE lineups RENAME TO lineups_old")
+            self._conn.execute(LINEUPS_TABLE)
+            self._conn.execute(
+                "INSERT INTO lineups SELECT season, week, platform, platform, lineup_id, player_name, roster_slot "
+                "FROM lineups_old")
+            self._conn.execute("DROP TABLE lineups_old")
+
+    def close(self):
+        self._conn.close()
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return pd.read_sql_query(sql, self._conn, params=params)
+
+    def _touch(self, frame):
+        """Bump the revision of every (season, week, platform) in frame (caller holds the lock)"""
+        keys = frame[['season', 'week', 'platform']].drop_duplicates()
+        self._conn.executemany(
+            "INSERT INTO week_revisions (season, week, platform, revision) VALUES (?, ?, ?, 1) "
+            "ON CONFLICT (season, week, platform) DO UPDATE SET revision = revision + 1",
+            [(int(season), int(week), platform) for season, week, platform in keys.itertuples(index=False)])
+
+    @staticmethod
+    def _keyed(df, season, week, platform=None):
+        frame = add_season_week(df, season, week)
+        if platform is not None:
+            frame['platform'] = platform
+        elif 'platform' not in frame.columns:
+            frame['platform'] = 'DraftKings'
+        return frame
+
+    def append(self, df, season=None, week=None):
+        """Archive a slate (replacing any earlier copy of the same player-weeks); returns rows written"""
+        if len(df) == 0:
+            return 0
+        frame = self._keyed(df, season, week)
+
+        columns = ['season', 'week', 'platform', 'player_name'] + [c for c in HISTORY_COLUMNS if c in frame.columns]
+        frame = frame[columns].astype(object).where(frame[columns].notna(), None)
+        frame['season'] = frame['season'].astype(int)
+        frame['week'] = frame['week'].astype(int)
+
+        # Upsert so a re-run refresh (or a later ownership pull) updates in place
+        placeholders = ', '.join('?' * len(columns))
+        updates = ', '.join(f'{c} = excluded.{c}' for c in columns[4:])
+        sql = (f"INSERT INTO player_weeks ({', '.join(columns)}) VALUES ({placeholders}) "
+               f"ON CONFLICT (season, week, platform, player_name) DO "
+               + (f"UPDATE SET {updates}" if updates else "NOTHING"))
+        with self._lock, self._conn:
+            self._conn.executemany(sql, frame.itertuples(index=False, name=None))
+            self._touch(frame)
+        return len(frame)
+
+    def record_actuals(self, df, season=None, week=None):
+        """Fill in actual_points for archived player-weeks; returns rows updated"""
+        frame = self._keyed(df, season, week)
+        actual = pd.to_numeric(frame['actual_points'], errors='coerce')
+        rows = zip(actual.astype(object).where(actual.notna(), None), frame['season'].astype(int),
+                   frame['week'].astype(int), frame['platform'], frame['player_name'])
+        with self._lock, self._conn:
+            cursor = self._conn.executemany(
+                "UPDATE player_weeks SET actual_points = ? "
+                "WHERE season = ? AND week = ? AND platform = ? AND player_name = ?", rows)
+            self._touch(frame)
+        return cursor.rowcount
+
+    def record_lineups(self, lineups_df, season=None, week=None, platform=None, contest=None):
+        """Replace a week's played lineups for one contest format (lineup_id, player_name, roster_slot rows);
+        returns lineups stored. contest defaults to the platform's classic contest"""
+        if len(lineups_df) == 0:
+            return 0
+        frame = self._keyed(lineups_df, season, week, platform)
+        if contest is not None:
+            frame['contest'] = contest
+        elif 'contest' not in frame.columns:
+            frame['contest'] = frame['platform']
+        if 'roster_slot' not in frame.columns:
+            frame['roster_slot'] = None
+        keys = frame[['season', 'week', 'platform', 'contest']].drop_duplicates()
+        rows = zip(frame['season'].astype(int), frame['week'].astype(int), frame['platform'], frame['contest'],
+                   frame['lineup_id'].astype(int), frame['player_name'], frame['roster_slot'])
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM lineups WHERE season = ? AND week = ? AND platform = ? AND contest = ?",
+                [(int(a), int(b), c, d) for a, b, c, d in keys.itertuples(index=False)])
+            self._conn.executemany("INSERT OR REPLACE INTO lineups VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            self._touch(frame)
+        return frame['lineup_id'].nunique()
+
+    # Queries -----------------------------------------------------------
+
+    def weeks(self):
+        """Archived (season, week) pairs, oldest first"""
+        return self._query("SELECT DISTINCT season, week FROM player_weeks ORDER BY season, week")
+
+    def week_revisions(self, period='All Time', platform=None):
+        """(season, week, platform, revision) for every archived week in a period"""
+        where, params = self._period_filter(period, platform)
+        return self._query(f"SELECT * FROM week_revisions WHERE {where} ORDER BY season, week, platform", params)
+
+    def _period_start(self, period):
+        """Earliest (season, week) in a period, or None for all time"""
+        kind = PERIODS.get(period, period)
+        with self._lock:
+            if kind == 'season':
+                row = self._conn.execute("SELECT MAX(season) FROM player_weeks").fetchone()
+                return None if row[0] is None else (row[0], 0)
+            if kind == 'last_4':
+                # Walks the primary key backwards; stops after 4 distinct weeks
+                rows = self._conn.execute(
+                    "SELECT DISTINCT season, week FROM player_weeks ORDER BY season DESC, week DESC LIMIT 4"
+                ).fetchall()
+                return rows[-1] if rows else None
+        return None
+
+    def period_rows(self, period='All Time', platform=None, play_types=None):
+        """Archived player rows for a period"""
+        sql, params = self._period_filter(period, platform)
+        if play_types:
+            sql += f" AND play_type IN ({', '.join('?' * len(play_types))})"
+            params += list(play_types)
+        return self._query(f"SELECT * FROM player_weeks WHERE {sql} ORDER BY season, week", params)
+
+    def _period_filter(self, period, platform):
+        clauses, params = ['1 = 1'], []
+        start = self._period_start(period)
+        if start is not None:
+            clauses.append('(season, week) >= (?, ?)')
+            params += list(start)
+        if platform is not None:
+            clauses.append('platform = ?')
+            params.append(platform)
+        return ' AND '.join(clauses), params
+
+    # Backtest cache -----------------------------------------------------
+
+    def backtest_cache(self):
+        """{(season, week, platform): (revision, metrics dict)} for every cached backtest week"""
+        with self._lock:
+            rows = self._conn.execute("SELECT season, week, platform, revision, metrics FROM backtest_weeks").fetchall()
+        return {(season, week, platform): (revision, json.loads(metrics))
+                for season, week, platform, revision, metrics in rows}
+
+    def save_backtests(self, results):
+        """Cache backtest metrics: iterable of ((season, week, platform), revision, metrics dict)"""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO backtest_weeks VALUES (?, ?, ?, ?, ?)",
+                [key + (revision, json.dumps(metrics)) for key, revision, metrics in results])
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Archive a slate (or actual points) in the history store")
+    parser.add_argument('csv_path', nargs='?', default='fantasy_data.csv')
+    parser.add_argument('--db', default=DEFAULT_PATH)
+    parser.add_argument('--season', type=int)
+    parser.add_argument('--week', type=int)
+    parser.add_argument('--actuals', action='store_true', help="file has player_name + actual_points")
+    parser.add_argument('--lineups', action='store_true', help="file has lineup_id + player_name (+ roster_slot)")
+    parser.add_argument('--platform', help="platform the lineups are from (default: the contest's, else DraftKings)")
+    parser.add_argument('--contest', help="contest format the lineups were played in, e.g. 'DraftKings Showdown' "
+                                          "(default: the platform's classic contest)")
+    args = parser.parse_args()
+
+    store = HistoryStore(args.db)
+    frame = pd.read_csv(args.csv_path)
+    if args.actuals:
+        count = store.record_actuals(frame, args.season, args.week)
+        print(f"✅ Recorded actual points for {count:,} player-weeks in {args.db}")
+    elif args.lineups:
+        platform = args.platform or (get_rules(args.contest).data_platform if args.contest else None)
+        count = store.record_lineups(frame, args.season, args.week, platform, args.contest)
+        print(f"✅ Recorded {count:,} lineups in {args.db}")
+    else:
+        count = store.append(frame, args.season, args.week)
+        print(f"✅ Archived {count:,} rows in {args.db}")
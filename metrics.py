@@ -0,0 +1,275 @@
+# METRICS
+# In-process counters and latency histograms for the app's hot paths (data
+# load, caches, page prep, optimizer solves, charts), plus a Prometheus text
+# export so monitoring can scrape them.
+#
+# Recording is a dict lookup, a bisect and a deque append under one lock, so
+# it's safe to leave on in production. Histograms keep Prometheus buckets for
+# export and the last RESERVOIR_SIZE samples for the p50/p95 the sidebar shows.
+#
+# Export (both optional, started once per server):
+#   METRICS_FILE=metrics.prom   rewritten every METRICS_EXPORT_SECONDS
+#   METRICS_PORT=9108           serves GET /metrics
+#
+# Usage: python metrics.py [--file metrics.prom]   (print the last export)
+
+import argparse
+import bisect
+import functools
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+METRICS_FILE = os.environ.get('METRICS_FILE', 'metrics.prom')
+METRICS_PORT = os.environ.get('METRICS_PORT')
+METRICS_HOST = os.environ.get('METRICS_HOST', '0.0.0.0')
+METRICS_EXPORT_SECONDS = 15
+
+# Latency buckets in seconds (upper bounds; +Inf is implied)
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Recent samples kept per histogram series for percentiles
+RESERVOIR_SIZE = 1024
+
+PREFIX = 'fantasy_'
+
+# =====================================
+# REGISTRY
+# =====================================
+
+class Histogram:
+    """Bucket counts + sum for export, recent samples for percentiles"""
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.recent = deque(maxlen=RESERVOIR_SIZE)
+
+    def observe(self, seconds):
+        self.buckets[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.recent.append(seconds)
+
+    def percentiles(self, *qs):
+        if not self.recent:
+            return [float('nan')] * len(qs)
+        return list(np.percentile(np.fromiter(self.recent, dtype=np.float64), qs))
+
+class MetricsRegistry:
+    """Named counters and histograms, each split by keyword labels"""
+
+    def __init__(self):
+        self.counters = {}    # name -> {labels: value}
+        self.histograms = {}  # name -> {labels: Histogram}
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+
+    def inc(self, name, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def observe(self, name, seconds, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self.histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """Time the with-block into histogram `name` (recorded even if it raises)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def timed(self, name, **labels):
+        """Decorator form of timer"""
+        def decorate(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timer(name, **labels):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def counter(self, name, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            return self.counters.get(name, {}).get(key, 0)
+
+    def reset(self):
+        with self._lock:
+            self.counters, self.histograms = {}, {}
+            self.started_at = time.time()
+
+    # Reports -----------------------------------------------------------
+
+    def latency_summary(self):
+        """One row per histogram series: count, p50/p95 and mean in ms"""
+        with self._lock:
+            series = [(name, dict(key), h.count, h.total, *h.percentiles(50, 95))
+                      for name, by_labels in self.histograms.items() for key, h in by_labels.items()]
+        rows = [{
+            'metric': name,
+            'labels': ', '.join(f'{k}={v}' for k, v in labels.items()),
+            'count': count,
+            'p50_ms': round(p50 * 1000, 2),
+            'p95_ms': round(p95 * 1000, 2),
+            'mean_ms': round(total / count * 1000, 2) if count else None,
+        } for name, labels, count, total, p50, p95 in series]
+        return pd.DataFrame(rows, columns=['metric', 'labels', 'count', 'p50_ms', 'p95_ms', 'mean_ms'])
+
+    def cache_summary(self):
+        """Requests, hits, misses and hit rate per cache (see counted_cache)"""
+        with self._lock:
+            requests = dict(self.counters.get('cache_requests_total', {}))
+            misses = dict(self.counters.get('cache_misses_total', {}))
+        rows = []
+        for key, total in sorted(requests.items()):
+            missed = misses.get(key, 0)
+            rows.append({
+                'cache': dict(key).get('cache', ''),
+                'requests': total,
+                'hits': max(total - missed, 0),
+                'misses': missed,
+                'hit_rate_pct': round(100 * max(total - missed, 0) / total, 1) if total else None,
+            })
+        return pd.DataFrame(rows, columns=['cache', 'requests', 'hits', 'misses', 'hit_rate_pct'])
+
+    def prometheus_text(self):
+        """Everything in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self.counters.items()):
+                lines.append(f'# TYPE {PREFIX}{name} counter')
+                for key, value in series.items():
+                    lines.append(f'{PREFIX}{name}{_labels(key)} {value}')
+            for name, series in sorted(self.histograms.items()):
+                lines.append(f'# TYPE {PREFIX}{name} histogram')
+                for key, h in series.items():
+                    cumulative = 0
+                    for bound, count in zip(BUCKETS + (float('inf'),), h.buckets):
+                        cumulative += count
+                        le = '+Inf' if bound == float('inf') else repr(bound)
+                        lines.append(f'{PREFIX}{name}_bucket{_labels(key + (("le", le),))} {cumulative}')
+                    lines.append(f'{PREFIX}{name}_sum{_labels(key)} {h.total:.6f}')
+                    lines.append(f'{PREFIX}{name}_count{_labels(key)} {h.count}')
+        lines.append(f'# TYPE {PREFIX}uptime_seconds gauge')
+        lines.append(f'{PREFIX}uptime_seconds {time.time() - self.started_at:.0f}')
+        return '\n'.join(lines) + '\n'
+
+def _labels(key):
+    if not key:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', ' ') for _, v in key)
+    return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(key, escaped)) + '}'
+
+# The registry the app and its modules record into
+REGISTRY = MetricsRegistry()
+inc = REGISTRY.inc
+observe = REGISTRY.observe
+timer = REGISTRY.timer
+timed = REGISTRY.timed
+
+# =====================================
+# CACHE COUNTERS
+# =====================================
+
+def counted_cache(name, cache):
+    """Wrap a Streamlit cache decorator so its requests and misses are counted
+
+        @counted_cache('load_data', st.cache_data(max_entries=2))
+        def load_data(version): ...
+
+    The function body only runs on a miss, so hits = requests - misses.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def compute(*args, **kwargs):
+            REGISTRY.inc('cache_misses_total', cache=name)
+            with REGISTRY.timer('cache_compute_seconds', cache=name):
+                return func(*args, **kwargs)
+
+        cached = cache(compute)
+
+        @functools.wraps(func)
+        def lookup(*args, **kwargs):
+            REGISTRY.inc('cache_requests_total', cache=name)
+            return cached(*args, **kwargs)
+
+        lookup.clear = getattr(cached, 'clear', None)
+        return lookup
+    return decorate
+
+# =====================================
+# EXPORT
+# =====================================
+
+def write_prometheus(path=METRICS_FILE, registry=REGISTRY):
+    """Atomically rewrite the export file (scrapers never see half a file)"""
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(registry.prometheus_text())
+    os.replace(tmp_path, path)
+
+def serve_metrics(port, host=METRICS_HOST, registry=REGISTRY):
+    """Serve GET /metrics on a daemon thread"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = registry.prometheus_text().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass  # keep scrapes out of the app log
+
+    server = ThreadingHTTPServer((host, int(port)), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def start_exporter(path=METRICS_FILE, port=METRICS_PORT, interval=METRICS_EXPORT_SECONDS, registry=REGISTRY):
+    """Export file writer (if path) and /metrics server (if port); returns the server or None"""
+    if path:
+        def export_loop():
+            while True:
+                time.sleep(interval)
+                try:
+                    write_prometheus(path, registry)
+                except OSError:
+                    pass  # read-only disk: the HTTP endpoint / panel still work
+
+        threading.Thread(target=export_loop, daemon=True).start()
+    return serve_metrics(port, registry=registry) if port else None
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Print the app's last metrics export")
+    parser.add_argument('--file', default=METRICS_FILE)
+    args = parser.parse_args()
+
+    if os.path.exists(args.file):
+        with open(args.file, encoding='utf-8') as f:
+            print(f.read(), end='')
+    else:
+        print(f"No metrics export at {args.file} - is the app running?")
@@ -0,0 +1,1331 @@
+# LINEUP OPTIMIZER
+# Exact lineup builder used by the Lineup Builder page.
+# The old greedy pass is kept as solver='greedy' so benchmarks can compare.
+
+import heapq
+import itertools
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, reduce
+from math import gcd
+
+import numpy as np
+import pandas as pd
+
+from metrics import timed
+from platforms import DEFAULT_PLATFORM, get_rules, salary_units
+
+# =====================================
+# ROSTER RULES
+# =====================================
+
+# Defaults are DraftKings classic; other platforms/formats come from platforms.py
+DEFAULT_RULES = get_rules(DEFAULT_PLATFORM)
+DEFAULT_SALARY_CAP = DEFAULT_RULES.salary_cap
+
+# (slot, eligible positions, count) - DraftKings-style 1/2/3/1/FLEX
+ROSTER_SLOTS = DEFAULT_RULES.roster_slots
+
+# =====================================
+# PLAYER POOL PREPARATION
+# =====================================
+
+def clean_player_pool(df):
+    """Copy of df with valid numerics, points_per_dollar and contrarian_score"""
+    work_df = df.copy()
+
+    # Ensure numeric columns are properly typed
+    work_df['projected_points'] = pd.to_numeric(work_df['projected_points'], errors='coerce')
+    work_df['estimated_salary'] = pd.to_numeric(work_df['estimated_salary'], errors='coerce')
+
+    # Remove rows with invalid data
+    work_df = work_df.dropna(subset=['projected_points', 'estimated_salary'])
+    work_df = work_df[work_df['projected_points'] > 0]
+    work_df = work_df[work_df['estimated_salary'] > 0]
+
+    # Calculate value metrics (per $1K, or per $1 on small-cap platforms like Yahoo)
+    units = salary_units(work_df['platform']) if 'platform' in work_df.columns else 1000
+    work_df['points_per_dollar'] = work_df['projected_points'] / (work_df['estimated_salary'] / units)
+
+    # Add contrarian score if available
+    if 'contrarian_score' in work_df.columns:
+        work_df['contrarian_score'] = pd.to_numeric(work_df['contrarian_score'], errors='coerce').fillna(0)
+    else:
+        work_df['contrarian_score'] = 50  # Default neutral score
+
+    return work_df.reset_index(drop=True)
+
+def score_player_pool(work_df, strategy='Tournament (GPP)'):
+    """Cleaned pool plus the strategy optimizer_score (shares data with work_df)"""
+    scored = work_df.copy(deep=False)
+    scored['optimizer_score'] = strategy_scores(
+        work_df['projected_points'].to_numpy(dtype=float),
+        work_df['contrarian_score'].to_numpy(dtype=float),
+        work_df['points_per_dollar'].to_numpy(dtype=float),
+        strategy,
+    )
+    return scored
+
+def prepare_player_pool(df, strategy='Tournament (GPP)'):
+    """Clean the player pool and add the strategy optimizer_score"""
+    return score_player_pool(clean_player_pool(df), strategy)
+
+def strategy_scores(projected_points, contrarian_score, points_per_dollar, strategy):
+    """Strategy-based optimizer score (works on arrays or scalars)"""
+    if strategy == 'Tournament (GPP)':
+        return projected_points * 0.4 + contrarian_score * 0.6
+    elif strategy == 'Cash Game':
+        return projected_points * 0.7 + points_per_dollar * 0.3
+    else:  # Ultra Contrarian
+        return contrarian_score * 1.0
+
+# =====================================
+# EXACT SOLVER (BRANCH AND BOUND)
+# =====================================
+
+# Salary grids finer than this fall back to the HiGHS integer program
+MAX_SALARY_STEPS = 2000
+
+# ...as do rosters whose position-count combos x salary steps pass this
+# (single-game formats: dozens of combos, each a full convolution chain)
+MAX_DP_WORK = 10000
+
+# Cached per-position DP tables / salary convolutions kept per model
+TABLE_CACHE_SIZE = 256
+CONV_CACHE_SIZE = 2048
+
+# A search node's position table starts from one shared with its siblings
+# when at most 1/SPLIT_SHARE of its players are left to add
+SPLIT_SHARE = 4
+
+class LineupModel:
+    """Exact lineup solver over a fixed player pool
+
+    The bound at every node is the true optimum of roster + salary cap,
+    computed with a per-position knapsack DP over the salary grid and
+    max-plus convolutions between positions. Extra rows (uniqueness cuts,
+    stacks, team limits) are enforced by branching on a violated row,
+    best-first, so the first feasible lineup popped is provably optimal.
+
+    The search frontier is kept between solves: appending rows or
+    excluding players only shrinks the feasible set, so the next lineup
+    continues from where the previous solve stopped instead of restarting.
+
+    groups are (players, lower, upper) rows the bound itself respects:
+    players are split by position and the groups they're in, and only
+    count combos inside every group's bounds are searched. Branching on a
+    cardinality row takes one level per player it needs, so rows that
+    hold in every lineup (a fixed team's stack) belong here.
+    """
+
+    def __init__(self, positions, salaries, salary_cap=DEFAULT_SALARY_CAP, roster_slots=ROSTER_SLOTS, groups=()):
+        self.positions = np.asarray(positions)
+        self.salaries = np.asarray(salaries, dtype=float)
+        self.salary_cap = float(salary_cap)
+        self.roster_slots = roster_slots
+        self.n_players = len(self.positions)
+        self.roster_size = sum(count for _, _, count in roster_slots)
+
+        self.slot_positions = sorted({pos for _, eligible, _ in roster_slots for pos in eligible})
+        self.eligible = np.isin(self.positions, self.slot_positions)
+
+        # Most players of each position a lineup can hold
+        self.max_picks = {
+            pos: sum(count for _, eligible, count in roster_slots if pos in eligible)
+            for pos in self.slot_positions
+        }
+
+        # Hall rows: for every set of positions, picks <= slots any of them can fill
+        self.hall_rows = []
+        for mask in range(1, 2 ** len(self.slot_positions)):
+            subset = [pos for bit, pos in enumerate(self.slot_positions) if mask >> bit & 1]
+            capacity = sum(count for _, eligible, count in roster_slots if set(eligible) & set(subset))
+            if capacity < self.roster_size:
+                self.hall_rows.append((mask, capacity))
+
+        # Every per-position count vector that fits the roster
+        self.count_combos = [
+            counts for counts in itertools.product(*[range(self.max_picks[p] + 1) for p in self.slot_positions])
+            if sum(counts) == self.roster_size and all(
+                sum(n for bit, n in enumerate(counts) if mask >> bit & 1) <= capacity
+                for mask, capacity in self.hall_rows
+            )
+        ]
+        self._setup_groups(groups)
+
+        self._members = OrderedDict()  # search node -> its players per position, kept across objectives
+        self._setup_salary_grid()
+        self.reset_rows()
+
+    def _setup_groups(self, groups):
+        """Split positions into labels by group membership, and count combos across the labels"""
+        self.groups = [(np.asarray(players, dtype=int), lower, upper) for players, lower, upper in groups]
+        labels = self.positions.astype(str).astype(object)
+        for g, (players, _, _) in enumerate(self.groups):
+            labels[players] += f'/{g}'
+        self._position_of = labels.tolist()  # plain list: fast per-player lookups in the search
+
+        # Plain positions first: their big tables make the shared convolution prefixes
+        eligible_labels = set(labels[self.eligible].tolist())
+        self.labels = self.slot_positions + sorted(eligible_labels - set(self.slot_positions))
+        self.pos_players = {label: np.flatnonzero(labels == label) for label in self.labels}
+        base = [label.split('/')[0] for label in self.labels]
+        self.max_picks.update((label, self.max_picks[pos]) for label, pos in zip(self.labels, base))
+
+        # _relax convolves the head and tail labels separately and joins them at
+        # the cap: plain positions vs the small grouped tables, or all but the last
+        self._head = len(self.slot_positions) if self.groups else len(self.labels) - 1
+        if not self.groups:
+            self.label_combos = self.count_combos
+            return
+
+        # Labels can't give more players than they hold, and every group stays in its bounds
+        combos = _label_splits(tuple(self.count_combos), tuple(self.slot_positions), tuple(base))
+        sizes = np.array([len(self.pos_players[label]) for label in self.labels])
+        keep = (combos <= sizes).all(axis=1)
+        for g, (_, lower, upper) in enumerate(self.groups):
+            in_group = np.array([str(g) in label.split('/')[1:] for label in self.labels])
+            picked = combos[:, in_group].sum(axis=1)
+            keep &= (picked >= lower) & (picked <= upper)
+        self.label_combos = [tuple(counts) for counts in combos[keep].tolist()]
+
+    def _setup_salary_grid(self):
+        """Express salaries as whole steps of their common divisor"""
+        self.use_dp = False
+        salaries = self.salaries[self.eligible]
+        if not np.isfinite(self.salary_cap) or not np.all(salaries == np.round(salaries)):
+            return
+
+        step = reduce(gcd, [int(self.salary_cap)] + [int(s) for s in np.unique(salaries)])
+        if step <= 0 or self.salary_cap / step > MAX_SALARY_STEPS:
+            return
+        if len(self.count_combos) * (self.salary_cap // step) > MAX_DP_WORK:
+            return
+
+        self.use_dp = True
+        self.steps = int(self.salary_cap // step)
+        self.cost = np.where(self.eligible, np.round(self.salaries / step), 0).astype(np.int64)
+        self._reset_search(None)
+
+    def reset_rows(self):
+        """Drop every row added with add_row"""
+        self._row_players = []
+        self._row_coefs = []
+        self._row_lower = []
+        self._row_upper = []
+        self._player_rows = {}  # player -> indices of the added rows it's in
+        self._rows = None
+        self._search = None
+
+    def add_row(self, players, upper=np.inf, lower=-np.inf, coefs=1.0):
+        """Append lower <= sum(coefs * x[players]) <= upper to the model"""
+        players = np.asarray(players, dtype=int)
+        for player in players.tolist():
+            self._player_rows.setdefault(player, []).append(len(self._row_players))
+        self._row_players.append(players)
+        self._row_coefs.append(np.broadcast_to(np.asarray(coefs, dtype=float), players.shape).copy())
+        self._row_lower.append(lower)
+        self._row_upper.append(upper)
+        self._rows = None
+
+    @property
+    def n_extra_rows(self):
+        return len(self._row_players)
+
+    def _extra_rows(self):
+        """Added rows as one sparse matrix plus bounds, rebuilt once per change"""
+        if self._rows is None:
+            from scipy.sparse import csr_matrix  # scipy loads with the first constrained solve, not at app start
+
+            n_rows = len(self._row_players)
+            row_ids = np.concatenate([np.full(len(p), r) for r, p in enumerate(self._row_players)] or [[]])
+            matrix = csr_matrix(
+                (np.concatenate(self._row_coefs or [[]]),
+                 (row_ids.astype(int), np.concatenate(self._row_players or [[]]).astype(int))),
+                shape=(n_rows, self.n_players),
+            )
+            self._rows = (matrix, np.array(self._row_lower, dtype=float), np.array(self._row_upper, dtype=float))
+        return self._rows
+
+    def solve(self, scores, locked=(), excluded=()):
+        """Solve for the max-score lineup; returns [(player_idx, slot_idx)] or None"""
+        scores = np.asarray(scores, dtype=float)
+        locked = frozenset(int(p) for p in locked)
+        excluded = frozenset(int(p) for p in excluded)
+
+        if self.n_players == 0 or locked & excluded or not all(self.eligible[p] for p in locked):
+            return None
+
+        if self.use_dp:
+            players = self._branch_and_bound(scores, locked, excluded)
+        else:
+            players = self._solve_milp(scores, locked, excluded)
+
+        if players is None:
+            return None
+        return assign_slots(players, self.positions, self.roster_slots)
+
+    def upper_bound(self, scores, locked=(), excluded=()):
+        """No lineup solve can return scores higher than this (-inf when none fits)"""
+        scores = np.asarray(scores, dtype=float)
+        locked = frozenset(int(p) for p in locked)
+        excluded = frozenset(int(p) for p in excluded)
+        if self.n_players == 0 or locked & excluded or not all(self.eligible[p] for p in locked):
+            return -np.inf
+        if not self.use_dp:
+            return np.inf
+        frontier = self._start_search(scores, locked, excluded)['frontier']
+        return -frontier[0][0] if frontier else -np.inf
+
+    # -------------------------------------
+    # Branch and bound
+    # -------------------------------------
+
+    def _reset_search(self, scores):
+        """Start over for a new objective: DP values and the frontier go, player structure stays"""
+        self._scores = scores
+        self._tables = OrderedDict()
+        self._convs = OrderedDict()
+        self._search = None
+
+    def _start_search(self, scores, locked, excluded):
+        """The search for this request: the previous one when the request only narrows it"""
+        if self._scores is None or not np.array_equal(scores, self._scores):
+            self._reset_search(scores.copy())
+
+        search = self._search
+        if search is None or search['locked'] != locked or not search['excluded'] <= excluded:
+            value, players = self._relax(locked, excluded)
+            frontier = [] if players is None else [(-value, 0, locked, excluded, players)]
+            search = {'locked': locked, 'excluded': excluded, 'frontier': frontier, 'counter': itertools.count(1)}
+            self._search = search
+        # Nodes scored before newer exclusions keep their (higher) bound until popped
+        search['excluded'] = excluded
+        return search
+
+    def _branch_and_bound(self, scores, locked, excluded):
+        search = self._start_search(scores, locked, excluded)
+        frontier = search['frontier']
+        counter = search['counter']
+
+        while frontier:
+            neg_value, _, node_locked, node_excluded, players = heapq.heappop(frontier)
+
+            # Players excluded since this node was scored need a fresh bound
+            if not excluded <= node_excluded:
+                if node_locked & excluded:
+                    continue
+                node_excluded = node_excluded | excluded
+                value, players = self._relax(node_locked, node_excluded)
+                if players is not None:
+                    heapq.heappush(frontier, (-value, next(counter), node_locked, node_excluded, players))
+                continue
+
+            certificate = self._violated_row(players)
+            if certificate is None:
+                heapq.heappush(frontier, (neg_value, next(counter), node_locked, node_excluded, players))
+                return players
+
+            # Partition the node so every child disagrees with this lineup on
+            # the certificate: child k keeps the first k-1 choices and flips the k-th
+            chosen = set(players)
+            child_locked, child_excluded = set(node_locked), set(node_excluded)
+            for player in certificate:
+                if player in node_locked or player in node_excluded:
+                    continue
+                flip_locked, flip_excluded = set(child_locked), set(child_excluded)
+                if player in chosen:
+                    flip_excluded.add(player)
+                    child_locked.add(player)
+                else:
+                    flip_locked.add(player)
+                    child_excluded.add(player)
+                value, child_players = self._relax(frozenset(flip_locked), frozenset(flip_excluded))
+                if child_players is not None:
+                    heapq.heappush(frontier, (-value, next(counter), frozenset(flip_locked),
+                                              frozenset(flip_excluded), child_players))
+        return None
+
+    def _violated_row(self, players):
+        """Players that make the first violated added row fail, or None"""
+        if not self._row_players:
+            return None
+        matrix, lower, upper = self._extra_rows()
+        x = np.zeros(self.n_players)
+        x[players] = 1
+        lhs = matrix @ x
+        bad = np.flatnonzero((lhs > upper + 1e-9) | (lhs < lower - 1e-9))
+        if len(bad) == 0:
+            return None
+
+        row = bad[0]
+        members = self._row_players[row]
+        coefs = self._row_coefs[row]
+        picked = x[members] > 0
+        if lhs[row] > upper[row]:
+            keep = ((coefs > 0) & picked) | ((coefs < 0) & ~picked)
+        else:
+            keep = ((coefs < 0) & picked) | ((coefs > 0) & ~picked)
+        return [int(p) for p in members[keep]]
+
+    def _relax(self, locked, excluded):
+        """Best roster under the salary cap and groups, ignoring added rows; (value, players)"""
+        tables = {}
+        for label in self.labels:
+            tables[label] = self._position_table(label, locked, excluded)
+
+        convs = {}
+
+        def chain(labels, counts):
+            """Convolution of labels at counts, built along cached prefixes; (key, (values, splits))"""
+            prefix, key = None, ()
+            for label, count in zip(labels, counts):
+                # Taking nobody from a label without locks changes nothing
+                if count == 0 and prefix is not None and tables[label][3][0, 0] == 0:
+                    continue
+                key += (tables[label][0], count)
+                if key not in convs:
+                    convs[key] = self._convolve(key, prefix, tables[label][3][count])
+                prefix = convs[key]
+            return key, prefix
+
+        head, tail = self.labels[:self._head], self.labels[self._head:]
+        heads, tails = {}, {}
+        best_value, best_plan = -np.inf, None
+        for counts in self.label_combos:
+            head_counts, tail_counts = counts[:self._head], counts[self._head:]
+            if head_counts not in heads:
+                heads[head_counts] = chain(head, head_counts)
+            if tail_counts not in tails:
+                tails[tail_counts] = chain(tail, tail_counts)
+
+            # Only the full-cap value of the join is needed
+            totals = heads[head_counts][1][0] + tails[tail_counts][1][0][::-1]
+            split = int(np.argmax(totals))
+            if totals[split] > best_value:
+                best_value, best_plan = totals[split], (counts, split, head_counts, tail_counts)
+
+        if best_plan is None or not np.isfinite(best_value):
+            return -np.inf, None
+
+        # Walk each chain's convolutions back to every label's salary budget
+        counts, split, head_counts, tail_counts = best_plan
+        budgets = {}
+        for key, remaining in ((heads[head_counts][0], split), (tails[tail_counts][0], self.steps - split)):
+            labels = [table_key[0] for table_key in key[::2]]
+            for depth in range(len(labels) - 1, 0, -1):
+                start = convs[key[:2 * (depth + 1)]][1][remaining]
+                budgets[labels[depth]] = remaining - start
+                remaining = start
+            budgets[labels[0]] = remaining
+
+        players = []
+        for pos, count in zip(self.labels, counts):
+            _, members, take, _ = tables[pos]
+            budget = budgets.get(pos, 0)
+            for j in range(len(members) - 1, -1, -1):
+                if count == 0:
+                    break
+                if take[j, count - 1, budget]:
+                    players.append(int(members[j]))
+                    budget -= self.cost[members[j]]
+                    count -= 1
+        return best_value, players
+
+    def _position_members(self, key):
+        """Players, lock flags and costs behind a position table (don't depend on the scores)"""
+        if key in self._members:
+            self._members.move_to_end(key)
+            return self._members[key]
+
+        pos, pos_locked, pos_excluded = key
+        members = self.pos_players[pos]
+        if pos_excluded:
+            members = members[~np.isin(members, list(pos_excluded))]
+        is_locked = np.isin(members, list(pos_locked))
+        entry = (members, is_locked, self.cost[members])
+        self._members[key] = entry
+        if len(self._members) > TABLE_CACHE_SIZE:
+            self._members.popitem(last=False)
+        return entry
+
+    def _position_table(self, pos, locked, excluded, split=True):
+        """Knapsack DP for one position: best[k, s] = top score of k players within s steps"""
+        position_of = self._position_of
+        pos_locked = frozenset(p for p in locked if position_of[p] == pos)
+        pos_excluded = frozenset(p for p in excluded if position_of[p] == pos)
+        key = (pos, pos_locked, pos_excluded)
+        if key in self._tables:
+            self._tables.move_to_end(key)
+            return self._tables[key]
+
+        members, is_locked, costs = self._position_members(key)
+        scores = self._scores[members]
+
+        # Dominated players can't change the relaxation optimum
+        limit = self.max_picks[pos]
+        keep = ~dominated_mask(costs, scores, limit) | is_locked
+        members, is_locked, costs, scores = members[keep], is_locked[keep], costs[keep], scores[keep]
+
+        steps = self.steps
+        best = np.full((limit + 1, steps + 1), -np.inf)
+        best[0] = 0.0
+        base_members, base_take = members[:0], np.zeros((0, limit, steps + 1), dtype=bool)
+        touched = pos_locked | pos_excluded
+        if split and touched and self._row_players:
+            # Sibling nodes only disagree on players sharing a row with the ones
+            # branched on: start them all from one table without those players
+            # (when that leaves most of the position to share)
+            rows = {row for player in touched for row in self._player_rows.get(player, ())}
+            near = [p for row in rows for p in self._row_players[row].tolist() if position_of[p] == pos]
+            tail = np.isin(members, near) | is_locked
+            if tail.sum() * SPLIT_SHARE <= len(members):
+                _, base_members, base_take, base_best = self._position_table(
+                    pos, (), touched.union(near), split=False)
+                best = base_best.copy()
+                members, is_locked, costs, scores = members[tail], is_locked[tail], costs[tail], scores[tail]
+
+        take = np.zeros((len(members), limit, steps + 1), dtype=bool)
+        for j in range(len(members)):
+            cost = costs[j]
+            if is_locked[j]:
+                added = np.full((limit, steps + 1), -np.inf)
+                if cost <= steps:
+                    added[:, cost:] = best[:-1, :steps + 1 - cost] + scores[j]
+                take[j] = True
+                best = np.vstack([np.full((1, steps + 1), -np.inf), added])
+            elif cost <= steps:
+                # Only budgets that can afford the player change
+                added = best[:-1, :steps + 1 - cost] + scores[j]
+                np.greater(added, best[1:, cost:], out=take[j, :, cost:])
+                np.maximum(best[1:, cost:], added, out=best[1:, cost:])
+        if len(base_members):
+            members, take = np.concatenate([base_members, members]), np.concatenate([base_take, take])
+
+        table = (key, members, take, best)
+        self._tables[key] = table
+        if len(self._tables) > TABLE_CACHE_SIZE:
+            self._tables.popitem(last=False)
+        return table
+
+    def _convolve(self, key, prefix, values):
+        """Max-plus convolution of a prefix with one more position's DP row"""
+        if key in self._convs:
+            self._convs.move_to_end(key)
+            return self._convs[key]
+
+        if prefix is None:
+            result = (values, None)
+        else:
+            totals = prefix[0]
+            # Both sides are monotone in salary, so only the steps where one of
+            # them improves matter; loop over whichever improves less often
+            rises, value_rises = _rises(totals), _rises(values)
+            budgets = np.arange(self.steps + 1)
+            if len(rises) == 0 or len(value_rises) == 0:
+                result = (np.full(self.steps + 1, -np.inf), np.zeros(self.steps + 1, dtype=int))
+            elif len(rises) <= len(value_rises):
+                offsets = budgets[None, :] - rises[:, None]
+                grid = totals[rises, None] + values[np.maximum(offsets, 0)]
+                grid[offsets < 0] = -np.inf
+                best_row = np.argmax(grid, axis=0)
+                result = (grid[best_row, budgets], rises[best_row])
+            else:
+                offsets = budgets[None, :] - value_rises[:, None]
+                grid = values[value_rises, None] + totals[np.maximum(offsets, 0)]
+                grid[offsets < 0] = -np.inf
+                best_row = np.argmax(grid, axis=0)
+                result = (grid[best_row, budgets], budgets - value_rises[best_row])
+
+        self._convs[key] = result
+        if len(self._convs) > CONV_CACHE_SIZE:
+            self._convs.popitem(last=False)
+        return result
+
+    # -------------------------------------
+    # HiGHS fallback (fine salary grids, single-game rosters)
+    # -------------------------------------
+
+    def _solve_milp(self, scores, locked, excluded):
+        from scipy.optimize import Bounds, LinearConstraint, milp
+        from scipy.sparse import csr_matrix, vstack
+
+        hall = [
+            np.isin(self.positions, [p for bit, p in enumerate(self.slot_positions) if mask >> bit & 1])
+            for mask, _ in self.hall_rows
+        ]
+        groups = [np.isin(np.arange(self.n_players), players) for players, _, _ in self.groups]
+        base = csr_matrix(np.vstack(hall + groups + [self.eligible, self.salaries]).astype(float))
+        lower = [-np.inf] * len(hall) + [low for _, low, _ in self.groups] + [self.roster_size, -np.inf]
+        upper = ([capacity for _, capacity in self.hall_rows] + [high for _, _, high in self.groups]
+                 + [self.roster_size, self.salary_cap])
+
+        matrix = base
+        if self._row_players:
+            extra, extra_lower, extra_upper = self._extra_rows()
+            matrix = vstack([base, extra]).tocsr()
+            lower = np.concatenate([lower, extra_lower])
+            upper = np.concatenate([upper, extra_upper])
+
+        var_lower = np.zeros(self.n_players)
+        var_upper = self.eligible.astype(float)
+        var_lower[list(locked)] = 1
+        var_upper[list(excluded)] = 0
+
+        result = milp(
+            -scores,
+            constraints=LinearConstraint(matrix, lower, upper),
+            integrality=np.ones(self.n_players),
+            bounds=Bounds(var_lower, var_upper),
+            options={'mip_rel_gap': 0},
+        )
+        if result.x is None or result.status != 0:
+            return None
+        return [int(p) for p in np.flatnonzero(result.x > 0.5)]
+
+def _rises(values):
+    """Steps where a salary-monotone DP row first reaches a new value"""
+    return np.flatnonzero(np.isfinite(values) & np.concatenate([[True], values[1:] > values[:-1]]))
+
+@lru_cache(maxsize=64)
+def _label_splits(count_combos, slot_positions, base):
+    """Every label count vector that adds up to one of count_combos (label i holds position base[i])"""
+    blocks = []
+    for counts in count_combos:
+        block = np.zeros((1, len(base)), dtype=int)
+        for pos, count in zip(slot_positions, counts):
+            columns = [i for i, label_pos in enumerate(base) if label_pos == pos]
+            splits = np.array(_compositions(count, [count] * len(columns)), dtype=int)
+            block = np.repeat(block, len(splits), axis=0)
+            block[:, columns] = np.tile(splits, (len(block) // len(splits), 1))
+        blocks.append(block)
+    return np.vstack(blocks)
+
+def _compositions(total, caps):
+    """Every way to split total into len(caps) counts, each at most its cap"""
+    if len(caps) == 1:
+        return [(total,)] if total <= caps[0] else []
+    return [(first,) + rest for first in range(min(total, caps[0]) + 1)
+            for rest in _compositions(total - first, caps[1:])]
+
+def dominated_mask(costs, scores, keep):
+    """Players beaten on both cost and score by at least `keep` others
+
+    A lineup holds at most `keep` players of a position, so one of those
+    dominators is always free to swap in for no more salary.
+    """
+    dominated = np.zeros(len(costs), dtype=bool)
+    if len(costs) <= keep:
+        return dominated
+
+    # Sweep from cheapest to priciest, tracking the best `keep` scores seen so far
+    best = []
+    for j in np.lexsort((-scores, costs)):
+        score = scores[j]
+        if len(best) == keep and best[0] >= score:
+            dominated[j] = True
+        elif len(best) < keep:
+            heapq.heappush(best, score)
+        else:
+            heapq.heapreplace(best, score)
+    return dominated
+
+def assign_slots(players, positions, roster_slots):
+    """Match chosen players to roster slots; returns [(player_idx, slot_idx)] or None"""
+    slots = [slot_idx for slot_idx, (_, _, count) in enumerate(roster_slots) for _ in range(count)]
+    slot_owner = [None] * len(slots)
+
+    def place(player, seen):
+        # Augmenting-path bipartite matching (rosters are tiny)
+        for s, slot_idx in enumerate(slots):
+            if s in seen or positions[player] not in roster_slots[slot_idx][1]:
+                continue
+            seen.add(s)
+            if slot_owner[s] is None or place(slot_owner[s], seen):
+                slot_owner[s] = player
+                return True
+        return False
+
+    # Place the most restricted players first so FLEX is left for the rest
+    order = sorted(players, key=lambda p: sum(positions[p] in eligible for _, eligible, _ in roster_slots))
+    for player in order:
+        if not place(int(player), set()):
+            return None
+    return [(player, slots[s]) for s, player in enumerate(slot_owner) if player is not None]
+
+def _lineup_frame(work_df, selection, roster_slots, salary_cap):
+    """Turn a solver selection into the lineup DataFrame the UI expects"""
+    # Roster order, most expensive first within a slot
+    rows = sorted(selection, key=lambda pick: (pick[1], -work_df['estimated_salary'].iat[pick[0]]))
+
+    lineup_df = work_df.iloc[[player for player, _ in rows]].copy()
+    lineup_df.insert(0, 'roster_slot', [roster_slots[slot][0] for _, slot in rows])
+
+    used_salary = lineup_df['estimated_salary'].sum()
+    lineup_df['salary_used'] = used_salary
+    lineup_df['salary_remaining'] = salary_cap - used_salary
+    return lineup_df.reset_index(drop=True)
+
+def _player_indices(work_df, names):
+    """Positions in work_df of the given player names"""
+    if not names:
+        return np.array([], dtype=int)
+    return np.flatnonzero(work_df['player_name'].isin(list(names)).to_numpy())
+
+# =====================================
+# STACKS
+# =====================================
+
+# Positions that count toward a QB's stack / toward a bring-back from the opponent
+STACK_POSITIONS = ('WR', 'TE')
+BRING_BACK_POSITIONS = ('RB', 'WR', 'TE')
+
+# Stacks needing this many players from the QB's game (stack + bring-back)
+# are solved one QB team at a time; shallower ones branch faster in one model
+DEEP_STACK_PLAYERS = 4
+
+class StackRules:
+    """Correlation rules enforced in the solver
+
+    qb_stack: pass-catchers (STACK_POSITIONS) from the QB's team
+    bring_back: players (BRING_BACK_POSITIONS) from the QB's opponent
+    max_per_team: most players from any one team (None = no cap)
+
+    Rules no lineup can meet (a QB plus its stack over max_per_team) raise
+    ValueError here rather than in a search that can only come up empty.
+    """
+
+    def __init__(self, qb_stack=1, bring_back=0, max_per_team=None):
+        if max_per_team is not None and qb_stack + 1 > max_per_team:
+            raise ValueError(f"max_per_team={max_per_team} can't fit a QB and {qb_stack} pass-catchers from its team")
+        if max_per_team is not None and bring_back > max_per_team:
+            raise ValueError(f"max_per_team={max_per_team} can't fit a bring-back of {bring_back}")
+        self.qb_stack = qb_stack
+        self.bring_back = bring_back
+        self.max_per_team = max_per_team
+
+    def __repr__(self):
+        return f"StackRules(qb_stack={self.qb_stack}, bring_back={self.bring_back}, max_per_team={self.max_per_team})"
+
+DEFAULT_STACKS = StackRules()
+
+def stack_rules(stacking):
+    """StackRules for a stacking argument: True = DEFAULT_STACKS, False/None = no stacking"""
+    if stacking is True:
+        return DEFAULT_STACKS
+    return stacking or None
+
+def _team_columns(work_df):
+    """(team, opponent) string arrays, '' where unknown; None if the pool has no team data"""
+    if 'team' not in work_df.columns:
+        return None
+    teams = work_df['team'].astype(object).fillna('').astype(str).to_numpy()
+    if not (teams != '').any():
+        return None
+    opponents = (work_df['opponent'].astype(object).fillna('').astype(str).to_numpy()
+                 if 'opponent' in work_df.columns else np.full(len(work_df), ''))
+    return teams, opponents
+
+def _stack_groups(positions, teams, opponents):
+    """Per team: (team, opponent, its players, its QBs, stack partners, bring-back partners)"""
+    team_rows = {team: np.flatnonzero(teams == team) for team in pd.unique(teams) if team}
+    for team, members in team_rows.items():
+        catchers = members[np.isin(positions[members], STACK_POSITIONS)]
+        opponent = next((opp for opp in opponents[members] if opp), '')
+        backs = team_rows.get(opponent, members[:0])
+        backs = backs[np.isin(positions[backs], BRING_BACK_POSITIONS)]
+        yield team, opponent, members, members[positions[members] == 'QB'], catchers, backs
+
+def _deep_stack_columns(work_df, rules, stacks):
+    """_team_columns when stacks are deep enough for a TeamStackModel (classic rosters only), else None"""
+    if stacks is None or rules.has_captain or stacks.qb_stack + stacks.bring_back < DEEP_STACK_PLAYERS:
+        return None
+    return _team_columns(work_df)
+
+def stack_rows(work_df, stacks, rules=DEFAULT_RULES):
+    """Model rows (players, upper, lower, coefs) for stack rules over a platform_pool
+
+    A QB stack is sum(catchers) - N * QB >= 0, so it only binds when the QB
+    is picked. A roster with one QB slot shares one row across the team's
+    QBs (only one can be in it), which bounds tighter than a row per QB.
+    Players without a team sit outside every rule, and a pool with no team
+    data gets no rows.
+    """
+    columns = None if stacks is None else _team_columns(work_df)
+    if columns is None:
+        return []
+    teams, opponents = columns
+
+    # Captain rows inherit their player's real position
+    ids = player_ids(work_df, rules)
+    positions = work_df['position'].astype(str).to_numpy()[ids]
+    one_qb = sum(count for _, eligible, count in rules.roster_slots if 'QB' in eligible) == 1
+
+    rows = []
+    for _, _, members, qbs, catchers, backs in _stack_groups(positions, teams, opponents):
+        qb_ids = np.unique(ids[qbs])
+        for qb_set in ([qb_ids] if one_qb and len(qb_ids) else [[qb] for qb in qb_ids]):
+            qb_rows = np.flatnonzero(np.isin(ids, qb_set))
+            for partners, need in ((catchers, stacks.qb_stack), (backs, stacks.bring_back)):
+                if need:
+                    coefs = np.concatenate([np.full(len(qb_rows), -float(need)), np.ones(len(partners))])
+                    rows.append((np.concatenate([qb_rows, partners]), np.inf, 0.0, coefs))
+        if stacks.max_per_team and len(np.unique(ids[members])) > stacks.max_per_team:
+            rows.append((members, stacks.max_per_team, -np.inf, 1.0))
+    return rows
+
+class TeamStackModel:
+    """Stacked classic rosters, solved one QB team at a time
+
+    A classic lineup holds exactly one QB, so the QB's team decides which
+    stack rules apply. With the team fixed they're plain bounds on player
+    sets (its QBs, its pass-catchers, the bring-back pool, both teams'
+    caps), which each team's LineupModel keeps as groups, so its DP bound
+    already respects the stack. Only other teams' caps and added rows are
+    branched on. Teams are searched best bound first - the plain roster
+    with just the team's QBs, then its grouped bound, then its lineup - and
+    the rest skipped once no bound beats the best lineup found.
+
+    Same solve / add_row / reset_rows interface as LineupModel.
+    """
+
+    def __init__(self, positions, salaries, teams, opponents, salary_cap=DEFAULT_SALARY_CAP,
+                 roster_slots=ROSTER_SLOTS, stacks=DEFAULT_STACKS):
+        positions = np.asarray(positions).astype(str)
+        self.n_players = len(positions)
+        self.roster_size = sum(count for _, _, count in roster_slots)
+        self.n_extra_rows = 0
+
+        # Team caps that can bind: groups for the QB's team and its opponent, rows for the rest
+        capped = {}
+        stacked = []
+        for team, opponent, members, qbs, catchers, backs in _stack_groups(positions, teams, opponents):
+            if stacks.max_per_team and len(members) > stacks.max_per_team:
+                capped[team] = members
+            if len(qbs):
+                stacked.append((team, opponent, qbs, catchers, backs))
+
+        # Plain roster model for each team's first, cheap bound
+        self.plain = LineupModel(positions, salaries, salary_cap, roster_slots)
+        all_qbs = frozenset(np.flatnonzero(positions == 'QB').tolist())
+        self.other_qbs = []
+
+        self.models = []
+        for team, opponent, qbs, catchers, backs in stacked:
+            groups = [(qbs, 1, np.inf)]
+            groups += [(players, need, np.inf) for players, need in ((catchers, stacks.qb_stack),
+                                                                     (backs, stacks.bring_back)) if need]
+            groups += [(capped[t], -np.inf, stacks.max_per_team) for t in (team, opponent) if t in capped]
+            rows = [members for t, members in capped.items() if t not in (team, opponent)]
+            self.models.append((LineupModel(positions, salaries, salary_cap, roster_slots, groups), rows))
+            self.other_qbs.append(all_qbs - frozenset(qbs.tolist()))
+
+        # QBs without a team carry no stack
+        loose_qbs = np.flatnonzero((positions == 'QB') & (teams == ''))
+        if len(loose_qbs):
+            self.models.append((LineupModel(positions, salaries, salary_cap, roster_slots, [(loose_qbs, 1, np.inf)]),
+                                list(capped.values())))
+            self.other_qbs.append(all_qbs - frozenset(loose_qbs.tolist()))
+        self.max_per_team = stacks.max_per_team
+        self._bounds = None
+        self.reset_rows()
+
+    @property
+    def use_dp(self):
+        return all(model.use_dp for model, _ in self.models)
+
+    def reset_rows(self):
+        """Drop every row added with add_row"""
+        self.n_extra_rows = 0
+        for model, team_caps in self.models:
+            model.reset_rows()
+            for members in team_caps:
+                model.add_row(members, upper=self.max_per_team)
+
+    def add_row(self, players, upper=np.inf, lower=-np.inf, coefs=1.0):
+        """Append lower <= sum(coefs * x[players]) <= upper to every team's model"""
+        self.n_extra_rows += 1
+        for model, _ in self.models:
+            model.add_row(players, upper, lower, coefs)
+
+    def solve(self, scores, locked=(), excluded=()):
+        """Solve for the max-score lineup over every QB team; [(player_idx, slot_idx)] or None"""
+        scores = np.asarray(scores, dtype=float)
+        locked = frozenset(int(p) for p in locked)
+        excluded = frozenset(int(p) for p in excluded)
+
+        # Bounds only fall as players are excluded and rows added, so the plain
+        # ones hold for the whole run, and a team searched before has its own
+        previous = self._bounds
+        if (previous is None or previous['locked'] != locked or not previous['excluded'] <= excluded
+                or not np.array_equal(previous['scores'], scores)):
+            plain = [self.plain.upper_bound(scores, locked, excluded | other_qbs) for other_qbs in self.other_qbs]
+            self._bounds = {'scores': scores.copy(), 'locked': locked, 'plain': plain, 'searched': set()}
+        self._bounds['excluded'] = excluded
+        searched = self._bounds['searched']
+
+        # (-bound, team, level): level 0 is the plain bound, 1 the team's own
+        queue = [(-self.models[i][0].upper_bound(scores, locked, excluded), i, 1) if i in searched else (-bound, i, 0)
+                 for i, bound in enumerate(self._bounds['plain'])]
+        heapq.heapify(queue)
+        best_value, best = -np.inf, None
+        while queue and -queue[0][0] > best_value:
+            _, i, level = heapq.heappop(queue)
+            model = self.models[i][0]
+            if level == 0:
+                searched.add(i)
+                heapq.heappush(queue, (-model.upper_bound(scores, locked, excluded), i, 1))
+                continue
+            selection = model.solve(scores, locked, excluded)
+            if selection is None:
+                continue
+            value = scores[[player for player, _ in selection]].sum()
+            if value > best_value:
+                best_value, best = value, selection
+        return best
+
+def platform_pool(work_df, rules=DEFAULT_RULES):
+    """The pool as the solver sees it for a platform
+
+    Captain formats get a second copy of every player in the captain slot
+    (rows n..2n-1 mirror rows 0..n-1) with the captain point/salary
+    multipliers applied. player_position keeps every row's real position.
+    """
+    if not rules.has_captain:
+        return work_df
+    base = work_df[work_df['position'].isin(rules.flex_positions)].reset_index(drop=True)
+    base['player_position'] = base['position']
+    captain = base.copy()
+    captain['position'] = rules.captain_slot
+    captain['estimated_salary'] = base['estimated_salary'] * rules.captain_salary
+    for col in ('projected_points', 'optimizer_score'):
+        if col in captain.columns:
+            captain[col] = base[col] * rules.captain_points
+    return pd.concat([base.astype({'position': object}), captain], ignore_index=True)
+
+def player_ids(work_df, rules=DEFAULT_RULES):
+    """Player id of every solver row (both copies of a captain-format player share one)"""
+    n_rows = len(work_df)
+    return np.arange(n_rows) % (n_rows // 2) if rules.has_captain and n_rows else np.arange(n_rows)
+
+def build_model(work_df, salary_cap=DEFAULT_SALARY_CAP, rules=DEFAULT_RULES, must_include=(), stacks=None):
+    """LineupModel for a platform_pool plus the rows to pass as locked
+
+    In captain formats a player can fill the captain slot or a flex slot
+    but not both, and a must-include may land in either, so both are
+    model rows rather than locks. stacks adds its stack_rows; deep stacks
+    in classic formats on the DP path get a TeamStackModel instead.
+    """
+    positions = work_df['position'].to_numpy()
+    salaries = work_df['estimated_salary'].to_numpy(dtype=float)
+    model = LineupModel(positions, salaries, salary_cap, rules.roster_slots)
+    columns = _deep_stack_columns(work_df, rules, stacks)
+    if columns is not None and model.use_dp:
+        model = TeamStackModel(positions, salaries, *columns, salary_cap, rules.roster_slots, stacks)
+        return model, set(_player_indices(work_df, must_include).tolist())
+
+    for players, upper, lower, coefs in stack_rows(work_df, stacks, rules):
+        model.add_row(players, upper, lower, coefs)
+    locked = _player_indices(work_df, must_include)
+    if not rules.has_captain:
+        return model, set(locked.tolist())
+
+    n_players = len(work_df) // 2
+    for player in range(n_players):
+        model.add_row([player, player + n_players], upper=1)
+    for name in must_include:
+        model.add_row(_player_indices(work_df, [name]), lower=1)
+    return model, set()
+
+def solve_exact(work_df, salary_cap=DEFAULT_SALARY_CAP, must_include=(), exclude=(), rules=DEFAULT_RULES,
+                stacks=None):
+    """Provably optimal lineup for work_df['optimizer_score']"""
+    work_df = platform_pool(work_df, rules)
+    model, locked = build_model(work_df, salary_cap, rules, must_include, stacks)
+    selection = model.solve(
+        work_df['optimizer_score'].to_numpy(dtype=float),
+        locked=locked,
+        excluded=_player_indices(work_df, exclude),
+    )
+    if selection is None:
+        return None
+    return _lineup_frame(work_df, selection, rules.roster_slots, salary_cap)
+
+def cheapest_lineup_salary(work_df, must_include=(), exclude=(), rules=DEFAULT_RULES, stacks=None):
+    """Lowest total salary of any valid roster (None if no roster exists)"""
+    work_df = platform_pool(work_df, rules)
+    salaries = work_df['estimated_salary'].to_numpy(dtype=float)
+    model, locked = build_model(work_df, np.inf, rules, must_include, stacks)
+    selection = model.solve(-salaries, locked=locked, excluded=_player_indices(work_df, exclude))
+    if selection is None:
+        return None
+    return salaries[[player for player, _ in selection]].sum()
+
+# =====================================
+# GREEDY SOLVER (LEGACY)
+# =====================================
+
+def solve_greedy(work_df, salary_cap=DEFAULT_SALARY_CAP):
+    """Original position-by-position greedy pass (kept for benchmarks)"""
+    lineup = []
+    used_salary = 0
+    positions_needed = {'QB': 1, 'RB': 2, 'WR': 3, 'TE': 1, 'FLEX': 1}
+
+    # Sort by optimizer score
+    work_df = work_df.sort_values('optimizer_score', ascending=False)
+
+    # Fill core positions first
+    for pos in ['QB', 'RB', 'WR', 'TE']:
+        pos_players = work_df[work_df['position'] == pos]
+        needed = positions_needed.get(pos, 0)
+
+        for i in range(min(needed, len(pos_players))):
+            player = pos_players.iloc[i]
+            if used_salary + player['estimated_salary'] <= salary_cap:
+                lineup.append(player)
+                used_salary += player['estimated_salary']
+
+    # Fill FLEX (RB/WR/TE not already selected)
+    if len(lineup) < 8:
+        flex_eligible = work_df[
+            (work_df['position'].isin(['RB', 'WR', 'TE'])) &
+            (~work_df['player_name'].isin([p['player_name'] for p in lineup]))
+        ]
+
+        if len(flex_eligible) > 0:
+            flex_player = flex_eligible.iloc[0]
+            if used_salary + flex_player['estimated_salary'] <= salary_cap:
+                lineup.append(flex_player)
+                used_salary += flex_player['estimated_salary']
+
+    if not lineup:
+        return None
+
+    lineup_df = pd.DataFrame(lineup)
+    lineup_df['salary_used'] = used_salary
+    lineup_df['salary_remaining'] = salary_cap - used_salary
+    return lineup_df
+
+# =====================================
+# PUBLIC ENTRY POINT
+# =====================================
+
+@timed('optimizer_seconds', call='optimize_lineup')
+def optimize_lineup(df, strategy='tournament', salary_cap=None, stacking=True,
+                    must_include=(), exclude=(), solver='exact', pool=None, platform=None):
+    """Advanced lineup optimization with constraints - safe column handling
+
+    pool: optional output of prepare_player_pool(df, strategy) to skip re-cleaning
+    platform: platforms.py name or PlatformRules (default DraftKings classic);
+    salary_cap defaults to the platform's cap
+    stacking: True (DEFAULT_STACKS), False, or a StackRules; needs a team column
+    """
+
+    # Check if we have the minimum required columns
+    required_cols = ['player_name', 'position', 'projected_points', 'estimated_salary']
+
+    if not all(col in df.columns for col in required_cols):
+        missing_cols = [col for col in required_cols if col not in df.columns]
+        return pd.DataFrame({'Error': [f"Missing required columns: {', '.join(missing_cols)}"]})
+
+    try:
+        rules = get_rules(platform)
+        stacks = stack_rules(stacking)
+        salary_cap = rules.salary_cap if salary_cap is None else salary_cap
+        work_df = prepare_player_pool(df, strategy) if pool is None else pool
+
+        if len(work_df) == 0:
+            return pd.DataFrame({'Error': ['No valid player data after cleaning']})
+
+        if solver == 'greedy':
+            lineup_df = solve_greedy(work_df, salary_cap)
+        else:
+            lineup_df = solve_exact(work_df, salary_cap, must_include, exclude, rules, stacks)
+
+        if lineup_df is not None:
+            return lineup_df
+
+        message = 'Unable to build valid lineup within salary constraints'
+        if solver != 'greedy':
+            cheapest = cheapest_lineup_salary(work_df, must_include, exclude, rules, stacks)
+            if cheapest is None and stacks is not None and cheapest_lineup_salary(work_df, must_include, exclude, rules):
+                message += ' (no roster meets the stacking rules - loosen them or turn stacking off)'
+            elif cheapest is None:
+                message += ' (not enough eligible players to fill the roster)'
+            elif cheapest > salary_cap:
+                message += f' (cheapest valid lineup costs ${cheapest:,.0f})'
+        return pd.DataFrame({'Error': [message]})
+
+    except Exception as e:
+        return pd.DataFrame({'Error': [f'Optimization failed: {str(e)}']})
+
+# =====================================
+# MULTI-LINEUP GENERATION
+# =====================================
+
+MAX_LINEUPS = 150
+
+def solve_many(work_df, n_lineups, salary_cap=DEFAULT_SALARY_CAP, min_unique=1, max_exposure=1.0,
+               must_include=(), exclude=(), workers=1, rules=DEFAULT_RULES, stacks=None):
+    """Best n_lineups distinct lineups, each the optimum given the ones before it
+
+    Every new lineup must differ from each earlier one by at least
+    min_unique players, and no player (other than must-includes) appears in
+    more than max_exposure of the requested lineups. One model is reused
+    for the whole run so each solve picks up the previous search.
+
+    work_df is a platform_pool; selections index its rows.
+    """
+    # Sharding assumes exactly one QB per lineup, which captain formats don't have
+    if workers > 1 and n_lineups > 1 and not rules.has_captain:
+        return solve_many_parallel(work_df, n_lineups, salary_cap, min_unique, max_exposure,
+                                   must_include, exclude, workers, rules, stacks)
+
+    model, locked = build_model(work_df, salary_cap, rules, must_include, stacks)
+    scores = work_df['optimizer_score'].to_numpy(dtype=float)
+    excluded = set(_player_indices(work_df, exclude).tolist())
+    ids = player_ids(work_df, rules)
+    exempt = set(ids[_player_indices(work_df, must_include)].tolist())
+
+    max_shared = model.roster_size - min_unique
+    exposure_limit = _exposure_limit(max_exposure, n_lineups)
+    return _solve_sequence(model, scores, n_lineups, max_shared, exposure_limit, locked, excluded,
+                           player_of=ids, exempt=exempt)
+
+def _exposure_limit(max_exposure, n_lineups):
+    """Most lineups one player may appear in"""
+    return max(1, int(np.floor(max_exposure * n_lineups + 1e-9)))
+
+def _solve_sequence(model, scores, n_lineups, max_shared, exposure_limit, locked, excluded, counts=None,
+                    player_of=None, exempt=None):
+    """Solve lineups one after another, cutting off each one and capped players
+
+    Exposure is counted per player: player_of maps solver rows to players
+    (captain formats hold two rows per player). exempt players (default:
+    the locked ones) are never capped.
+    """
+    player_of = np.arange(model.n_players) if player_of is None else player_of
+    exempt = set(player_of[list(locked)].tolist()) if exempt is None else exempt
+    counts = np.zeros(model.n_players, dtype=int) if counts is None else counts
+
+    def capped_rows(candidates):
+        capped = [p for p in set(player_of[candidates].tolist()) if counts[p] >= exposure_limit and p not in exempt]
+        return set(np.flatnonzero(np.isin(player_of, capped)).tolist()) if capped else set()
+
+    excluded = set(excluded) | capped_rows(np.flatnonzero(counts >= exposure_limit))
+
+    lineups = []
+    for _ in range(n_lineups):
+        selection = model.solve(scores, locked=locked, excluded=excluded)
+        if selection is None:
+            break
+        lineups.append(selection)
+
+        players = [player for player, _ in selection]
+        model.add_row(players, upper=max_shared)
+
+        # Players that hit their exposure cap sit out the rest of the run
+        counts[player_of[players]] += 1
+        excluded |= capped_rows(players)
+
+    return lineups
+
+@timed('optimizer_seconds', call='generate_lineups')
+def generate_lineups(df, strategy='Tournament (GPP)', n_lineups=20, salary_cap=None,
+                     min_unique=1, max_exposure=1.0, must_include=(), exclude=(), workers=1, pool=None,
+                     platform=None, stacking=True):
+    """Build up to MAX_LINEUPS unique lineups; one row per player with a lineup_id"""
+    required_cols = ['player_name', 'position', 'projected_points', 'estimated_salary']
+
+    if not all(col in df.columns for col in required_cols):
+        missing_cols = [col for col in required_cols if col not in df.columns]
+        return pd.DataFrame({'Error': [f"Missing required columns: {', '.join(missing_cols)}"]})
+
+    try:
+        rules = get_rules(platform)
+        salary_cap = rules.salary_cap if salary_cap is None else salary_cap
+        work_df = prepare_player_pool(df, strategy) if pool is None else pool
+
+        if len(work_df) == 0:
+            return pd.DataFrame({'Error': ['No valid player data after cleaning']})
+
+        n_lineups = int(min(max(n_lineups, 1), MAX_LINEUPS))
+        work_df = platform_pool(work_df, rules)
+        lineups = solve_many(work_df, n_lineups, salary_cap, min_unique, max_exposure, must_include, exclude,
+                             workers, rules, stack_rules(stacking))
+
+        if not lineups:
+            return optimize_lineup(df, strategy, salary_cap, stacking, must_include=must_include, exclude=exclude,
+                                   pool=pool, platform=rules)
+
+        frames = []
+        for lineup_id, selection in enumerate(lineups, start=1):
+            lineup_df = _lineup_frame(work_df, selection, rules.roster_slots, salary_cap)
+            lineup_df.insert(0, 'lineup_id', lineup_id)
+            frames.append(lineup_df)
+        return pd.concat(frames, ignore_index=True)
+
+    except Exception as e:
+        return pd.DataFrame({'Error': [f'Optimization failed: {str(e)}']})
+
+def fold_captains(lineups_df, rules=DEFAULT_RULES):
+    """Lineup rows with captain rows counted as their player: real position plus an is_captain flag"""
+    rules = get_rules(rules)
+    if not rules.has_captain:
+        return lineups_df.assign(is_captain=False)
+    is_captain = lineups_df['position'].astype(object) == rules.captain_slot
+    if 'player_position' in lineups_df.columns:
+        return lineups_df.assign(position=lineups_df['player_position'], is_captain=is_captain)
+    return lineups_df.assign(is_captain=is_captain)
+
+def lineup_exposure(lineups_df, rules=DEFAULT_RULES):
+    """Share of lineups each player appears in, most exposed first (captain formats add captain_pct)"""
+    rules = get_rules(rules)
+    n_lineups = lineups_df['lineup_id'].nunique()
+    exposure = fold_captains(lineups_df, rules).groupby(['player_name', 'position'], observed=True).agg(
+        lineups=('lineup_id', 'size'), captain=('is_captain', 'sum')).reset_index()
+    exposure['exposure_pct'] = (exposure['lineups'] / n_lineups * 100).round(1)
+    if rules.has_captain:
+        exposure['captain_pct'] = (exposure['captain'] / n_lineups * 100).round(1)
+    exposure = exposure.drop(columns='captain')
+    return exposure.sort_values(['lineups', 'player_name'], ascending=[False, True]).reset_index(drop=True)
+
+def lineups_to_dk_csv(lineups_df, id_column='player_id', roster_slots=ROSTER_SLOTS):
+    """DraftKings bulk-upload CSV text: one lineup per row, slot names as headers
+
+    DraftKings matches players by "Name (ID)"; without an id column the
+    plain name is written and needs mapping before upload. Pass another
+    platform's roster_slots for its slot headers.
+    """
+    header = [slot for slot, _, count in roster_slots for _ in range(count)]
+    slot_order = {slot: i for i, (slot, _, _) in enumerate(roster_slots)}
+
+    rows = []
+    for _, lineup_df in lineups_df.groupby('lineup_id', sort=True):
+        lineup_df = lineup_df.sort_values('roster_slot', key=lambda s: s.map(slot_order), kind='stable')
+        if id_column in lineup_df.columns:
+            cells = [f"{name} ({pid})" for name, pid in zip(lineup_df['player_name'], lineup_df[id_column])]
+        else:
+            cells = lineup_df['player_name'].tolist()
+        rows.append(cells)
+
+    return pd.DataFrame(rows, columns=header).to_csv(index=False)
+
+# =====================================
+# PARALLEL GENERATION
+# =====================================
+
+# Lineups are sharded by quarterback: every lineup has exactly one, so the
+# shards split the search space with no overlap
+SHARD_POSITION = 'QB'
+
+# Each shard builds this many times its even share, leaving slack for reconciliation
+SHARD_OVERSAMPLE = 1.5
+
+# Player pool for this worker process, set once by _init_worker
+_WORKER_POOL = {}
+
+def _init_worker(position_codes, position_names, salaries, scores, salary_cap, roster_slots=ROSTER_SLOTS,
+                 base_rows=(), team_columns=None, stacks=None):
+    """Build the worker's model once from the shared arrays (a TeamStackModel when given team_columns)"""
+    positions = position_names[position_codes]
+    _WORKER_POOL['scores'] = scores
+    if team_columns is None:
+        _WORKER_POOL['model'] = LineupModel(positions, salaries, salary_cap, roster_slots)
+        _WORKER_POOL['rows'] = base_rows
+    else:
+        _WORKER_POOL['model'] = TeamStackModel(positions, salaries, *team_columns, salary_cap, roster_slots, stacks)
+        _WORKER_POOL['rows'] = ()
+
+def _solve_shard(task):
+    """Worker entry point: solve one shard, returning player lists"""
+    n_lineups, max_shared, exposure_limit, locked, excluded = task
+    model = _WORKER_POOL['model']
+    model.reset_rows()
+    for players, upper, lower, coefs in _WORKER_POOL['rows']:
+        model.add_row(players, upper, lower, coefs)
+    lineups = _solve_sequence(model, _WORKER_POOL['scores'], n_lineups, max_shared, exposure_limit, locked, excluded)
+    return [[player for player, _ in selection] for selection in lineups]
+
+def _shard_exclusions(positions, scores, locked, excluded, n_shards):
+    """Per shard, the shard players every other shard must leave out"""
+    if any(positions[p] == SHARD_POSITION for p in locked):
+        return None
+
+    candidates = [p for p in np.flatnonzero(positions == SHARD_POSITION) if p not in excluded]
+    if len(candidates) < 2:
+        return None
+
+    # Deal players out by score so every shard gets a fair share of the good ones
+    candidates.sort(key=lambda p: -scores[p])
+    n_shards = min(n_shards, len(candidates))
+    groups = [set(candidates[i::n_shards]) for i in range(n_shards)]
+    everyone = set(candidates)
+    return [everyone - group for group in groups]
+
+def solve_many_parallel(work_df, n_lineups, salary_cap=DEFAULT_SALARY_CAP, min_unique=1, max_exposure=1.0,
+                        must_include=(), exclude=(), workers=None, rules=DEFAULT_RULES, stacks=None):
+    """solve_many spread over a process pool, one shard of the slate per task
+
+    Workers get the pool once through the initializer as small NumPy
+    arrays. Their lineups are merged best-first, dropping any that break
+    uniqueness or exposure against the ones already kept, and a serial
+    pass tops the set back up if the merge came up short.
+    """
+    workers = workers or os.cpu_count() or 1
+    positions = work_df['position'].to_numpy()
+    salaries = work_df['estimated_salary'].to_numpy(dtype=float)
+    scores = work_df['optimizer_score'].to_numpy(dtype=float)
+    locked = set(_player_indices(work_df, must_include).tolist())
+    excluded = set(_player_indices(work_df, exclude).tolist())
+
+    max_shared = rules.roster_size - min_unique
+    exposure_limit = _exposure_limit(max_exposure, n_lineups)
+
+    shards = _shard_exclusions(positions, scores, locked, excluded, workers)
+    if shards is None:
+        return solve_many(work_df, n_lineups, salary_cap, min_unique, max_exposure, must_include, exclude,
+                          rules=rules, stacks=stacks)
+
+    per_shard = min(n_lineups, int(np.ceil(n_lineups * SHARD_OVERSAMPLE / len(shards))))
+    tasks = [(per_shard, max_shared, exposure_limit, locked, excluded | shard) for shard in shards]
+
+    # The serial top-up model, built first so the workers know which kind to build
+    model, _ = build_model(work_df, salary_cap, rules, (), stacks)
+    team_columns = _deep_stack_columns(work_df, rules, stacks) if isinstance(model, TeamStackModel) else None
+    base_rows = stack_rows(work_df, stacks, rules) if team_columns is None else []
+    position_names, position_codes = np.unique(positions.astype(str), return_inverse=True)
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(tasks)),
+        initializer=_init_worker,
+        initargs=(position_codes.astype(np.int8), position_names, salaries, scores, salary_cap, rules.roster_slots,
+                  base_rows, team_columns, stacks),
+    ) as pool:
+        candidates = [players for shard in pool.map(_solve_shard, tasks) for players in shard]
+
+    # Reconcile: keep the best lineups that still respect uniqueness and exposure
+    candidates.sort(key=lambda players: -scores[players].sum())
+    kept = []
+    kept_matrix = np.zeros((n_lineups, len(work_df)), dtype=np.int8)
+    counts = np.zeros(len(work_df), dtype=int)
+    for players in candidates:
+        if len(kept) == n_lineups:
+            break
+        if any(counts[p] >= exposure_limit and p not in locked for p in players):
+            continue
+        if kept and kept_matrix[:len(kept), players].sum(axis=1).max() > max_shared:
+            continue
+        kept_matrix[len(kept), players] = 1
+        kept.append(players)
+        counts[players] += 1
+
+    lineups = [assign_slots(players, positions, rules.roster_slots) for players in kept]
+
+    # Top up serially against everything already kept
+    if len(kept) < n_lineups:
+        for players in kept:
+            model.add_row(players, upper=max_shared)
+        lineups += _solve_sequence(model, scores, n_lineups - len(kept), max_shared, exposure_limit,
+                                   locked, excluded, counts)
+    return lineups
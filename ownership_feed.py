@@ -0,0 +1,257 @@
+# OWNERSHIP FEED
+# Live ownership deltas applied on top of the loaded slate, so Sunday
+# morning swings show up in seconds instead of waiting on the CSV push.
+#
+# Deltas arrive one per line, as CSV (`player_name,ownership_pct[,platform]`,
+# header optional) or JSON (`{"player_name": ..., "ownership_pct": ...}`),
+# from any of:
+#   - files dropped into OWNERSHIP_DROP_DIR (write elsewhere, then move in)
+#   - a TCP socket when OWNERSHIP_FEED_PORT is set
+#   - stdin via this script, which forwards to the socket or drop dir:
+#       python ownership_feed.py < deltas.csv
+#       python ownership_feed.py --port 8765 < deltas.csv
+#
+# Only players named in a delta are rescored. Deltas are dropped when a new
+# data file version loads (the file is the newer source of truth). Drop files
+# that can't be decoded are renamed to *.bad and counted, and the watcher
+# keeps going.
+
+import argparse
+import csv
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+import uuid
+
+import numpy as np
+
+from metrics import REGISTRY
+from platforms import platform_name
+
+DROP_DIR = os.environ.get('OWNERSHIP_DROP_DIR', 'ownership_drop')
+FEED_PORT = os.environ.get('OWNERSHIP_FEED_PORT')
+FEED_HOST = os.environ.get('OWNERSHIP_FEED_HOST', '127.0.0.1')
+POLL_SECONDS = 1.0
+DROP_SUFFIXES = ('.csv', '.jsonl', '.txt')
+
+# =====================================
+# PARSING
+# =====================================
+
+def parse_delta(line):
+    """(player_name, ownership_pct, platform) from one feed line, or None if it isn't a valid delta"""
+    line = line.strip()
+    if not line or line.startswith('#'):
+        return None
+    try:
+        if line.startswith('{'):
+            record = json.loads(line)
+            name, ownership, platform = record['player_name'], record['ownership_pct'], record.get('platform')
+        else:
+            fields = next(csv.reader([line]))
+            name, ownership = fields[0], fields[1]
+            platform = fields[2] if len(fields) > 2 and fields[2].strip() else None
+        ownership = float(ownership)
+    except (ValueError, KeyError, IndexError, TypeError, csv.Error):
+        return None  # header rows and junk lines land here
+    if not str(name).strip() or not 0 <= ownership <= 100:
+        return None
+    # Same spelling the loader gives the data file's platform column ('draftkings' -> 'DraftKings')
+    if isinstance(platform, str):
+        platform = platform_name(platform.strip()) if platform.strip() else None
+    return str(name).strip(), ownership, platform
+
+# =====================================
+# FEED
+# =====================================
+
+class OwnershipFeed:
+    """Thread-safe log of ownership deltas; every batch bumps `sequence`"""
+
+    def __init__(self):
+        self.sequence = 0
+        self.updated_at = None
+        self.rejected = 0
+        self.bad_files = 0
+        self._log = []  # (sequence, name, ownership, platform)
+        self._lock = threading.Lock()
+        self._threads = []
+
+    def push(self, lines):
+        """Apply a batch of feed lines; returns how many were valid deltas"""
+        deltas = [parse_delta(line) for line in lines]
+        valid = [d for d in deltas if d is not None]
+        with self._lock:
+            self.rejected += sum(1 for line, d in zip(lines, deltas) if d is None and line.strip())
+            if valid:
+                self.sequence += 1
+                self.updated_at = time.time()
+                self._log.extend((self.sequence,) + d for d in valid)
+        return len(valid)
+
+    def since(self, sequence):
+        """Deltas newer than sequence, oldest first"""
+        with self._lock:
+            return [entry[1:] for entry in self._log if entry[0] > sequence], self.sequence
+
+    def clear(self):
+        with self._lock:
+            self._log = []
+
+    def __len__(self):
+        return len(self._log)
+
+    # Sources ---------------------------------------------------------
+
+    def _start(self, target, *args):
+        thread = threading.Thread(target=target, args=args, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def watch_drop_dir(self, path=DROP_DIR, poll=POLL_SECONDS):
+        """Pick up files dropped into path (renamed to *.done once applied, *.bad if unreadable)"""
+        self._start(self._watch, path, poll)
+
+    def _watch(self, path, poll):
+        while True:
+            try:
+                names = sorted(os.listdir(path)) if os.path.isdir(path) else []
+            except OSError:
+                names = []
+            for name in names:
+                if name.startswith('.') or not name.endswith(DROP_SUFFIXES):
+                    continue
+                self._read_drop_file(os.path.join(path, name))
+            time.sleep(poll)
+
+    def _read_drop_file(self, file_path):
+        try:
+            with open(file_path, encoding='utf-8') as f:
+                self.push(f.readlines())
+            os.replace(file_path, file_path + '.done')
+        except OSError:
+            pass  # still being written or already picked up; try next poll
+        except (UnicodeDecodeError, ValueError, csv.Error):
+            # Not a text feed file: set it aside so it isn't retried every poll
+            self.bad_files += 1
+            REGISTRY.inc('ownership_bad_files_total')
+            try:
+                os.replace(file_path, file_path + '.bad')
+            except OSError:
+                pass
+
+    def serve(self, port, host=FEED_HOST):
+        """Accept newline-delimited deltas over TCP"""
+        feed = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                batch = []
+                for raw in self.rfile:
+                    batch.append(raw.decode('utf-8', 'replace'))
+                    if len(batch) >= 100:
+                        feed.push(batch)
+                        batch = []
+                if batch:
+                    feed.push(batch)
+
+        server = socketserver.ThreadingTCPServer((host, int(port)), Handler)
+        server.daemon_threads = True
+        self._start(server.serve_forever)
+        return server
+
+def start_feed(drop_dir=DROP_DIR, port=FEED_PORT):
+    """Feed with the drop-dir watcher (and socket listener if a port is set) running"""
+    feed = OwnershipFeed()
+    feed.watch_drop_dir(drop_dir)
+    if port:
+        feed.serve(port)
+    return feed
+
+# =====================================
+# LIVE SLATE
+# =====================================
+
+class LiveSlate:
+    """The loaded DerivedData with feed deltas applied, rescoring only touched players"""
+
+    def __init__(self, feed):
+        self.feed = feed
+        self._base = None
+        self._live = None
+        self.sequence = 0  # last feed sequence applied
+        self.last_update = {}
+        self._lock = threading.Lock()
+
+    def current(self, derived):
+        """derived with every pending delta applied (derived itself when there are none)"""
+        with self._lock:
+            if derived is not self._base:
+                # New data version: its ownership supersedes older deltas
+                if self._base is not None:
+                    self.feed.clear()
+                self._base, self._live, self.sequence = derived, derived, 0
+
+            deltas, sequence = self.feed.since(self.sequence)
+            if deltas:
+                self._live = self._apply(self._live, deltas)
+            self.sequence = sequence
+            return self._live
+
+    def _apply(self, derived, deltas):
+        # Last delta per row wins
+        latest = {}
+        unmatched = 0
+        for name, ownership, platform in deltas:
+            rows = derived.players.rows(name)
+            if platform is not None:
+                rows = [row for row in rows if derived.players.platform(row) == platform]
+            if not rows:
+                unmatched += 1
+            for row in rows:
+                latest[row] = ownership
+
+        self.last_update = {'deltas': len(deltas), 'players_rescored': len(latest), 'unmatched': unmatched,
+                            'at': time.time()}
+        if not latest:
+            return derived
+        rows = np.fromiter(latest.keys(), dtype=np.int64, count=len(latest))
+        ownership = np.fromiter(latest.values(), dtype=np.float64, count=len(latest))
+        return derived.with_ownership(rows, ownership)
+
+# =====================================
+# STDIN CLIENT
+# =====================================
+
+def send_lines(lines, port=None, host=FEED_HOST, drop_dir=DROP_DIR):
+    """Forward delta lines to a running app: over its socket, or as a drop file"""
+    lines = [line if line.endswith('\n') else line + '\n' for line in lines]
+    if port:
+        with socket.create_connection((host, int(port))) as conn:
+            conn.sendall(''.join(lines).encode('utf-8'))
+        return f"{host}:{port}"
+
+    # Write beside the drop dir, then move in, so the watcher never reads half a file
+    os.makedirs(drop_dir, exist_ok=True)
+    tmp_path = os.path.join(drop_dir, f".{uuid.uuid4().hex}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.writelines(lines)
+    final_path = os.path.join(drop_dir, f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}.csv")
+    os.replace(tmp_path, final_path)
+    return final_path
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Send ownership deltas from stdin to the running app")
+    parser.add_argument('--port', default=FEED_PORT, help="app's OWNERSHIP_FEED_PORT (default: use the drop dir)")
+    parser.add_argument('--host', default=FEED_HOST)
+    parser.add_argument('--drop-dir', default=DROP_DIR)
+    args = parser.parse_args()
+
+    feed_lines = sys.stdin.readlines()
+    valid = sum(parse_delta(line) is not None for line in feed_lines)
+    target = send_lines(feed_lines, args.port, args.host, args.drop_dir)
+    print(f"✅ Sent {valid:,} ownership updates to {target}")
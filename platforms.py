@@ -0,0 +1,119 @@
+# PLATFORM RULES
+# Salary caps, roster slots and captain rules for each DFS platform and
+# contest format. The loader, scorer and optimizer all read from here.
+#
+# Team defenses aren't in the data feed, so DST/DEF slots are left out of
+# every roster (same as the original DraftKings builder).
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_PLATFORM = 'DraftKings'
+
+class PlatformRules:
+    """One platform/contest format: cap, roster slots, salary scale and captain multipliers"""
+
+    def __init__(self, name, data_platform, salary_cap, roster_slots, salary_unit=1000, cap_step=100,
+                 captain_slot=None, captain_points=1.0, captain_salary=1.0):
+        self.name = name
+        self.data_platform = data_platform  # value of the `platform` column this format plays from
+        self.salary_cap = salary_cap
+        self.roster_slots = roster_slots
+        self.salary_unit = salary_unit      # points_per_dollar is points per this many salary dollars
+        self.cap_step = cap_step
+        self.captain_slot = captain_slot
+        self.captain_points = captain_points
+        self.captain_salary = captain_salary
+
+    @property
+    def roster_size(self):
+        return sum(count for _, _, count in self.roster_slots)
+
+    @property
+    def has_captain(self):
+        return self.captain_slot is not None
+
+    @property
+    def flex_positions(self):
+        """Positions a captain copy can be made from (every non-captain slot's eligibility)"""
+        return sorted({pos for slot, eligible, _ in self.roster_slots if slot != self.captain_slot for pos in eligible})
+
+    @property
+    def cap_range(self):
+        """(min, max, default) for the salary cap slider"""
+        low = int(self.salary_cap * 0.7 // self.cap_step * self.cap_step)
+        return low, int(self.salary_cap), int(self.salary_cap)
+
+    def __repr__(self):
+        return f"PlatformRules({self.name!r})"
+
+# (slot, eligible positions, count)
+CLASSIC_SLOTS = [
+    ('QB', ('QB',), 1),
+    ('RB', ('RB',), 2),
+    ('WR', ('WR',), 3),
+    ('TE', ('TE',), 1),
+    ('FLEX', ('RB', 'WR', 'TE'), 1),
+]
+
+SINGLE_GAME_POSITIONS = ('QB', 'RB', 'WR', 'TE')
+
+PLATFORMS = {
+    'DraftKings': PlatformRules('DraftKings', 'DraftKings', 50000, CLASSIC_SLOTS),
+    # Captain: 1.5x points at 1.5x salary
+    'DraftKings Showdown': PlatformRules(
+        'DraftKings Showdown', 'DraftKings', 50000,
+        [('CPT', ('CPT',), 1), ('FLEX', SINGLE_GAME_POSITIONS, 5)],
+        captain_slot='CPT', captain_points=1.5, captain_salary=1.5,
+    ),
+    'FanDuel': PlatformRules('FanDuel', 'FanDuel', 60000, CLASSIC_SLOTS),
+    # MVP: 1.5x points, no salary bump
+    'FanDuel Single Game': PlatformRules(
+        'FanDuel Single Game', 'FanDuel', 60000,
+        [('MVP', ('MVP',), 1), ('FLEX', SINGLE_GAME_POSITIONS, 4)],
+        captain_slot='MVP', captain_points=1.5,
+    ),
+    'Yahoo': PlatformRules('Yahoo', 'Yahoo', 200, CLASSIC_SLOTS, salary_unit=1, cap_step=1),
+}
+
+# Spellings seen in feeds -> the platform column value we store
+PLATFORM_ALIASES = {
+    'dk': 'DraftKings', 'draftkings': 'DraftKings', 'draft kings': 'DraftKings',
+    'fd': 'FanDuel', 'fanduel': 'FanDuel', 'fan duel': 'FanDuel',
+    'yahoo': 'Yahoo', 'yahoo dfs': 'Yahoo', 'y!': 'Yahoo',
+}
+
+def get_rules(platform=None):
+    """PlatformRules for a registry name (or pass-through for a PlatformRules)"""
+    if isinstance(platform, PlatformRules):
+        return platform
+    name = DEFAULT_PLATFORM if platform is None else PLATFORM_ALIASES.get(str(platform).strip().lower(), platform)
+    if name not in PLATFORMS:
+        raise ValueError(f"Unknown platform '{platform}' (known: {', '.join(PLATFORMS)})")
+    return PLATFORMS[name]
+
+def platform_name(value):
+    """Canonical platform column value for one spelling (unknown spellings pass through)"""
+    return PLATFORM_ALIASES.get(str(value).strip().lower(), value)
+
+def normalize_platforms(values):
+    """Canonical platform names for a column (unknown spellings pass through, blanks become the default)
+
+    A categorical column stays categorical: only its categories are looked up.
+    """
+    values = pd.Series(values)
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # Two spellings can share a name, so recode rather than rename; code -1 (missing) gets the default
+        names = np.append(normalize_platforms(values.cat.categories).to_numpy(), DEFAULT_PLATFORM)
+        recode, categories = pd.factorize(names)
+        codes = recode[values.cat.codes.to_numpy()]
+        return pd.Series(pd.Categorical.from_codes(codes, categories=categories), index=values.index, name=values.name)
+    values = values.astype(object)
+    # Few distinct values, so look each up once
+    lookup = {value: platform_name(value) for value in pd.unique(values.dropna())}
+    return values.map(lookup).fillna(DEFAULT_PLATFORM)
+
+def salary_units(platforms):
+    """Per-row salary unit (dollars per 'K') for a platform column"""
+    units = {rules.data_platform: rules.salary_unit for rules in PLATFORMS.values() if not rules.has_captain}
+    return pd.Series(platforms).map(units).fillna(PLATFORMS[DEFAULT_PLATFORM].salary_unit).to_numpy(dtype=np.float64)
@@ -0,0 +1,181 @@
+# PLAYER INDEX
+# O(1) player lookups and typeahead search, built once per data version.
+# Free-text name matching (for the assistant) uses a word index plus a
+# one-deletion index for typos, built the first time it's needed.
+
+import re
+import unicodedata
+from bisect import bisect_left
+
+import numpy as np
+import pandas as pd
+
+# Most names a search returns (keeps selectboxes small on big slates)
+SEARCH_LIMIT = 200
+
+# Name words shorter than this must be spelled exactly in free text
+FUZZY_MIN_LENGTH = 5
+
+# Longest full name (in words) looked for in free text
+MAX_NAME_WORDS = 4
+
+_WORD = re.compile(r'[a-z0-9]+')
+
+_PUNCTUATION = re.compile(r"[.'`’-]")
+_SUFFIX = re.compile(r'\s(jr|sr|ii|iii|iv|v)$')
+
+def normalize_name(name):
+    """Lowercase, accent-free, punctuation-free name without a Jr./Sr./III suffix"""
+    name = unicodedata.normalize('NFKD', str(name)).encode('ascii', 'ignore').decode('ascii')
+    name = ' '.join(_PUNCTUATION.sub('', name.lower()).split())
+    return _SUFFIX.sub('', name)
+
+class PlayerIndex:
+    """Row lookup by (name, platform, week) plus prefix search over names"""
+
+    def __init__(self, df):
+        n_rows = len(df)
+        names = df['player_name'].astype(str).to_numpy() if 'player_name' in df.columns else np.array([], dtype=object)
+
+        # Normalize each distinct spelling once
+        codes, spellings = pd.factorize(names)
+        spelling_keys = [normalize_name(name) for name in spellings]
+        self._keys_by_spelling = dict(zip(spellings, spelling_keys))
+        keys = np.array(spelling_keys, dtype=object)[codes]
+
+        platforms = df['platform'].astype(object).to_numpy() if 'platform' in df.columns else np.full(n_rows, None)
+        weeks = df['week'].astype(object).to_numpy() if 'week' in df.columns else np.full(n_rows, None)
+
+        self._platforms = platforms
+        self._weeks = weeks
+        self._rows = {}
+        self._exact = {}
+        self._display = {}
+        for row, (key, name, platform, week) in enumerate(zip(keys, names, platforms, weeks)):
+            self._rows.setdefault(key, []).append(row)
+            self._exact.setdefault((key, platform, week), row)
+            self._display.setdefault(key, name)
+
+        # Display names in file order, one per player
+        self.names = list(self._display.values())
+
+        # Sorted (search key, player key) pairs: the full name plus every later word
+        entries = []
+        for key in self._display:
+            words = key.split(' ')
+            entries.extend((' '.join(words[i:]), key) for i in range(len(words)))
+        entries.sort()
+        self._search_keys = [entry[0] for entry in entries]
+        self._search_players = [entry[1] for entry in entries]
+
+        self._words = None    # name word -> player keys
+        self._deletes = None  # word with one letter dropped -> name words
+
+    def __len__(self):
+        return len(self._display)
+
+    def __contains__(self, name):
+        return self._key(name) in self._rows
+
+    def _key(self, name):
+        # Exact spellings from the file skip normalization
+        key = self._keys_by_spelling.get(name)
+        return key if key is not None else normalize_name(name)
+
+    def find(self, name, platform=None, week=None):
+        """Row position for a player (first match when platform/week aren't given), or None"""
+        key = self._key(name)
+        if platform is not None or week is not None:
+            if (key, platform, week) in self._exact:
+                return self._exact[(key, platform, week)]
+            rows = [row for row in self._rows.get(key, []) if self._matches(row, platform, week)]
+            return rows[0] if rows else None
+        rows = self._rows.get(key)
+        return rows[0] if rows else None
+
+    def rows(self, name):
+        """Every row position for a player (all platforms and weeks)"""
+        return list(self._rows.get(self._key(name), []))
+
+    def platform(self, row):
+        return self._platforms[row]
+
+    def _matches(self, row, platform, week):
+        return ((platform is None or self._platforms[row] == platform)
+                and (week is None or self._weeks[row] == week))
+
+    def search(self, query, limit=SEARCH_LIMIT):
+        """Display names whose full name or any later word starts with query"""
+        prefix = normalize_name(query) if query else ''
+        if not prefix:
+            return self.names[:limit]
+
+        found = {}
+        i = bisect_left(self._search_keys, prefix)
+        while i < len(self._search_keys) and len(found) < limit:
+            if not self._search_keys[i].startswith(prefix):
+                break
+            key = self._search_players[i]
+            found.setdefault(key, self._display[key])
+            i += 1
+        return list(found.values())
+
+    # Free text -------------------------------------------------------
+
+    def _word_index(self):
+        if self._words is None:
+            words = {}
+            for key in self._display:
+                for word in dict.fromkeys(key.split(' ')):
+                    words.setdefault(word, []).append(key)
+            deletes = {}
+            for word in words:
+                if len(word) >= FUZZY_MIN_LENGTH:
+                    for i in range(len(word)):
+                        deletes.setdefault(word[:i] + word[i + 1:], []).append(word)
+            # Readers check _words, so it goes last
+            self._deletes = deletes
+            self._words = words
+        return self._words, self._deletes
+
+    def word_matches(self, word):
+        """Player keys with a name word equal to word, else within one typo of it"""
+        words, deletes = self._word_index()
+        if word in words:
+            return words[word]
+        if len(word) < FUZZY_MIN_LENGTH:
+            return []
+
+        close = set(deletes.get(word, ()))  # word is missing a letter
+        for i in range(len(word)):
+            shorter = word[:i] + word[i + 1:]
+            if shorter in words:
+                close.add(shorter)  # word has an extra letter
+            close.update(deletes.get(shorter, ()))  # one letter differs
+        return list(dict.fromkeys(key for match in sorted(close) for key in words[match]))
+
+    def mentions(self, text, skip=frozenset()):
+        """Players named in free text: (matched words, display names) per mention, in order
+
+        Full names (up to MAX_NAME_WORDS words) match first; otherwise one
+        word matches every player with that first or last name. Words in
+        skip never match on their own.
+        """
+        tokens = _WORD.findall(normalize_name(text))
+        found = []
+        i = 0
+        while i < len(tokens):
+            for length in range(min(MAX_NAME_WORDS, len(tokens) - i), 1, -1):
+                key = ' '.join(tokens[i:i + length])
+                if key in self._display:
+                    found.append((key, [self._display[key]]))
+                    i += length
+                    break
+            else:
+                token = tokens[i]
+                if token not in skip and not token.isdigit():
+                    keys = self.word_matches(token)
+                    if keys:
+                        found.append((token, [self._display[key] for key in keys]))
+                i += 1
+        return found
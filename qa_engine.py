@@ -0,0 +1,334 @@
+# ASSISTANT QA ENGINE
+# Answers slate questions for the Fantasy AI Assistant from the current
+# DerivedData: "Lamar vs Allen", "best RB under 10% owned", "cheapest WRs on
+# KC over 15 points", "top 5 value plays".
+#
+# A question is parsed into the players it names, positions, teams (in
+# capitals, e.g. KC), play types, numeric limits, a sort and a count. Names
+# resolve through the PlayerIndex word index (exact word, else one typo), so
+# finding them is a few dict lookups at any slate size; lists filter the
+# pre-sorted row views. Strategy questions with nothing to look up return
+# None and the assistant's written explanations answer them.
+
+import re
+
+import numpy as np
+
+from tables import PLAY_TYPE_LABELS, PLAY_TYPE_NOTES
+
+DEFAULT_ANSWER_ROWS = 5
+MAX_ANSWER_ROWS = 25
+MAX_COMPARE = 4
+
+# "elite"/"top-ranked" means this expert rank or better
+ELITE_RANK = 5
+
+# Question words that never match a player on their own (full names still do)
+STOPWORDS = frozenset('''
+    a about above all also an and any are as at back backs be best better between by can cash ceiling cheap cheaper
+    cheapest chalk compare contrarian could difference do does dollar dollars elite end ends expensive explain fade
+    flex floor for from game games get give good gpp great has have he high higher highest his how i if in is it its
+    just least less leverage like lineup lineups list low lower lowest max me min more most much my neutral not of on
+    one only or over own owned ownership per percent pick picks pivot play played player players plays points pts
+    projected projection projections qb qbs quarterback quarterbacks radar rank ranked ranking rankings rb rbs
+    receiver receivers roster running salary should show sit sleeper sleepers slate smash some start stack stacking
+    sunday te team teams tell tes than that the their them then these they this tight to today tonight top
+    tournament tournaments under upside value values versus vs was we week what whats when where which who whom why
+    wide will with worth would wr wrs you your
+'''.split())
+
+POSITION_PATTERNS = [
+    (re.compile(r'\b(qbs?|quarterbacks?)\b'), 'QB'),
+    (re.compile(r'\b(rbs?|running ?backs?)\b'), 'RB'),
+    (re.compile(r'\b(wrs?|wide receivers?|receivers?)\b'), 'WR'),
+    (re.compile(r'\b(tes|te|tight ?ends?)\b'), 'TE'),
+]
+
+PLAY_TYPE_PATTERNS = [
+    (re.compile(r'\bsmash'), 'SMASH_PLAY'),
+    (re.compile(r'\bleverage'), 'LEVERAGE_PLAY'),
+    (re.compile(r'\bchalk'), 'CHALK_PLAY'),
+    (re.compile(r'\bneutral'), 'NEUTRAL'),
+]
+CONTRARIAN_PLAY_TYPES = ['SMASH_PLAY', 'LEVERAGE_PLAY']
+
+# (pattern, column, ascending, label), first match wins; otherwise best contrarian score
+SORT_PATTERNS = [
+    (re.compile(r'\b(cheapest|cheap|lowest salar\w*|least expensive)\b'), 'estimated_salary', True, 'cheapest'),
+    (re.compile(r'\b(most expensive|highest salar\w*|priciest)\b'), 'estimated_salary', False, 'most expensive'),
+    (re.compile(r'\b(lowest|least|low)[ -]own\w*|\bunder the radar\b|\bsleepers?\b'), 'ownership_pct', True,
+     'lowest-owned'),
+    (re.compile(r'\b(highest|most|high)[ -]own\w*|\bpopular\b'), 'ownership_pct', False, 'most-owned'),
+    (re.compile(r'\bvalues?\b|\bper (dollar|\$|1k)\b|\bbang for\b'), 'value', False, 'best-value'),
+    (re.compile(r'\bproject\w*|\bmost points\b|\bhighest scoring\b|\bceiling\b|\bupside\b'), 'projected_points', False,
+     'highest-projected'),
+]
+DEFAULT_SORT = ('contrarian_score', False, 'best')
+
+# "under 10% owned", "over 15 points", "below $6,000", "at most 5k"
+_LIMIT = re.compile(
+    r'(under|below|less than|fewer than|at most|no more than|<=?|over|above|more than|at least|no less than|>=?)'
+    r'\s*(\$)?\s*(\d+(?:[.,]\d+)*)\s*(%|percent\b|k\b|pts\b|points?\b)?(?:\s+(\w+))?'
+)
+_AT_MOST = ('under', 'below', 'less than', 'fewer than', 'at most', 'no more than', '<', '<=')
+LIMIT_WORDS = {
+    'owned': 'ownership_pct', 'ownership': 'ownership_pct', 'own': 'ownership_pct',
+    'points': 'projected_points', 'pts': 'projected_points', 'projected': 'projected_points',
+    'projection': 'projected_points', 'salary': 'estimated_salary', 'value': 'value',
+}
+
+_TOP_N = re.compile(r'\btop\s+(\d+)\b|\b(\d+)\s+(?:best|top|cheapest|highest|lowest|most)\b')
+_ELITE = re.compile(r'\belite\b|\btop[ -]ranked\b|\bhighly ranked\b')
+_LIST_WORDS = re.compile(r'\b(best|top|who|which|show|list|give|find|any)\b')
+# Explanations the assistant writes out - answered from text unless a player is named
+_TOPIC = re.compile(r'\b(stack\w*|correlat\w*|weather|wind|rain|snow|outdoor|strateg\w*|difference|explain\w*)\b'
+                    r'|\bwhat (is|are) (a |an )?(smash|leverage|chalk|play type)|\bhow (do|does|should|can)\b')
+_TEAM_TOKEN = re.compile(r'\b[A-Z]{2,3}\b')
+# Words for question_signature: keeps $, %, comparisons and 6,000 / 10.5 / T.J / what's / Smith-Njigba
+_SIGNATURE_WORD = re.compile(r"[\w$%<>=]+(?:[.,'’-][\w$%]+)*")
+
+# =====================================
+# PARSING
+# =====================================
+
+class ParsedQuestion:
+    """What a question asks for, in slate terms"""
+
+    def __init__(self):
+        self.mentions = []    # (matched words, candidate display names)
+        self.positions = []
+        self.teams = []
+        self.play_types = None
+        self.limits = []      # (column, at_most, value)
+        self.elite = False
+        self.sort = DEFAULT_SORT
+        self.sorted_by_request = False
+        self.top_n = None
+        self.topic = False
+        self.list_words = False
+
+    @property
+    def wants_list(self):
+        return bool(self.positions or self.teams or self.play_types or self.limits or self.elite
+                    or self.top_n or self.sorted_by_request or self.list_words)
+
+def question_signature(question, teams=()):
+    """Normalized question for answer caching: case, spacing and punctuation dropped
+
+    Team abbreviations keep their capitals since the parser only reads teams
+    written that way ("on KC", not "kc").
+    """
+    return ' '.join(word if word in teams else word.lower() for word in _SIGNATURE_WORD.findall(question))
+
+def _limit_column(unit, dollar, next_word, value, text):
+    if unit in ('%', 'percent'):
+        return 'ownership_pct'
+    if dollar or unit == 'k':
+        return 'estimated_salary'
+    if unit in ('pts', 'point', 'points'):
+        return 'projected_points'
+    if next_word in LIMIT_WORDS:
+        return LIMIT_WORDS[next_word]
+    if value >= 1000:
+        return 'estimated_salary'
+    return 'ownership_pct' if 'own' in text else 'projected_points'
+
+def parse_question(question, derived):
+    """ParsedQuestion for a question about derived's slate"""
+    text = question.lower()
+    parsed = ParsedQuestion()
+    parsed.mentions = derived.players.mentions(question, skip=STOPWORDS)
+    parsed.positions = [pos for pattern, pos in POSITION_PATTERNS if pattern.search(text)]
+    teams = derived.teams
+    parsed.teams = list(dict.fromkeys(t for t in _TEAM_TOKEN.findall(question) if t in teams))
+
+    play_types = [play_type for pattern, play_type in PLAY_TYPE_PATTERNS if pattern.search(text)]
+    if not play_types and 'contrarian' in text:
+        play_types = CONTRARIAN_PLAY_TYPES
+    parsed.play_types = play_types or None
+
+    for op, dollar, number, unit, next_word in _LIMIT.findall(text):
+        value = float(number.replace(',', ''))
+        if unit == 'k':
+            value *= 1000
+        column = _limit_column(unit, dollar, next_word, value, text)
+        parsed.limits.append((column, op in _AT_MOST, value))
+
+    for pattern, column, ascending, label in SORT_PATTERNS:
+        if pattern.search(text):
+            parsed.sort, parsed.sorted_by_request = (column, ascending, label), True
+            break
+
+    top = _TOP_N.search(text)
+    if top:
+        parsed.top_n = min(int(top.group(1) or top.group(2)), MAX_ANSWER_ROWS)
+    parsed.elite = bool(_ELITE.search(text))
+    parsed.topic = bool(_TOPIC.search(text))
+    parsed.list_words = bool(_LIST_WORDS.search(text))
+    return parsed
+
+# =====================================
+# ANSWERS
+# =====================================
+
+def _fmt(value, pattern, missing='—'):
+    try:
+        return missing if value is None or np.isnan(value) else pattern.format(value)
+    except TypeError:
+        return missing
+
+def _team_text(player):
+    team = str(player.get('team', '') or '')
+    return f", {team}" if team else ''
+
+# Columns player_line reads
+LINE_COLUMNS = ['player_name', 'position', 'team', 'player_rank', 'ownership_pct', 'projected_points',
+                'estimated_salary', 'play_type']
+
+def player_line(player):
+    """One-line summary used in lists"""
+    label = PLAY_TYPE_LABELS.get(player.get('play_type'), '')
+    return (f"• **{player['player_name']}** ({player['position']}{_team_text(player)}) - "
+            f"Rank {_fmt(player.get('player_rank'), '#{:.0f}')}, {_fmt(player.get('ownership_pct'), '{:.1f}%')} owned, "
+            f"{_fmt(player.get('projected_points'), '{:.1f}')} pts, {_fmt(player.get('estimated_salary'), '${:,.0f}')}"
+            + (f" · {label}" if label else ''))
+
+def _resolve(derived, parsed):
+    """Row per mentioned player (best projection when a word matches several) plus ambiguity notes"""
+    frame = derived.frame
+    rows, notes = [], []
+    for words, names in parsed.mentions:
+        candidates = [row for row in (derived.players.find(name) for name in names) if row is not None]
+        if not candidates:
+            continue
+        if len(candidates) > 1:
+            points = frame['projected_points'].to_numpy(dtype=np.float64)[candidates]
+            candidates = [candidates[i] for i in np.argsort(-np.nan_to_num(points, nan=-np.inf), kind='stable')]
+            others = ', '.join(frame['player_name'].iloc[candidates[1:4]])
+            notes.append(f"ℹ️ Took '{words}' as {frame['player_name'].iloc[candidates[0]]} (also matches {others})")
+        if candidates[0] not in rows:
+            rows.append(candidates[0])
+    return rows, notes
+
+def answer_player(player):
+    """Card for one player"""
+    play_type = player.get('play_type')
+    lines = [f"📊 **{player['player_name']}** ({player['position']}{_team_text(player)})"
+             + (f" - {PLAY_TYPE_LABELS[play_type]}" if play_type in PLAY_TYPE_LABELS else ''), '']
+    lines.append(f"• Rank {_fmt(player.get('player_rank'), '#{:.0f}')} · {_fmt(player.get('ownership_pct'), '{:.1f}%')} owned · "
+                 f"{_fmt(player.get('projected_points'), '{:.1f}')} projected pts")
+    lines.append(f"• {_fmt(player.get('estimated_salary'), '${:,.0f}')} salary · {_fmt(player.get('value'), '{:.2f}')} pts/$1K · "
+                 f"contrarian score {_fmt(player.get('contrarian_score'), '{:.1f}')}")
+    if play_type in PLAY_TYPE_NOTES:
+        lines += ['', PLAY_TYPE_NOTES[play_type]]
+    return '\n'.join(lines)
+
+def answer_compare(players):
+    """Side-by-side table for 2+ players with a tournament and a cash-game pick"""
+    names = [p['player_name'] for p in players]
+    metrics = [
+        ('Position', lambda p: f"{p['position']}{_team_text(p).replace(', ', ' · ')}"),
+        ('Rank', lambda p: _fmt(p.get('player_rank'), '#{:.0f}')),
+        ('Ownership', lambda p: _fmt(p.get('ownership_pct'), '{:.1f}%')),
+        ('Projected', lambda p: _fmt(p.get('projected_points'), '{:.1f}')),
+        ('Salary', lambda p: _fmt(p.get('estimated_salary'), '${:,.0f}')),
+        ('Value', lambda p: _fmt(p.get('value'), '{:.2f}')),
+        ('Contrarian', lambda p: _fmt(p.get('contrarian_score'), '{:.1f}')),
+        ('Play Type', lambda p: PLAY_TYPE_LABELS.get(p.get('play_type'), '—')),
+    ]
+    lines = ["⚖️ **" + ' vs '.join(names) + "**", '', '| | ' + ' | '.join(names) + ' |',
+             '|---|' + '---|' * len(names)]
+    lines += [f"| {label} | " + ' | '.join(fmt(p) for p in players) + ' |' for label, fmt in metrics]
+
+    def best(column):
+        values = np.array([p.get(column) for p in players], dtype=np.float64)
+        return None if np.isnan(values).all() else names[int(np.nanargmax(values))]
+
+    gpp, cash = best('contrarian_score'), best('projected_points')
+    lines.append('')
+    if gpp and gpp == cash:
+        lines.append(f"✅ **{gpp}** has the edge in tournaments and cash games")
+    else:
+        if gpp:
+            lines.append(f"🏆 **Tournaments:** {gpp} (higher contrarian score)")
+        if cash:
+            lines.append(f"💰 **Cash games:** {cash} (higher projection)")
+    return '\n'.join(lines)
+
+def _describe(parsed, shown_rows):
+    column, ascending, label = parsed.sort
+    plural = {'QB': 'QBs', 'RB': 'RBs', 'WR': 'WRs', 'TE': 'TEs'}
+    what = '/'.join(plural[p] for p in parsed.positions) or 'players'
+    if parsed.play_types:
+        kinds = '/'.join(PLAY_TYPE_LABELS[p].split(' ', 1)[1] for p in parsed.play_types)
+        what = f"{kinds} {what if parsed.positions else 'plays'}"
+    parts = [f"{'Top ' + str(shown_rows) + ' ' if parsed.top_n else ''}{label} {what}".strip()]
+    if parsed.teams:
+        parts.append('on ' + '/'.join(parsed.teams))
+    if parsed.elite:
+        parts.append(f"ranked top {ELITE_RANK}")
+    for col, at_most, value in parsed.limits:
+        bound = 'under' if at_most else 'over'
+        parts.append({
+            'ownership_pct': f"{bound} {value:g}% owned",
+            'estimated_salary': f"{bound} ${value:,.0f}",
+            'projected_points': f"{bound} {value:g} projected pts",
+            'value': f"{bound} {value:g} pts/$1K",
+        }[col])
+    text = ' '.join(parts)
+    return text[0].upper() + text[1:]
+
+def answer_list(derived, parsed):
+    """Top players matching the question's filters, in its sort order"""
+    frame = derived.frame
+    positions = parsed.positions
+    rows = derived.rows(positions[0] if len(positions) == 1 else None, parsed.play_types, by_contrarian=True,
+                        teams=parsed.teams or None)
+    if len(positions) > 1:
+        rows = rows[np.isin(rows, np.concatenate([derived.rows(p) for p in positions]))]
+
+    mask = np.ones(len(rows), dtype=bool)
+    if parsed.elite and 'player_rank' in frame.columns:
+        mask &= frame['player_rank'].to_numpy(dtype=np.float64)[rows] <= ELITE_RANK
+    for col, at_most, value in parsed.limits:
+        if col in frame.columns:
+            values = frame[col].to_numpy(dtype=np.float64)[rows]
+            mask &= (values <= value) if at_most else (values >= value)
+    rows = rows[mask]
+    matches = len(rows)
+
+    n_rows = parsed.top_n or DEFAULT_ANSWER_ROWS
+    column, ascending, _ = parsed.sort
+    if (column, ascending) != DEFAULT_SORT[:2] and column in frame.columns and len(rows):
+        values = frame[column].to_numpy(dtype=np.float64)[rows]
+        key = np.where(np.isnan(values), np.inf, values if ascending else -values)
+        if len(rows) > n_rows:
+            # Only the shown rows need ordering
+            top = np.argpartition(key, n_rows)[:n_rows]
+            rows = rows[top[np.argsort(key[top], kind='stable')]]
+        else:
+            rows = rows[np.argsort(key, kind='stable')]
+
+    shown = frame.iloc[rows[:n_rows], [frame.columns.get_loc(c) for c in LINE_COLUMNS if c in frame.columns]]
+    description = _describe(parsed, len(shown))
+    if len(shown) == 0:
+        return f"📊 No matches for **{description[0].lower() + description[1:]}** in this slate - try loosening the limits."
+    lines = [f"🔍 **{description}** ({len(shown)} of {matches:,} matches)", '']
+    lines += [player_line(player) for player in shown.to_dict('records')]
+    return '\n'.join(lines)
+
+def answer_question(question, derived):
+    """Markdown answer from the slate, or None when the question isn't about slate data"""
+    if derived is None or len(derived.frame) == 0 or not question.strip():
+        return None
+    parsed = parse_question(question, derived)
+
+    rows, notes = _resolve(derived, parsed) if parsed.mentions else ([], [])
+    if rows:
+        players = [derived.frame.iloc[row] for row in rows[:MAX_COMPARE]]
+        response = answer_player(players[0]) if len(players) == 1 else answer_compare(players)
+        return '\n\n'.join([response] + notes)
+
+    if parsed.topic or not parsed.wants_list:
+        return None
+    return answer_list(derived, parsed)
@@ -0,0 +1,154 @@
+# RANDOMIZED OPTIMIZER
+# Re-solves the lineup under up to MAX_DRAWS perturbed projections so the
+# builder shows how often each player is optimal, not just the one core the
+# deterministic optimizer_score always picks.
+#
+# Every draw nudges projected_points (by the simulator's position CVs) and
+# contrarian_score (through position-specific ownership error), rebuilds the
+# strategy score, and re-solves. Draws are generated as one NumPy matrix per
+# chunk, and one LineupModel serves every draw: the salary grid, roster
+# combos, stack/captain rows and each search node's players are built once,
+# only the DP values follow the new scores. Sibling search nodes also share
+# one position table, so a branch only redoes the players its rows touch.
+#
+# Every draw is still an exact solve: ~2 ms plain, 5-30 ms with a QB stack,
+# ~80-200 ms once the stack needs a team solve on a 390-player slate. That
+# keeps runs capped at MAX_DRAWS (a 1000-draw deep-stack run is minutes, not
+# seconds), with progress reported after each chunk.
+
+import numpy as np
+import pandas as pd
+
+from metrics import timed
+from optimizer import (_lineup_frame, _player_indices, build_model, fold_captains, optimize_lineup, platform_pool,
+                       player_ids, prepare_player_pool, stack_rules, strategy_scores)
+from platforms import get_rules
+from scoring import OWNERSHIP_WEIGHT
+from simulation import DEFAULT_CV, POSITION_CV
+
+DEFAULT_DRAWS = 500
+MAX_DRAWS = 1000
+
+# Draw counts offered in the builder
+DRAW_OPTIONS = [100, 250, 500, 1000]
+
+# How far actual ownership lands from projected ownership, as a share of the
+# projection. contrarian_score moves OWNERSHIP_WEIGHT points per ownership point.
+OWNERSHIP_CV = {'QB': 0.25, 'RB': 0.30, 'WR': 0.35, 'TE': 0.40}
+DEFAULT_OWNERSHIP_CV = 0.35
+
+# Perturbed scores held at once (draws x players), and most draws between progress reports
+DRAW_CHUNK_CELLS = 2_000_000
+DRAW_CHUNK = 50
+
+# =====================================
+# PERTURBATIONS
+# =====================================
+
+def perturbation_scales(players):
+    """Per-player noise sd for projected_points and contrarian_score"""
+    positions = players['position'].astype(str).to_numpy()
+    projected = players['projected_points'].to_numpy(dtype=np.float64)
+    ownership = np.zeros(len(players))
+    if 'ownership_pct' in players.columns:
+        ownership = np.nan_to_num(pd.to_numeric(players['ownership_pct'], errors='coerce').to_numpy(dtype=np.float64))
+
+    points_cv = np.array([POSITION_CV.get(pos, DEFAULT_CV) for pos in positions])
+    ownership_cv = np.array([OWNERSHIP_CV.get(pos, DEFAULT_OWNERSHIP_CV) for pos in positions])
+    return points_cv * np.abs(projected), OWNERSHIP_WEIGHT * ownership_cv * ownership
+
+def perturbed_scores(players, strategy, n_draws, randomness=1.0, rng=None):
+    """(n_draws, n_players) strategy scores, each row one perturbed slate"""
+    rng = np.random.default_rng() if rng is None else rng
+    projected = players['projected_points'].to_numpy(dtype=np.float64)
+    contrarian = players['contrarian_score'].to_numpy(dtype=np.float64)
+    value = players['points_per_dollar'].to_numpy(dtype=np.float64)
+    points_sd, contrarian_sd = perturbation_scales(players)
+
+    noise = rng.standard_normal((2, n_draws, len(players)))
+    points = np.maximum(projected + noise[0] * (points_sd * randomness), 0)
+    contrarian = contrarian + noise[1] * (contrarian_sd * randomness)
+    # Salary is fixed, so value moves with the points (the pool only holds projected_points > 0)
+    value = value * (points / projected)
+    return strategy_scores(points, contrarian, value, strategy)
+
+# =====================================
+# DRAWS
+# =====================================
+
+@timed('optimizer_seconds', call='randomized_lineups')
+def randomized_lineups(df, strategy='Tournament (GPP)', n_draws=DEFAULT_DRAWS, salary_cap=None, randomness=1.0,
+                       must_include=(), exclude=(), pool=None, platform=None, seed=None, stacking=True,
+                       progress=None):
+    """Optimal lineup for each of n_draws perturbed slates, one row per player per distinct lineup
+
+    lineup_id ranks the distinct lineups by how many draws picked them
+    (`draws` column); draw_exposure turns this into per-player exposure.
+    randomness scales every noise sd (0 = deterministic, 1 = full spread).
+    progress(draws_done, n_draws) is called after every chunk of draws.
+    """
+    try:
+        rules = get_rules(platform)
+        salary_cap = rules.salary_cap if salary_cap is None else salary_cap
+        work_df = prepare_player_pool(df, strategy) if pool is None else pool
+
+        if len(work_df) == 0:
+            return pd.DataFrame({'Error': ['No valid player data after cleaning']})
+
+        n_draws = int(min(max(n_draws, 1), MAX_DRAWS))
+        solver_df = platform_pool(work_df, rules)
+        ids = player_ids(solver_df, rules)
+        n_players = len(solver_df) // 2 if rules.has_captain else len(solver_df)
+        # Captain rows score captain_points x the same draw as the player's flex row
+        multiplier = np.where(np.arange(len(solver_df)) >= n_players, rules.captain_points, 1.0)
+
+        model, locked = build_model(solver_df, salary_cap, rules, must_include, stack_rules(stacking))
+        excluded = set(_player_indices(solver_df, exclude).tolist())
+        rng = np.random.default_rng(seed)
+
+        found = {}  # sorted solver rows -> [selection, draws]
+        chunk = max(1, min(DRAW_CHUNK, DRAW_CHUNK_CELLS // max(len(solver_df), 1)))
+        for start in range(0, n_draws, chunk):
+            draws = min(chunk, n_draws - start)
+            scores = perturbed_scores(solver_df.iloc[:n_players], strategy, draws, randomness, rng)[:, ids] * multiplier
+            for row in scores:
+                selection = model.solve(row, locked=locked, excluded=excluded)
+                if selection is None:
+                    continue
+                entry = found.setdefault(tuple(sorted(player for player, _ in selection)), [selection, 0])
+                entry[1] += 1
+            if progress is not None:
+                progress(start + draws, n_draws)
+
+        if not found:
+            return optimize_lineup(df, strategy, salary_cap, stacking, must_include=must_include, exclude=exclude,
+                                   pool=pool, platform=rules)
+
+        frames = []
+        ranked = sorted(found.values(), key=lambda entry: -entry[1])
+        for lineup_id, (selection, draws) in enumerate(ranked, start=1):
+            lineup_df = _lineup_frame(solver_df, selection, rules.roster_slots, salary_cap)
+            lineup_df.insert(0, 'lineup_id', lineup_id)
+            lineup_df['draws'] = draws
+            frames.append(lineup_df)
+        return pd.concat(frames, ignore_index=True)
+
+    except Exception as e:
+        return pd.DataFrame({'Error': [f'Optimization failed: {str(e)}']})
+
+def draw_exposure(lineups_df, platform=None):
+    """Share of draws each player was in the optimal lineup, most exposed first
+
+    In captain formats a player's captain and flex rows count as one player,
+    with captain_pct the share of draws they were captain in.
+    """
+    rules = get_rules(platform)
+    total = lineups_df.drop_duplicates('lineup_id')['draws'].sum()
+    folded = fold_captains(lineups_df, rules)
+    folded = folded.assign(captain_draws=folded['draws'].where(folded['is_captain'], 0))
+    exposure = folded.groupby(['player_name', 'position'], observed=True)[['draws', 'captain_draws']].sum().reset_index()
+    exposure['exposure_pct'] = (exposure['draws'] / total * 100).round(1)
+    if rules.has_captain:
+        exposure['captain_pct'] = (exposure['captain_draws'] / total * 100).round(1)
+    exposure = exposure.drop(columns='captain_draws')
+    return exposure.sort_values(['draws', 'player_name'], ascending=[False, True]).reset_index(drop=True)
@@ -0,0 +1,110 @@
+# CONTRARIAN SCORING
+# contrarian_score, play_type and recommendation computed in the app from
+# rank and ownership, so fresh ownership can be rescored without waiting on
+# the Databricks notebook. Same rules as the notebook and the page legends.
+
+import numpy as np
+import pandas as pd
+
+from platforms import salary_units
+
+# contrarian_score = RANK_WEIGHT * (RANK_BASE - rank) - OWNERSHIP_WEIGHT * ownership
+# (the rank term bottoms out at 0 past rank 10)
+RANK_BASE = 11
+RANK_WEIGHT = 20
+OWNERSHIP_WEIGHT = 2
+
+# Play type rules, checked in this order
+SMASH_MAX_RANK, SMASH_MAX_OWNERSHIP = 3, 15        # top 3, under 15% owned
+LEVERAGE_MAX_RANK, LEVERAGE_MAX_OWNERSHIP = 5, 20  # top 5, under 20% owned
+CHALK_MAX_RANK, CHALK_MIN_OWNERSHIP = 5, 25        # top 5, 25%+ owned
+
+PLAY_TYPES = np.array(['SMASH_PLAY', 'LEVERAGE_PLAY', 'CHALK_PLAY', 'NEUTRAL'], dtype=object)
+
+# Columns score_players writes
+SCORED_COLUMNS = ['contrarian_score', 'play_type', 'recommendation', 'points_per_dollar']
+
+def contrarian_scores(rank, ownership):
+    """Contrarian score per player (NaN where rank or ownership is missing)"""
+    rank = np.asarray(rank, dtype=np.float64)
+    ownership = np.asarray(ownership, dtype=np.float64)
+    return np.maximum(RANK_WEIGHT * (RANK_BASE - rank), 0) - OWNERSHIP_WEIGHT * ownership
+
+def play_type_codes(rank, ownership):
+    """Index into PLAY_TYPES per player; missing values fall through to NEUTRAL"""
+    rank = np.asarray(rank, dtype=np.float64)
+    ownership = np.asarray(ownership, dtype=np.float64)
+    return np.select(
+        [
+            (rank <= SMASH_MAX_RANK) & (ownership < SMASH_MAX_OWNERSHIP),
+            (rank <= LEVERAGE_MAX_RANK) & (ownership < LEVERAGE_MAX_OWNERSHIP),
+            (rank <= CHALK_MAX_RANK) & (ownership >= CHALK_MIN_OWNERSHIP),
+        ],
+        [0, 1, 2],
+        default=3,
+    )
+
+def play_types(rank, ownership):
+    return PLAY_TYPES[play_type_codes(rank, ownership)]
+
+def recommendations(rank, ownership, codes=None):
+    """Recommendation text per player, in the notebook's wording"""
+    rank = np.asarray(rank, dtype=np.float64)
+    ownership = np.asarray(ownership, dtype=np.float64)
+    codes = play_type_codes(rank, ownership) if codes is None else np.asarray(codes)
+    out = np.full(len(codes), "😐 NEUTRAL: Standard play", dtype=object)
+
+    # Only SMASH/LEVERAGE/CHALK rows need formatting; NEUTRAL is a constant
+    def join(*parts):
+        text = parts[0]
+        for part in parts[1:]:
+            text = np.char.add(text, part)
+        return text.astype(object)
+
+    rows = np.flatnonzero(codes == 0)
+    if len(rows):
+        own = np.char.mod('%.1f', ownership[rows])
+        out[rows] = join("🔥 SMASH: Top 3 player at only ", own, "% owned!")
+    for code, label, joiner, tail in ((1, "⚡ LEVERAGE", " at ", "% owned - GPP play"),
+                                      (2, "📍 CHALK", " but ", "% owned - cash game only")):
+        rows = np.flatnonzero(codes == code)
+        if len(rows):
+            own = np.char.mod('%.1f', ownership[rows])
+            ranks = np.char.mod('%d', rank[rows])
+            out[rows] = join(f"{label}: Rank ", ranks, joiner, own, tail)
+    return out
+
+def score_arrays(rank, ownership, projected_points=None, salary=None, salary_unit=1000):
+    """Every scored column as arrays (lets callers rescore just a few rows)
+
+    salary_unit: salary dollars per points_per_dollar unit (scalar or per row)
+    """
+    codes = play_type_codes(rank, ownership)
+    scored = {
+        'contrarian_score': contrarian_scores(rank, ownership),
+        'play_type': PLAY_TYPES[codes],
+        'recommendation': recommendations(rank, ownership, codes),
+    }
+    if projected_points is not None and salary is not None:
+        salary_k = np.asarray(salary, dtype=np.float64) / salary_unit
+        with np.errstate(divide='ignore', invalid='ignore'):
+            value = np.asarray(projected_points, dtype=np.float64) / salary_k
+        scored['points_per_dollar'] = np.where(salary_k > 0, value, np.nan)
+    return scored
+
+def score_players(df):
+    """Copy of df with contrarian_score, play_type, recommendation and points_per_dollar recomputed"""
+    if 'player_rank' not in df.columns or 'ownership_pct' not in df.columns:
+        return df
+    rank = pd.to_numeric(df['player_rank'], errors='coerce').to_numpy(dtype=np.float64)
+    ownership = pd.to_numeric(df['ownership_pct'], errors='coerce').to_numpy(dtype=np.float64)
+    projected = salary = None
+    if 'projected_points' in df.columns and 'estimated_salary' in df.columns:
+        projected = pd.to_numeric(df['projected_points'], errors='coerce').to_numpy(dtype=np.float64)
+        salary = pd.to_numeric(df['estimated_salary'], errors='coerce').to_numpy(dtype=np.float64)
+
+    units = salary_units(df['platform']) if 'platform' in df.columns else 1000
+    scored = df.copy()
+    for col, values in score_arrays(rank, ownership, projected, salary, units).items():
+        scored[col] = values
+    return scored
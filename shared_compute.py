@@ -0,0 +1,113 @@
+# SHARED COMPUTE
+# Results every session would otherwise compute for itself - filtered player
+# tables, tournament recommendations, optimizer runs, chart figures - memoized
+# once per server and served to all of them.
+#
+# Keys are (data key, name, params). The data key is (data version, live
+# ownership sequence, platform), so a new fantasy_data.csv or an ownership
+# update never serves an old result, and entries from an older data version
+# are dropped as soon as a newer one is seen. The store is an LRU bounded by
+# approximate bytes (SHARED_COMPUTE_MB, default 256). Identical requests that
+# arrive while the first is still computing wait for it instead of repeating
+# the work.
+#
+# Cached values are shared read-only: copy before changing one.
+
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from metrics import REGISTRY
+
+SHARED_COMPUTE_MB = float(os.environ.get('SHARED_COMPUTE_MB', 256))
+
+class SharedCompute:
+    """Thread-safe LRU of computed results, bounded by approximate size in bytes"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._pending = {}             # key -> Event set when its first compute finishes
+        self._version = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, data_key, name, params, compute):
+        """compute() for these params on this data, computed once and shared"""
+        key = (data_key, name, params)
+        REGISTRY.inc('cache_requests_total', cache=name)
+        while True:
+            with self._lock:
+                if data_key[0] != self._version:
+                    self._drop_version(data_key[0])
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    return self._entries[key][0]
+                pending = self._pending.get(key)
+                if pending is None:
+                    pending = self._pending[key] = threading.Event()
+                    break
+            # Someone else is computing it - use theirs (or retry if it failed)
+            pending.wait()
+
+        try:
+            REGISTRY.inc('cache_misses_total', cache=name)
+            with REGISTRY.timer('cache_compute_seconds', cache=name):
+                value = compute()
+            self._store(key, value)
+            return value
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+            pending.set()
+
+    def _store(self, key, value):
+        size = approx_size(value)
+        with self._lock:
+            if size > self.max_bytes or key[0][0] != self._version:
+                return
+            self._entries[key] = (value, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.bytes -= evicted
+                REGISTRY.inc('cache_evictions_total', cache='shared_compute')
+
+    def _drop_version(self, version):
+        """Forget everything computed for other data versions (called with the lock held)"""
+        self._version = version
+        for key in [k for k in self._entries if k[0][0] != version]:
+            self.bytes -= self._entries.pop(key)[1]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+def approx_size(value):
+    """Rough in-memory size of a cached value in bytes"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(np.sum(value.memory_usage(deep=True)))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(approx_size(v) for v in value)
+    if hasattr(value, 'to_plotly_json'):
+        return len(value.to_json())  # plotly figure: about what it holds
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(approx_size(v) for v in value.values())
+    return sys.getsizeof(value)
+
+# The store every session reads from
+SHARED = SharedCompute(int(SHARED_COMPUTE_MB * 1024 * 1024))
+
+def shared(ctx, name, params, compute):
+    """compute() memoized across sessions for the page's data (ctx.data_key) and params"""
+    return SHARED.get(ctx.data_key, name, params, compute)
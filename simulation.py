@@ -0,0 +1,300 @@
+# SLATE SIMULATOR
+# Monte Carlo fantasy outcomes for a whole slate in one vectorized pass.
+# Used by Performance Tracking and the Lineup Builder lineup summaries.
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+
+from optimizer import ROSTER_SLOTS
+
+# =====================================
+# OUTCOME MODEL
+# =====================================
+
+# Spread of actual points around the projection, as a share of the projection
+POSITION_CV = {'QB': 0.30, 'RB': 0.45, 'WR': 0.55, 'TE': 0.60}
+DEFAULT_CV = 0.50
+
+# How strongly each position follows its team's game script. Teammates
+# correlate at the product of their loadings (QB-WR ~0.42, QB-TE ~0.35)
+TEAM_LOADING = {'QB': 0.70, 'RB': 0.25, 'WR': 0.60, 'TE': 0.50}
+
+DEFAULT_SIMULATIONS = 10000
+
+# Simulations scored per block when totalling lineups (caps peak memory)
+CHUNK_SIZE = 10000
+
+# Simulated field totals held at once when scoring against a field
+FIELD_CHUNK_CELLS = 8_000_000
+
+def _team_codes(df):
+    """Integer team code per player, or None when the slate has no team column"""
+    for col in ['team', 'posteam']:
+        if col in df.columns:
+            teams = df[col].fillna('').astype(str).to_numpy()
+            codes = pd.factorize(teams)[0]
+            # Players without a team get their own code so they stay independent
+            missing = teams == ''
+            codes[missing] = codes.max() + 1 + np.arange(missing.sum())
+            return codes
+    return None
+
+class SlateSimulation:
+    """Simulated fantasy points for every player, one row per simulated slate"""
+
+    def __init__(self, players, points):
+        self.players = players.reset_index(drop=True)
+        self.points = points
+        self.n_sims = points.shape[0]
+        self._name_index = {name: i for i, name in enumerate(self.players['player_name'])}
+
+    def player_percentiles(self, floor=10, ceiling=90):
+        """Floor / median / ceiling per player from the simulated outcomes"""
+        floor_pts, median_pts, ceiling_pts = np.percentile(self.points, [floor, 50, ceiling], axis=0)
+        result = self.players[['player_name', 'position', 'projected_points']].copy()
+        result['sim_mean'] = self.points.mean(axis=0)
+        result['floor'] = floor_pts
+        result['median'] = median_pts
+        result['ceiling'] = ceiling_pts
+        return result
+
+    def hit_rate(self, threshold):
+        """Share of simulations each player reaches threshold (scalar or per player)"""
+        return (self.points >= np.asarray(threshold, dtype=np.float32)).mean(axis=0)
+
+    def lineup_matrix(self, lineups):
+        """Player-by-lineup 0/1 matrix from lists of player names or row indices"""
+        matrix = np.zeros((len(self.players), len(lineups)), dtype=np.float32)
+        for j, lineup in enumerate(lineups):
+            rows = [self._name_index[p] if isinstance(p, str) else int(p) for p in lineup]
+            matrix[rows, j] = 1
+        return matrix
+
+    def lineup_scores(self, lineups):
+        """Simulated total for every lineup: shape (n_sims, n_lineups)"""
+        return self.points @ self.lineup_matrix(lineups)
+
+    def lineup_probabilities(self, lineups, field_scores=None, cash_pct=20):
+        """Win / cash probability per lineup against a field
+
+        field_scores is (n_sims, n_field) of simulated opponent totals; by
+        default the lineups compete against each other. A lineup wins a
+        simulation by beating every field entry (ties split) and cashes by
+        finishing in the top cash_pct percent of the field.
+        """
+        matrix = self.lineup_matrix(lineups)
+        win = np.zeros(len(lineups))
+        cash = np.zeros(len(lineups))
+        totals = np.zeros(len(lineups))
+
+        for start in range(0, self.n_sims, CHUNK_SIZE):
+            scores = self.points[start:start + CHUNK_SIZE] @ matrix
+            field = scores if field_scores is None else field_scores[start:start + CHUNK_SIZE]
+
+            best = field.max(axis=1, keepdims=True)
+            if field_scores is None:
+                winners = scores == best
+                win += (winners / winners.sum(axis=1, keepdims=True)).sum(axis=0)
+            else:
+                ties = (field == best).sum(axis=1, keepdims=True)
+                win += np.where(scores > best, 1.0, np.where(scores == best, 1.0 / (ties + 1), 0.0)).sum(axis=0)
+
+            cash_line = np.percentile(field, 100 - cash_pct, axis=1, keepdims=True)
+            cash += (scores >= cash_line).sum(axis=0)
+            totals += scores.sum(axis=0)
+
+        return pd.DataFrame({
+            'lineup': np.arange(1, len(lineups) + 1),
+            'sim_mean': totals / self.n_sims,
+            'win_pct': win / self.n_sims * 100,
+            'cash_pct': cash / self.n_sims * 100,
+        })
+
+    def field_scores(self, field, sims=slice(None)):
+        """Simulated totals of every field entry: shape (n_sims, n_field)"""
+        return (_field_incidence(field, len(self.players)) @ self.points[sims].T).T
+
+    def score_against_field(self, lineups, field, cash_pct=20):
+        """Expected finish, win / cash odds and duplication of lineups in a field
+
+        Each lineup is entered alone into the simulated field, so the
+        finish is 1 + the number of field entries that outscore it.
+        """
+        matrix = self.lineup_matrix(lineups)
+        n_field = len(field)
+        finish = np.zeros(len(lineups))
+        win = np.zeros(len(lineups))
+        cash = np.zeros(len(lineups))
+        totals = np.zeros(len(lineups))
+
+        incidence = _field_incidence(field, len(self.players))
+        chunk = max(1, FIELD_CHUNK_CELLS // max(n_field, 1))
+        for start in range(0, self.n_sims, chunk):
+            sims = slice(start, start + chunk)
+            scores = self.points[sims] @ matrix
+            field_totals = np.sort((incidence @ self.points[sims].T).T, axis=1)
+            beaten_by = _count_above(field_totals, scores)
+
+            finish += (1 + beaten_by).sum(axis=0)
+            win += (beaten_by == 0).sum(axis=0)
+            cash += (beaten_by < n_field * cash_pct / 100).sum(axis=0)
+            totals += scores.sum(axis=0)
+
+        dupes = field_duplicates(field, [np.flatnonzero(matrix[:, j]) for j in range(len(lineups))])
+        return pd.DataFrame({
+            'lineup': np.arange(1, len(lineups) + 1),
+            'sim_mean': totals / self.n_sims,
+            'avg_finish': finish / self.n_sims,
+            'win_pct': win / self.n_sims * 100,
+            'cash_pct': cash / self.n_sims * 100,
+            'field_dupes': dupes,
+            'dupe_pct': dupes / max(n_field, 1) * 100,
+        })
+
+def _count_above(sorted_rows, values):
+    """How many entries of each sorted row are above each of that row's values (one binary search for all)"""
+    n = sorted_rows.shape[1]
+    lo = np.zeros(values.shape, dtype=np.intp)
+    hi = np.full(values.shape, n, dtype=np.intp)
+    for _ in range(n.bit_length()):
+        active = lo < hi
+        mid = (lo + hi) // 2
+        right = active & (np.take_along_axis(sorted_rows, np.minimum(mid, n - 1), axis=1) <= values)
+        lo = np.where(right, mid + 1, lo)
+        hi = np.where(active & ~right, mid, hi)
+    return n - lo
+
+def _field_incidence(field, n_players):
+    """Sparse entry-by-player matrix of a packed field"""
+    n_field, roster_size = field.shape
+    return csr_matrix(
+        (np.ones(field.size, dtype=np.float32), field.ravel().astype(np.int32),
+         np.arange(0, field.size + 1, roster_size)),
+        shape=(n_field, n_players),
+    )
+
+def simulate_slate(df, n_sims=DEFAULT_SIMULATIONS, seed=None):
+    """Draw n_sims correlated outcomes for every player in df"""
+    players = df.reset_index(drop=True)
+    projections = pd.to_numeric(players['projected_points'], errors='coerce').fillna(0).to_numpy(dtype=np.float32)
+    positions = players['position'].astype(str).to_numpy()
+
+    cv = np.array([POSITION_CV.get(pos, DEFAULT_CV) for pos in positions], dtype=np.float32)
+    loading = np.array([TEAM_LOADING.get(pos, 0.0) for pos in positions], dtype=np.float32)
+
+    rng = np.random.default_rng(seed)
+    noise = rng.standard_normal((n_sims, len(players)), dtype=np.float32)
+
+    # Shared team factor: z = loading * team_shock + sqrt(1 - loading^2) * own_shock
+    teams = _team_codes(players)
+    if teams is not None:
+        team_shocks = rng.standard_normal((n_sims, teams.max() + 1), dtype=np.float32)
+        noise *= np.sqrt(1 - loading ** 2)
+        noise += team_shocks[:, teams] * loading
+
+    # Scale in place to keep 100k-simulation slates to one big array
+    noise *= cv * projections
+    noise += projections
+    np.maximum(noise, 0, out=noise)
+    return SlateSimulation(players, noise)
+
+# =====================================
+# OPPONENT FIELD
+# =====================================
+
+DEFAULT_FIELD_SIZE = 20000
+
+def _sample_field(weights_by_pos, n_entries, roster_slots, rng):
+    """Ownership-weighted rosters via Gumbel top-k, one block of n_entries"""
+    base_counts = {pos: 0 for pos in weights_by_pos}
+    flex_slots = []
+    for _, eligible, count in roster_slots:
+        if len(eligible) == 1:
+            base_counts[eligible[0]] += count
+        else:
+            flex_slots.append((eligible, count))
+
+    picks = []
+    for eligible, count in flex_slots:
+        extras, extra_keys = [], []
+        for pos in eligible:
+            players, weights = weights_by_pos[pos]
+            take = base_counts[pos] + count
+            keys = np.log(weights) + rng.gumbel(size=(n_entries, len(players))).astype(np.float32)
+            top = np.argpartition(-keys, take - 1, axis=1)[:, :take]
+            top_keys = np.take_along_axis(keys, top, axis=1)
+            order = np.argsort(-top_keys, axis=1)
+            top = np.take_along_axis(top, order, axis=1)
+            top_keys = np.take_along_axis(top_keys, order, axis=1)
+
+            picks.append(players[top[:, :base_counts[pos]]])
+            extras.append(players[top[:, base_counts[pos]:]])
+            extra_keys.append(top_keys[:, base_counts[pos]:])
+            base_counts[pos] = 0
+
+        # FLEX goes to the highest-keyed leftovers across its positions
+        extras = np.hstack(extras)
+        best = np.argsort(-np.hstack(extra_keys), axis=1)[:, :count]
+        picks.append(np.take_along_axis(extras, best, axis=1))
+
+    for pos, count in base_counts.items():
+        if count == 0:
+            continue
+        players, weights = weights_by_pos[pos]
+        keys = np.log(weights) + rng.gumbel(size=(n_entries, len(players))).astype(np.float32)
+        picks.append(players[np.argpartition(-keys, count - 1, axis=1)[:, :count]])
+
+    return np.sort(np.hstack(picks), axis=1).astype(np.uint16)
+
+def build_field(df, n_entries=DEFAULT_FIELD_SIZE, salary_cap=None, seed=None, roster_slots=ROSTER_SLOTS,
+                max_rounds=20):
+    """Simulated opponent lineups drawn by ownership_pct
+
+    Returns a (n_entries, roster_size) uint16 array of row positions in
+    df, each row sorted so identical lineups compare equal. With a
+    salary_cap, over-cap rosters are redrawn; fewer rows come back if
+    the pool can't produce enough legal ones.
+    """
+    players = df.reset_index(drop=True)
+    if len(players) > np.iinfo(np.uint16).max:
+        raise ValueError('Player pool too large for a packed uint16 field')
+
+    ownership = pd.to_numeric(players['ownership_pct'], errors='coerce').fillna(0).clip(lower=0.1).to_numpy()
+    positions = players['position'].astype(str).to_numpy()
+    salaries = pd.to_numeric(players['estimated_salary'], errors='coerce').fillna(0).to_numpy()
+
+    weights_by_pos = {}
+    for _, eligible, _ in roster_slots:
+        for pos in eligible:
+            rows = np.flatnonzero(positions == pos)
+            weights_by_pos[pos] = (rows, ownership[rows].astype(np.float32))
+
+    roster_size = sum(count for _, _, count in roster_slots)
+    for pos, (rows, _) in weights_by_pos.items():
+        needed = sum(count for _, eligible, count in roster_slots if eligible == (pos,))
+        if len(rows) < needed + 1:
+            raise ValueError(f'Not enough {pos} players to build a field')
+
+    rng = np.random.default_rng(seed)
+    blocks, have = [], 0
+    for _ in range(max_rounds):
+        block = _sample_field(weights_by_pos, n_entries - have, roster_slots, rng)
+        if salary_cap is not None:
+            block = block[salaries[block].sum(axis=1) <= salary_cap]
+        blocks.append(block)
+        have += len(block)
+        if have >= n_entries:
+            break
+
+    field = np.vstack(blocks) if blocks else np.zeros((0, roster_size), dtype=np.uint16)
+    return field[:n_entries]
+
+def field_duplicates(field, lineups):
+    """How many field entries match each lineup exactly"""
+    counts = np.zeros(len(lineups), dtype=int)
+    for j, lineup in enumerate(lineups):
+        key = np.sort(np.asarray(lineup, dtype=field.dtype))
+        if len(key) == field.shape[1]:
+            counts[j] = (field == key).all(axis=1).sum()
+    return counts
@@ -0,0 +1,142 @@
+# PLAYER TABLES
+# One styled, sortable, paginated table per player list instead of a
+# row-by-row stack of st.columns/st.metric widgets.
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# Row tint per play type (same palette as the Deep Dive landscape chart)
+PLAY_TYPE_COLORS = {
+    'SMASH_PLAY': '#ef4444',
+    'LEVERAGE_PLAY': '#f59e0b',
+    'CHALK_PLAY': '#6b7280',
+    'NEUTRAL': '#3b82f6',
+    'AVOID': '#dc2626',
+}
+
+PLAY_TYPE_LABELS = {
+    'SMASH_PLAY': '🔥 SMASH',
+    'LEVERAGE_PLAY': '⚡ LEVERAGE',
+    'CHALK_PLAY': '📍 CHALK',
+    'NEUTRAL': '😐 NEUTRAL',
+    'AVOID': '🚫 AVOID',
+}
+
+PLAY_TYPE_NOTES = {
+    'SMASH_PLAY': '🎯 Elite at low ownership - perfect for tournaments',
+    'LEVERAGE_PLAY': '⚡ Solid leverage - good for GPP differentiation',
+    'CHALK_PLAY': '📍 High owned - cash games, avoid in tournaments',
+}
+
+# Source column -> table header, in display order
+TABLE_COLUMNS = {
+    'play_label': 'Play',
+    'player_name': 'Player',
+    'position': 'Pos',
+    'team': 'Team',
+    'opponent': 'Opp',
+    'player_rank': 'Rank',
+    'ownership_pct': 'Owned %',
+    'matchup_rating': 'Matchup',
+    'projected_points': 'Proj',
+    'estimated_salary': 'Salary',
+    'value': 'Value',
+    'contrarian_score': 'Contrarian',
+    'note': 'Note',
+}
+
+COLUMN_CONFIG = {
+    'Rank': st.column_config.NumberColumn(format="#%d"),
+    'Owned %': st.column_config.NumberColumn(format="%.1f%%"),
+    'Matchup': st.column_config.NumberColumn(format="%.1f/10"),
+    'Proj': st.column_config.NumberColumn(format="%.1f"),
+    'Salary': st.column_config.NumberColumn(format="$%d"),
+    'Value': st.column_config.NumberColumn(format="%.2f"),
+    'Contrarian': st.column_config.NumberColumn(format="%.1f"),
+}
+
+PAGE_SIZES = [25, 50, 100, 250]
+
+# Text columns left out of the table when the data has them blank
+OPTIONAL_COLUMNS = ('team', 'opponent')
+
+# =====================================
+# TABLE BUILDING
+# =====================================
+
+def player_table(df, labels=None, notes=True):
+    """Display frame for a player list: one vectorized pass, no per-row work"""
+    play_types = df['play_type'].astype(object) if 'play_type' in df.columns else pd.Series('NEUTRAL', index=df.index)
+    labels = PLAY_TYPE_LABELS if labels is None else {**PLAY_TYPE_LABELS, **labels}
+
+    table = pd.DataFrame(index=df.index)
+    table['play_label'] = play_types.map(labels).fillna(play_types)
+    for col in TABLE_COLUMNS:
+        if col in df.columns and not (col in OPTIONAL_COLUMNS and (df[col].astype(object) == '').all()):
+            table[col] = df[col]
+    if notes:
+        table['note'] = play_types.map(PLAY_TYPE_NOTES).fillna('')
+
+    table['play_type'] = play_types
+    return table.reset_index(drop=True)
+
+def style_table(table):
+    """Rename headers and tint each row by play type"""
+    play_types = table['play_type'].to_numpy()
+    shown = table.drop(columns='play_type').rename(columns=TABLE_COLUMNS)
+
+    # One CSS string per row, broadcast across the columns
+    tints = np.array([f'background-color: {PLAY_TYPE_COLORS[p]}22' if p in PLAY_TYPE_COLORS else ''
+                      for p in play_types], dtype=object)
+    css = pd.DataFrame(np.repeat(tints[:, None], shown.shape[1], axis=1),
+                       index=shown.index, columns=shown.columns)
+    return shown.style.apply(lambda _: css, axis=None)
+
+# =====================================
+# RENDERING
+# =====================================
+
+def render_player_table(df, key, labels=None, notes=True, default_sort=None, table=None):
+    """Whole player list as one paginated, sortable, play-type colored table
+
+    Pass table (an already built player_table, e.g. a shared_compute result)
+    instead of df to skip building it.
+    """
+    if table is None:
+        table = player_table(df, labels, notes)
+    if len(table) == 0:
+        st.info("No players match these filters")
+        return
+
+    sortable = [TABLE_COLUMNS[c] for c in table.columns if c in TABLE_COLUMNS and c != 'note']
+
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        sort_options = ["Default order"] + sortable
+        sort_by = st.selectbox("↕️ Sort by", sort_options,
+                               index=sort_options.index(default_sort) if default_sort in sort_options else 0,
+                               key=f"{key}_sort")
+    with col2:
+        ascending = st.toggle("Ascending", value=sort_by in ("Rank", "Owned %", "Salary", "Player", "Pos"),
+                              key=f"{key}_ascending")
+    with col3:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, key=f"{key}_page_size")
+
+    # Sort the full list before paging so page 2 continues page 1
+    if sort_by != "Default order":
+        source = {header: col for col, header in TABLE_COLUMNS.items()}[sort_by]
+        table = table.sort_values(source, ascending=ascending, kind='stable', na_position='last')
+
+    n_pages = max(1, -(-len(table) // page_size))
+    page_number = 1
+    if n_pages > 1:
+        page_number = st.number_input(f"Page (of {n_pages})", min_value=1, max_value=n_pages, value=1,
+                                      key=f"{key}_page")
+    start = (page_number - 1) * page_size
+    page = table.iloc[start:start + page_size].reset_index(drop=True)
+
+    # Only the visible page gets styled
+    st.dataframe(style_table(page), column_config=COLUMN_CONFIG, hide_index=True,
+                 use_container_width=True)
+    st.caption(f"Showing {start + 1:,}-{start + len(page):,} of {len(table):,} players")
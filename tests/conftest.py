@@ -0,0 +1,7 @@
+# Tests import the app's flat modules from the repo root, and the fake slates
+# from benchmarks/synthetic_slate.py
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'benchmarks')]
@@ -0,0 +1,80 @@
+# solve_exact against an integer program written straight from the platform
+# rules with scipy's milp, on small seeded slates
+
+import numpy as np
+import pytest
+from scipy.optimize import Bounds, LinearConstraint, milp
+
+from optimizer import BRING_BACK_POSITIONS, STACK_POSITIONS, StackRules, prepare_player_pool, solve_exact
+from platforms import get_rules
+from synthetic_slate import make_slate
+
+# (platform, slate size): single-game formats play from one game (two teams)
+SLATES = [('DraftKings', 60), ('DraftKings Showdown', 30), ('FanDuel Single Game', 30)]
+
+STACKS = [None, StackRules(), StackRules(2, 1, 4), StackRules(3, 2, 5)]
+
+def reference_score(pool, rules, stacks):
+    """Best total optimizer_score from a slot-assignment MILP over pool's players"""
+    n = len(pool)
+    positions = pool['position'].to_numpy()
+    teams, opponents = pool['team'].to_numpy(), pool['opponent'].to_numpy()
+    salaries = pool['estimated_salary'].to_numpy(dtype=float)
+    scores = pool['optimizer_score'].to_numpy(dtype=float)
+
+    # One variable per (player, slot) the player can fill; the captain slot
+    # takes any single-game position at the captain multipliers
+    pairs = []
+    for s, (slot, eligible, _) in enumerate(rules.roster_slots):
+        is_captain = slot == rules.captain_slot
+        for i in range(n):
+            if positions[i] in (rules.flex_positions if is_captain else eligible):
+                pairs.append((i, s, is_captain))
+    player = np.array([i for i, _, _ in pairs])
+    slot = np.array([s for _, s, _ in pairs])
+    captain = np.array([c for _, _, c in pairs])
+    cost = salaries[player] * np.where(captain, rules.captain_salary, 1.0)
+    value = scores[player] * np.where(captain, rules.captain_points, 1.0)
+
+    picks = (player[None, :] == np.arange(n)[:, None]).astype(float)  # player rows: picked at most once
+    rows, lower, upper = [], [], []
+    def add(coefs, low, high):
+        rows.append(coefs)
+        lower.append(low)
+        upper.append(high)
+
+    for s, (_, _, count) in enumerate(rules.roster_slots):
+        add((slot == s).astype(float), count, count)
+    for i in range(n):
+        add(picks[i], 0, 1)
+    add(cost, -np.inf, rules.salary_cap)
+    if stacks is not None:
+        for q in np.flatnonzero(positions == 'QB'):
+            for partners, need in ((np.isin(positions, STACK_POSITIONS) & (teams == teams[q]), stacks.qb_stack),
+                                   (np.isin(positions, BRING_BACK_POSITIONS) & (teams == opponents[q]),
+                                    stacks.bring_back)):
+                if need:
+                    add(partners.astype(float) @ picks - need * picks[q], 0, np.inf)
+        if stacks.max_per_team:
+            for team in np.unique(teams):
+                add((teams == team).astype(float) @ picks, -np.inf, stacks.max_per_team)
+
+    result = milp(-value, constraints=LinearConstraint(np.array(rows), lower, upper),
+                  integrality=np.ones(len(pairs)), bounds=Bounds(0, 1))
+    return None if result.x is None else -result.fun
+
+@pytest.mark.parametrize('stacks', STACKS, ids=repr)
+@pytest.mark.parametrize('seed', [0, 1, 2])
+@pytest.mark.parametrize('platform, n_players', SLATES)
+def test_solve_exact_matches_milp(platform, n_players, seed, stacks):
+    rules = get_rules(platform)
+    pool = prepare_player_pool(make_slate(n_players, seed=seed, platform=rules.data_platform))
+    expected = reference_score(pool, rules, stacks)
+    lineup = solve_exact(pool, salary_cap=rules.salary_cap, rules=rules, stacks=stacks)
+
+    if expected is None:
+        assert lineup is None
+        return
+    assert len(lineup) == rules.roster_size
+    assert lineup['estimated_salary'].sum() <= rules.salary_cap
+    assert lineup['optimizer_score'].sum() == pytest.approx(expected)
@@ -0,0 +1,37 @@
+# Assistant answers: cached by normalized question, answered from the question as typed
+
+import pytest
+
+from derived import DerivedData
+from qa_engine import answer_question, question_signature
+from synthetic_slate import make_slate
+
+@pytest.fixture(scope='module')
+def derived():
+    df = make_slate(120, seed=0)
+    df.loc[0, 'player_name'] = 'Jaxon Smith-Njigba'
+    df.loc[1, 'player_name'] = "Ja'Marr Chase"
+    return DerivedData(df)
+
+@pytest.mark.parametrize('question, name', [
+    ('Smith-Njigba?', 'Jaxon Smith-Njigba'),
+    ('should I play SMITH-NJIGBA', 'Jaxon Smith-Njigba'),
+    ("Ja'Marr Chase?", "Ja'Marr Chase"),
+    ("what about ja'marr", "Ja'Marr Chase"),
+])
+def test_names_resolve_after_normalization(derived, question, name):
+    signature = question_signature(question, derived.teams)
+    for text in (question, signature):
+        response = answer_question(text, derived)
+        assert response is not None and f'**{name}**' in response
+
+def test_signature_keeps_hyphenated_and_apostrophe_words_whole(derived):
+    assert question_signature("Smith-Njigba vs Ja'Marr?", derived.teams) == "smith-njigba vs ja'marr"
+    assert question_signature('  SMITH-njigba ?? ', derived.teams) == question_signature('smith-Njigba', derived.teams)
+
+def test_cache_miss_answers_the_typed_question(derived):
+    from views.assistant import cached_answer
+
+    question = 'Smith-Njigba?'
+    response = cached_answer(question_signature(question, derived.teams), ('test', 0, 'DraftKings'), question, derived)
+    assert '**Jaxon Smith-Njigba**' in response
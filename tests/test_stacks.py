@@ -0,0 +1,50 @@
+# Stack rules: impossible ones fail up front, deep ones solve per QB team and
+# still match the HiGHS integer program
+
+import numpy as np
+import pytest
+
+from optimizer import (BRING_BACK_POSITIONS, STACK_POSITIONS, LineupModel, StackRules, TeamStackModel, build_model,
+                       prepare_player_pool, solve_many, stack_rows)
+from synthetic_slate import make_slate
+
+@pytest.fixture(scope='module', params=[0, 1, 2])
+def pool(request):
+    return prepare_player_pool(make_slate(150, seed=request.param))
+
+def meets_rules(pool, players, stacks):
+    lineup = pool.iloc[players]
+    qb = lineup[lineup['position'] == 'QB'].iloc[0]
+    catchers = lineup[(lineup['team'] == qb['team']) & lineup['position'].isin(STACK_POSITIONS)]
+    backs = lineup[(lineup['team'] == qb['opponent']) & lineup['position'].isin(BRING_BACK_POSITIONS)]
+    most = lineup['team'].value_counts().max()
+    return (len(catchers) >= stacks.qb_stack and len(backs) >= stacks.bring_back
+            and (stacks.max_per_team is None or most <= stacks.max_per_team))
+
+@pytest.mark.parametrize('qb_stack, bring_back, max_per_team', [(2, 0, 2), (3, 1, 3), (1, 3, 2)])
+def test_rules_no_lineup_can_meet_raise(qb_stack, bring_back, max_per_team):
+    with pytest.raises(ValueError):
+        StackRules(qb_stack, bring_back, max_per_team)
+
+@pytest.mark.parametrize('stacks', [StackRules(3, 2, 4), StackRules(2, 2), StackRules(3, 1, 5)], ids=repr)
+def test_deep_stacks_match_milp(pool, stacks):
+    scores = pool['optimizer_score'].to_numpy(dtype=float)
+    model, _ = build_model(pool, stacks=stacks)
+    assert isinstance(model, TeamStackModel)
+    players = [player for player, _ in model.solve(scores)]
+
+    reference = LineupModel(pool['position'].to_numpy(), pool['estimated_salary'].to_numpy(dtype=float))
+    for row in stack_rows(pool, stacks):
+        reference.add_row(*row)
+    expected = reference._solve_milp(scores, frozenset(), frozenset())
+
+    assert meets_rules(pool, players, stacks)
+    assert scores[players].sum() == pytest.approx(scores[expected].sum())
+
+def test_deep_stack_lineups_stay_distinct(pool):
+    stacks = StackRules(3, 2, 4)
+    lineups = [sorted(player for player, _ in selection) for selection in solve_many(pool, 5, stacks=stacks)]
+    assert len(lineups) == 5 and len({tuple(players) for players in lineups}) == 5
+    assert all(meets_rules(pool, players, stacks) for players in lineups)
+    scores = pool['optimizer_score'].to_numpy(dtype=float)
+    assert np.all(np.diff([scores[players].sum() for players in lineups]) <= 1e-9)
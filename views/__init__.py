@@ -0,0 +1,38 @@
+# PAGE VIEWS
+# One module per page, imported the first time that page is opened. A cold
+# start (or a rerun on a table page) only pays for the page on screen:
+# plotly loads with the first chart page, the optimizer/simulation stack
+# with the Lineup Builder or Performance Tracking.
+
+import importlib
+
+# Navigation label -> module in this package (menu order)
+PAGES = {
+    "🔥 Contrarian Opportunities": 'contrarian',
+    "📊 Player Deep Dive": 'deep_dive',
+    "🏈 Lineup Builder": 'lineup_builder',
+    "📈 Analytics Dashboard": 'analytics',
+    "🎯 Tournament Tools": 'tournament',
+    "🌤️ Weather Analysis": 'weather',
+    "⚡ Performance Tracking": 'performance',
+}
+
+class PageContext:
+    """What app.py hands every page: the platform's data and the sidebar settings
+
+    data_key is (data version, live ownership sequence, platform): what
+    shared_compute results for this data are keyed on.
+    """
+
+    def __init__(self, derived, rules, salary_cap, version, history=None, data_key=None):
+        self.derived = derived
+        self.df = derived.frame
+        self.rules = rules
+        self.salary_cap = salary_cap
+        self.version = version
+        self.history = history
+        self.data_key = data_key or (version, 0, rules.data_platform)
+
+def render_page(page, ctx):
+    """Import the page's module (once per process) and render it"""
+    importlib.import_module(f'{__name__}.{PAGES[page]}').render(ctx)
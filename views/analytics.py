@@ -0,0 +1,68 @@
+# ANALYTICS DASHBOARD PAGE
+# Ownership by position, play type mix and salary-vs-points value charts.
+
+import streamlit as st
+
+from charts import box_figure, cached_figure, play_type_pie, value_scatter
+
+def render(ctx):
+    """Analytics Dashboard page"""
+    df, derived = ctx.df, ctx.derived
+
+    st.markdown("## 📈 Advanced Analytics Dashboard")
+    
+    # Page explanation
+    st.markdown("""
+    **What this page shows:** Visual analysis of ownership patterns, scoring opportunities, and market inefficiencies.
+    
+    **Key Insights:**
+    - Ownership distribution by position
+    - Value opportunities across salary ranges  
+    - Contrarian score analysis
+    - Position-specific trends
+    """)
+    
+    if len(df) > 0:
+        # Key metrics row
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            avg_ownership = df['ownership_pct'].mean()
+            st.metric("Avg Ownership", f"{avg_ownership:.1f}%")
+        
+        with col2:
+            smash_count = derived.play_type_counts.get('SMASH_PLAY', 0)
+            st.metric("SMASH Plays", smash_count)
+        
+        with col3:
+            leverage_count = derived.play_type_counts.get('LEVERAGE_PLAY', 0)
+            st.metric("LEVERAGE Plays", leverage_count)
+        
+        with col4:
+            chalk_count = derived.play_type_counts.get('CHALK_PLAY', 0)
+            st.metric("CHALK Plays", chalk_count)
+        
+        # Charts
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            # Ownership by position
+            if 'position' in df.columns:
+                fig_pos = cached_figure(ctx, 'ownership_by_position', (), lambda: box_figure(
+                    df, 'position', 'ownership_pct', "Ownership Distribution by Position"))
+                st.plotly_chart(fig_pos, use_container_width=True)
+        
+        with col2:
+            # Play type distribution
+            fig_pie = cached_figure(ctx, 'play_type_pie', (), lambda: play_type_pie(df))
+            st.plotly_chart(fig_pie, use_container_width=True)
+        
+        # Value analysis
+        st.markdown("### 💰 Value Analysis")
+        if all(col in df.columns for col in ['estimated_salary', 'projected_points']):
+            # 'value' (points per $1K) is precomputed on the shared frame
+            fig_value = cached_figure(ctx, 'value_scatter', (), lambda: value_scatter(df))
+            st.plotly_chart(fig_value, use_container_width=True)
+    
+    else:
+        st.info("📊 Load data to view analytics dashboard")
@@ -0,0 +1,162 @@
+# AI ASSISTANT
+# The question box at the top of every page. Answers are only worked out
+# when there's a question, from the platform's current slate: questions
+# about players or player lists go to qa_engine, strategy questions get the
+# written explanations below.
+#
+# Answers are cached server-wide by normalized question and data key (data
+# version, live ownership sequence, platform), so everyone asking "Lamar vs
+# Allen" on the same slate shares one answer, and a new fantasy_data.csv or
+# ownership update gets fresh ones.
+
+import streamlit as st
+
+from metrics import counted_cache, timer
+from qa_engine import answer_question, question_signature
+
+# Answers kept across sessions (least recently used go first)
+ANSWER_CACHE_SIZE = 512
+
+def answer(question, derived):
+    """Response markdown for a user question"""
+    with timer('assistant_seconds'):
+        response = answer_question(question, derived)
+    if response is not None:
+        return response
+
+    df = derived.frame
+    question_lower = question.lower()
+    
+    if any(word in question_lower for word in ["smash", "leverage", "chalk", "play type"]):
+        response = """🎯 **Fantasy Play Types Explained:**
+
+**🔥 SMASH PLAY:** Elite players (top 3 rank) with low ownership (under 15%). These are premium tournament plays - you get elite production that most people are missing.
+
+**⚡ LEVERAGE PLAY:** Solid players (top 5 rank) with moderate ownership (15-20%). Good contrarian value without being too risky.
+
+**📍 CHALK PLAY:** Highly ranked players with high ownership (25%+). Safe for cash games but avoid in tournaments since everyone has them.
+
+**Strategy:** Use SMASH plays in tournaments for differentiation. Use CHALK in cash games for safety. LEVERAGE plays are your middle ground."""
+
+    elif any(word in question_lower for word in ["contrarian", "best plays", "who should"]):
+        if len(df) > 0:
+            smash_plays = derived.view(play_types=['SMASH_PLAY'], by_contrarian=True).head(3)
+            if len(smash_plays) > 0:
+                response = "🔥 **This Week's Best Contrarian Plays:**\n\n"
+                for _, player in smash_plays.iterrows():
+                    response += f"• **{player['player_name']}** ({player['position']}) - Rank #{player['player_rank']}, {player['ownership_pct']:.1f}% owned\n"
+                response += "\n💡 These are elite players that most people are sleeping on!"
+            else:
+                response = "📊 No clear SMASH plays identified in current data. Look for top-5 players under 15% ownership."
+        else:
+            response = "📊 Load your fantasy data to see personalized contrarian recommendations!"
+
+    elif any(word in question_lower for word in ["stacking", "correlation", "qb wr"]):
+        response = """🔗 **Stacking Strategy Guide:**
+
+**Same-Game Stacking:** Play QB + WR/TE from same team
+- ✅ High correlation (QB success = WR success)
+- ✅ Ceiling play for tournaments
+- ❌ Higher risk if team struggles
+
+**Game Stacking:** Play players from both teams in high-scoring games
+- ✅ Benefits from pace and total points
+- ✅ Lower correlation risk
+- ✅ Works in all game types
+
+**Best Practices:**
+- Stack in tournaments, not cash games
+- Target games with 48+ point totals
+- Consider weather for outdoor games"""
+
+    elif any(word in question_lower for word in ["weather", "wind", "rain", "outdoor"]):
+        response = """🌤️ **Weather Impact Analysis:**
+
+**High Wind (15+ mph):**
+- ❌ Avoid passing games
+- ✅ Target running backs
+- ❌ Kickers struggle with accuracy
+
+**Rain/Snow:**
+- ❌ Passing efficiency drops
+- ✅ More rushing attempts
+- ✅ Defense/ST scoring opportunities
+
+**Temperature:**
+- Cold weather favors running
+- Dome games have consistent conditions
+- Player performance varies by home climate"""
+
+    elif any(word in question_lower for word in ["cash game", "tournament", "gpp", "strategy"]):
+        response = """🏆 **Game Type Strategies:**
+
+**Cash Games (50/50, Double-ups):**
+- ✅ Use CHALK plays for safety
+- ✅ High floor players
+- ✅ Consistent performers
+- ❌ Avoid risky contrarian plays
+
+**Tournaments (GPP):**
+- ✅ Use SMASH and LEVERAGE plays
+- ✅ High ceiling players
+- ✅ Contrarian ownership
+- ✅ Stacking for correlation
+
+**Key Difference:** Cash games reward consistency, tournaments reward uniqueness and ceiling."""
+
+    else:
+        response = """🤖 **I can help you with:**
+
+• **Player Analysis** - "Should I play [player name]?" or "Lamar vs Allen"
+• **Player Lists** - "Best RB under 10% owned", "Cheapest WRs over 15 points"
+• **Strategy Questions** - "What's the best tournament strategy?"
+• **Ownership Questions** - "Who has low ownership this week?"
+• **Play Types** - "Explain SMASH vs LEVERAGE vs CHALK"
+• **Position Analysis** - "Who are the best RB plays?"
+
+**Try asking a specific question about players, strategy, or lineup building!**"""
+    
+    return response
+
+@counted_cache('assistant_answer', st.cache_data(max_entries=ANSWER_CACHE_SIZE))
+def cached_answer(signature, data_key, _question, _derived):
+    """answer() for the question as typed, cached by its signature per data key"""
+    return answer(_question, _derived)
+
+def render(derived, data_key):
+    """Assistant header, sample questions, question box and the answer"""
+    st.markdown("## 🤖 Fantasy AI Assistant")
+    st.markdown("**Ask me anything about fantasy football strategy, player analysis, or lineup decisions!**")
+
+    # Sample questions in expandable section
+    with st.expander("💡 Click here for sample questions you can ask"):
+        st.markdown("""
+        **Strategy Questions:**
+        - What's the difference between SMASH, LEVERAGE, and CHALK plays?
+        - Should I use contrarian strategy in cash games or tournaments?
+        - How do I build a winning DFS lineup?
+    
+        **Player Analysis:**
+        - Who are the best contrarian plays this week?
+        - Should I play Josh Allen or Lamar Jackson?
+        - Which players have elite rankings but low ownership?
+        - Best RB under 10% owned
+        - Top 5 value plays under $6,000
+    
+        **Advanced Questions:**
+        - How does weather affect player performance?
+        - What's the best QB/WR stacking strategy?
+        - How do I identify leverage plays in tournaments?
+        """)
+
+    # Chat interface with unique key
+    user_question = st.text_input("💬 Ask your question here:", placeholder="e.g., Who are the best contrarian plays this week?", key="main_ai_chat")
+    
+    if user_question:
+        response = cached_answer(question_signature(user_question, derived.teams), data_key, user_question, derived)
+        
+        # Display response in a nice container
+        st.markdown("---")
+        st.markdown("### 🤖 AI Response:")
+        st.markdown(response)
+        st.markdown("---")
@@ -0,0 +1,49 @@
+# CONTRARIAN OPPORTUNITIES PAGE
+# Elite-rank, low-ownership plays, filtered by position/play type/ownership.
+
+import streamlit as st
+
+from shared_compute import shared
+from tables import player_table, render_player_table
+
+def render(ctx):
+    """Contrarian Opportunities page"""
+    df, derived = ctx.df, ctx.derived
+
+    st.markdown("## 🔥 This Week's Contrarian Opportunities")
+    
+    # Page explanation
+    st.markdown("""
+    **What this page shows:** Players with the best combination of elite rankings and low ownership.
+    
+    **Key Terms:**
+    - **🔥 SMASH PLAY:** Top 3 ranked player with under 15% ownership - elite with low ownership
+    - **⚡ LEVERAGE PLAY:** Top 5 ranked player with 15-20% ownership - good player, medium ownership  
+    - **📍 CHALK PLAY:** Highly ranked but 25%+ owned - everyone will use them
+    - **😐 NEUTRAL:** Standard play with typical ownership for their ranking
+    
+    **Strategy:** Use SMASH and LEVERAGE plays in tournaments. Avoid CHALK in GPP unless they're in a perfect spot.
+    """)
+    
+    if len(df) > 0:
+        # Filters
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            position_filter = st.selectbox("📍 Position", ["All", "QB", "RB", "WR", "TE"], key="pos_filter_contrarian")
+        with col2:
+            play_type_filter = st.selectbox("🎯 Play Type", ["All", "SMASH_PLAY", "LEVERAGE_PLAY", "CHALK_PLAY", "NEUTRAL"], key="play_type_filter_contrarian")
+        with col3:
+            ownership_filter = st.slider("📊 Max Ownership %", 0, 50, 25, key="ownership_filter_contrarian")
+        
+        # Apply filters (views come pre-sorted by contrarian score); built once per filter combo for every session
+        table = shared(ctx, 'contrarian_table', (position_filter, play_type_filter, ownership_filter),
+                       lambda: player_table(derived.contrarian_view(position_filter, play_type_filter, ownership_filter)))
+        
+        # Display top opportunities
+        st.markdown("### 🎯 Top Contrarian Opportunities")
+        
+        # Full filtered slate in one table (no 10-row cap)
+        render_player_table(None, key="contrarian_table", table=table)
+    
+    else:
+        st.info("📊 Load your fantasy data to see contrarian opportunities")
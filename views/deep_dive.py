@@ -0,0 +1,138 @@
+# PLAYER DEEP DIVE PAGE
+# One player's metrics and recommendation, a side-by-side comparison, and
+# the ownership-vs-rank landscape chart.
+
+import streamlit as st
+
+from charts import cached_figure, landscape_figure
+
+def search_options(derived, query):
+    """Index matches for a search box, or the first names (with a note) when nothing matches"""
+    options = derived.players.search(query)
+    if not options:
+        st.info(f"No players match '{query}'")
+        options = derived.players.search("")
+    return options
+
+def render(ctx):
+    """Player Deep Dive page"""
+    df, derived = ctx.df, ctx.derived
+
+    st.markdown("## 📊 Player Deep Dive Analysis")
+    
+    # Page explanation
+    st.markdown("""
+    **What this page shows:** Detailed analysis for individual players and how they compare to the field.
+    
+    **How to use:** Select a player to see their ranking, ownership, value metrics, and how they compare to other options at their position.
+    """)
+    
+    if len(df) > 0:
+        # Typeahead over the player index - only matching names go into the widgets.
+        # Each selectbox has its own search so typing in one never resets the other
+        col1, col2 = st.columns(2)
+        with col1:
+            player_search = st.text_input("🔎 Search players", key="player_search_deepdive",
+                                          placeholder="Start typing a first or last name")
+            selected_player = st.selectbox("Choose a player:", search_options(derived, player_search),
+                                           key="player_selector_deepdive")
+        with col2:
+            compare_search = st.text_input("🔎 Search comparison", key="compare_search_deepdive",
+                                           placeholder="Start typing a first or last name")
+            compare_player = st.selectbox("Compare with:", ["None"] + search_options(derived, compare_search),
+                                          key="compare_player_deepdive")
+        
+        player_data = derived.player(selected_player)
+        
+        # Player metrics
+        st.markdown(f"### 📊 {selected_player} Analysis")
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Expert Rank", f"#{int(player_data['player_rank'])}")
+        with col2:
+            st.metric("Ownership", f"{player_data['ownership_pct']:.1f}%")
+        with col3:
+            st.metric("Projected Points", f"{player_data['projected_points']:.1f}")
+        with col4:
+            st.metric("Contrarian Score", f"{player_data['contrarian_score']:.1f}")
+        
+        # Player recommendation
+        st.markdown("### 🎯 Recommendation")
+        if player_data['play_type'] == 'SMASH_PLAY':
+            st.success(f"🔥 SMASH PLAY: Elite rank #{int(player_data['player_rank'])} player with only {player_data['ownership_pct']:.1f}% ownership!")
+        elif player_data['play_type'] == 'LEVERAGE_PLAY':
+            st.info(f"⚡ LEVERAGE PLAY: Solid rank #{int(player_data['player_rank'])} option at {player_data['ownership_pct']:.1f}% ownership")
+        elif player_data['play_type'] == 'CHALK_PLAY':
+            st.warning(f"📍 CHALK PLAY: High ownership ({player_data['ownership_pct']:.1f}%) - use in cash games")
+        else:
+            st.info(f"😐 NEUTRAL: Standard play for rank #{int(player_data['player_rank'])}")
+        
+        # Player comparison
+        if compare_player != "None":
+            st.markdown("### ⚖️ Player Comparison")
+            compare_data = derived.player(compare_player)
+            
+            comp_col1, comp_col2 = st.columns(2)
+            
+            with comp_col1:
+                st.markdown(f"**{selected_player}**")
+                st.metric("Rank", f"#{int(player_data['player_rank'])}")
+                st.metric("Ownership", f"{player_data['ownership_pct']:.1f}%")
+                st.metric("Points", f"{player_data['projected_points']:.1f}")
+                
+            with comp_col2:
+                st.markdown(f"**{compare_player}**")
+                st.metric("Rank", f"#{int(compare_data['player_rank'])}")
+                st.metric("Ownership", f"{compare_data['ownership_pct']:.1f}%")
+                st.metric("Points", f"{compare_data['projected_points']:.1f}")
+        
+        # Enhanced scatter plot with robust data validation
+        st.markdown("### 📊 Fantasy Landscape Visualization")
+        
+        try:
+            # Check if all required columns exist
+            required_cols = ['player_rank', 'ownership_pct', 'play_type', 'contrarian_score']
+            
+            if all(col in df.columns for col in required_cols):
+                # Clean numeric rows with a known play type (prepared once per data version)
+                plot_df = derived.plot_frame
+                
+                if len(plot_df) > 0:
+                    # Build hover data safely
+                    hover_cols = ['player_name']
+                    if 'matchup_rating' in df.columns:
+                        hover_cols.append('matchup_rating')
+                    
+                    # Built once per data version (big slates are thinned / drawn with WebGL)
+                    fig = cached_figure(ctx, 'fantasy_landscape', tuple(hover_cols),
+                                        lambda: landscape_figure(plot_df, hover_cols))
+                    
+                    st.plotly_chart(fig, use_container_width=True)
+                    
+                    # Add interpretation
+                    st.markdown("""
+                    **How to read this chart:**
+                    - **Bottom left** = Low rank + Low ownership = 🔥 SMASH plays
+                    - **Top left** = Low rank + High ownership = 📍 CHALK plays  
+                    - **Bottom right** = High rank + Low ownership = ⚡ LEVERAGE plays
+                    - **Size** = Contrarian score (bigger = more contrarian value)
+                    """)
+                else:
+                    st.warning("⚠️ No valid data available for visualization after cleaning")
+            else:
+                missing_cols = [col for col in required_cols if col not in df.columns]
+                st.info(f"📊 Visualization requires columns: {', '.join(missing_cols)}")
+                
+        except Exception as e:
+            st.error("📊 Unable to create visualization")
+            st.info("This chart requires clean numerical data for rankings, ownership, and scores")
+            
+            # Show debug info in expander
+            with st.expander("🔧 Debug Information"):
+                st.write("Available columns:", list(df.columns))
+                st.write("Data types:", df.dtypes)
+                st.write("Sample data:", df.head())
+    
+    else:
+        st.info("📊 Load player data to enable deep dive analysis")
@@ -0,0 +1,331 @@
+# LINEUP BUILDER PAGE
+# Single, multi-lineup and randomized optimizer runs with stacking, exposure
+# and simulated-field controls. The last lineups built are only archived for
+# backtests when marked as played (same as history_store.py --lineups).
+
+import os
+import secrets
+import sqlite3
+
+import streamlit as st
+
+from optimizer import MAX_LINEUPS, StackRules, generate_lineups, lineup_exposure, lineups_to_dk_csv, optimize_lineup
+from randomized import DEFAULT_DRAWS, DRAW_OPTIONS, draw_exposure, randomized_lineups
+from shared_compute import shared
+from simulation import build_field, simulate_slate
+
+def keep_built(ctx, lineups_df):
+    """Remember the lineups just built so they can be marked as played on a later rerun"""
+    st.session_state['built_lineups'] = (ctx.version, ctx.rules.name, lineups_df)
+
+def render_mark_played(ctx):
+    """Button that saves the last lineups built as this week's played lineups for the contest format"""
+    built = st.session_state.get('built_lineups')
+    if ctx.history is None or ctx.version == 'missing' or built is None or built[:2] != (ctx.version, ctx.rules.name):
+        return
+    lineups_df = built[2]
+    if st.button(f"📌 Mark {lineups_df['lineup_id'].nunique()} as played", key="mark_played_button",
+                 help=f"Saves them as this week's {ctx.rules.name} lineups for backtesting (replaces any saved before)"):
+        try:
+            count = ctx.history.record_lineups(lineups_df, platform=ctx.rules.data_platform, contest=ctx.rules.name)
+            st.success(f"📚 Saved {count} {ctx.rules.name} lineups to history for backtesting")
+        except sqlite3.Error as e:
+            st.error(f"Couldn't save lineups: {e}")
+
+def simulated_field(df, field_size, salary_cap, rules):
+    """Opponent field for the lineup odds, or None (with a warning) when this pool can't make one"""
+    try:
+        return build_field(df, field_size, salary_cap=salary_cap, roster_slots=rules.roster_slots)
+    except ValueError as e:
+        st.warning(f"⚠️ Simulated field skipped: {e}")
+        return None
+
+def render(ctx):
+    """Lineup Builder page"""
+    df, derived, rules, salary_cap_pref = ctx.df, ctx.derived, ctx.rules, ctx.salary_cap
+
+    st.markdown("## 🏈 AI Lineup Builder")
+    
+    # Page explanation
+    st.markdown("""
+    **What this page shows:** Recommended lineups based on different DFS strategies.
+    
+    **Strategy Types:**
+    - **🏆 Tournament (GPP):** Focuses on contrarian ownership and high ceiling
+    - **💰 Cash Game:** Prioritizes high floor and safe plays
+    - **🎯 Ultra Contrarian:** Maximum differentiation for large tournaments
+    
+    **How to use:** Select your strategy, set constraints, and let the AI build optimal lineups.
+    """)
+    
+    if len(df) > 0:
+        # Strategy selection
+        col1, col2 = st.columns(2)
+        with col1:
+            strategy = st.selectbox("Strategy", ["Tournament (GPP)", "Cash Game", "Ultra Contrarian"], key="strategy_selector_lineup")
+        with col2:
+            enable_stacking = st.checkbox("Enable QB/WR Stacking", value=True, key="stacking_checkbox",
+                                          disabled=not derived.has_teams,
+                                          help=None if derived.has_teams else "Needs team/opponent columns in the data")
+        
+        # Stack rules (enforced by the solver)
+        stacking = False
+        if enable_stacking and derived.has_teams:
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                qb_stack = st.number_input("QB Pass-Catchers", min_value=0, max_value=3, value=1, step=1, key="qb_stack",
+                                           help="WR/TE from the QB's team in every lineup")
+            with col2:
+                bring_back = st.number_input("Bring-Back", min_value=0, max_value=2, value=0, step=1, key="bring_back",
+                                             help="RB/WR/TE from the QB's opponent")
+            with col3:
+                # Room for the QB plus its stack, and for the bring-back
+                fewest = max(2, qb_stack + 1, bring_back)
+                max_per_team = st.number_input("Max Per Team", min_value=fewest, max_value=rules.roster_size,
+                                               value=max(fewest, rules.roster_size - 1 if rules.has_captain else 4),
+                                               step=1, key=f"max_per_team_{rules.name}")
+            stacking = StackRules(qb_stack, bring_back, max_per_team)
+        
+        # Player constraints - options come from the index search, plus whoever is already picked
+        # so narrowing the search never drops a selection
+        constraint_search = st.text_input("🔎 Find players to include or exclude", key="constraint_search",
+                                          placeholder="Start typing a first or last name")
+        matches = derived.players.search(constraint_search)
+        if not matches:
+            st.info(f"No players match '{constraint_search}'")
+        col1, col2 = st.columns(2)
+        with col1:
+            picked = st.session_state.get("must_include_players", [])
+            must_include = st.multiselect("Must Include Players", list(dict.fromkeys(picked + matches)),
+                                          key="must_include_players")
+        with col2:
+            picked = st.session_state.get("exclude_players", [])
+            exclude_players = st.multiselect("Exclude Players", list(dict.fromkeys(picked + matches)),
+                                             key="exclude_players")
+        
+        # Multi-lineup settings
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            n_lineups = st.number_input("Number of Lineups", min_value=1, max_value=MAX_LINEUPS, value=1, step=1, key="n_lineups")
+        with col2:
+            min_unique = st.slider("Min Unique Players", 1, 4, 2, key="min_unique_players",
+                                   help="Each lineup differs from every other by at least this many players")
+        with col3:
+            max_exposure = st.slider("Max Exposure %", 10, 100, 100, step=5, key="max_exposure_pct",
+                                     help="Most lineups a single player can appear in (must-includes are exempt)")
+        col1, col2 = st.columns(2)
+        with col1:
+            parallel = st.checkbox(f"⚡ Parallel generation ({os.cpu_count() or 1} cores)", value=False, key="parallel_lineups",
+                                   help="Split large lineup runs across CPU cores")
+        with col2:
+            # The field/outcome sims don't model captain multipliers, so they're classic-only
+            field_size = st.selectbox("🎲 Simulated Opponent Field", [0, 10000, 50000, 100000], index=0,
+                                      format_func=lambda n: "Off" if n == 0 else f"{n:,} entries", key="field_size",
+                                      disabled=rules.has_captain,
+                                      help="Score lineups against opponents drawn from projected ownership")
+            if rules.has_captain:
+                field_size = 0
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            randomize = st.checkbox("🎲 Randomized projections", value=False, key="randomized_mode",
+                                    help="Re-solve under hundreds of perturbed projections and see how often each player is optimal")
+        with col2:
+            n_draws = st.selectbox("Draws", DRAW_OPTIONS, index=DRAW_OPTIONS.index(DEFAULT_DRAWS),
+                                   format_func=lambda n: f"{n:,}", key="randomized_draws", disabled=not randomize,
+                                   help="Each draw is a full re-solve; stacking makes them several times slower")
+        with col3:
+            randomness = st.slider("Randomness %", 10, 150, 100, step=10, key="randomness_pct", disabled=not randomize,
+                                   help="Scales the position-specific projection and ownership noise")
+        
+        # Optimizer runs are shared by every session asking for the same settings on this slate
+        run_key = (rules.name, strategy, salary_cap_pref, repr(stacking), frozenset(must_include), frozenset(exclude_players))
+        
+        # Lineup optimization section
+        if len(df) > 0:
+            col3, col4 = st.columns([2, 1])
+            with col4:
+                optimize_clicked = st.button("🚀 Optimize Lineup", key="optimize_button")
+                if optimize_clicked and randomize:
+                    with st.spinner(f"Re-solving {n_draws:,} perturbed slates..."):
+                        # Each session gets its own draws (one seed per session, so its reruns reuse them)
+                        seed = st.session_state.setdefault('randomized_seed', secrets.randbits(32))
+                        progress_bar = st.progress(0.0)
+                        drawn_df = shared(ctx, 'randomized_lineups', run_key + (n_draws, randomness, seed), lambda: randomized_lineups(
+                            df, strategy, n_draws, salary_cap_pref, randomness / 100,
+                            must_include=must_include, exclude=exclude_players,
+                            pool=derived.player_pool(strategy), platform=rules, seed=seed, stacking=stacking,
+                            progress=lambda done, total: progress_bar.progress(done / total, text=f"{done:,} / {total:,} draws")))
+                        progress_bar.empty()
+                        
+                        if 'Error' in drawn_df.columns:
+                            st.error(drawn_df['Error'].iloc[0])
+                        else:
+                            distinct = drawn_df['lineup_id'].nunique()
+                            st.success(f"✅ {n_draws:,} draws produced {distinct:,} distinct optimal lineups")
+                            
+                            # Most frequently optimal lineups first
+                            st.markdown(f"### 🏆 Top {min(n_lineups, distinct)} Lineups")
+                            lineups_df = drawn_df[drawn_df['lineup_id'] <= n_lineups]
+                            summary_df = lineups_df.groupby('lineup_id').agg(
+                                Draws=('draws', 'first'),
+                                Salary=('estimated_salary', 'sum'),
+                                Projected=('projected_points', 'sum'),
+                                Players=('player_name', ', '.join),
+                            ).reset_index().rename(columns={'lineup_id': 'Lineup'})
+                            summary_df.insert(2, 'Optimal %', (summary_df['Draws'] / n_draws * 100).round(1))
+                            st.dataframe(summary_df, use_container_width=True)
+                            
+                            st.markdown("### 📊 Exposure Across Draws")
+                            exposure_df = draw_exposure(drawn_df, rules).rename(columns={
+                                'player_name': 'Player', 'position': 'Pos', 'draws': 'Draws', 'exposure_pct': 'Exposure %',
+                                'captain_pct': f'{rules.captain_slot} %',
+                            })
+                            st.dataframe(exposure_df, use_container_width=True)
+                            
+                            st.download_button(
+                                f"📥 Download {rules.name} CSV",
+                                lineups_to_dk_csv(lineups_df, roster_slots=rules.roster_slots),
+                                file_name=f"{rules.name.lower().replace(' ', '_')}_lineups.csv",
+                                mime="text/csv",
+                                key="download_randomized_csv",
+                            )
+                            keep_built(ctx, lineups_df)
+                elif optimize_clicked and n_lineups > 1:
+                    with st.spinner(f"Building {n_lineups} lineups..."):
+                        # Parallel only changes how fast it's built, so it isn't part of the key
+                        lineups_df = shared(ctx, 'generate_lineups', run_key + (n_lineups, min_unique, max_exposure), lambda: generate_lineups(
+                            df, strategy, n_lineups, salary_cap_pref, min_unique, max_exposure / 100,
+                            must_include=must_include, exclude=exclude_players,
+                            workers=(os.cpu_count() or 1) if parallel else 1,
+                            pool=derived.player_pool(strategy), platform=rules, stacking=stacking))
+                        
+                        if 'Error' in lineups_df.columns:
+                            st.error(lineups_df['Error'].iloc[0])
+                        else:
+                            built = lineups_df['lineup_id'].nunique()
+                            if built < n_lineups:
+                                st.warning(f"⚠️ Only {built} lineups satisfy the uniqueness and exposure settings")
+                            else:
+                                st.success(f"✅ {built} lineups optimized!")
+                            
+                            # One row per lineup
+                            summary_df = lineups_df.groupby('lineup_id').agg(
+                                Salary=('estimated_salary', 'sum'),
+                                Projected=('projected_points', 'sum'),
+                                Players=('player_name', ', '.join),
+                            ).reset_index().rename(columns={'lineup_id': 'Lineup'})
+                            
+                            lineups = [group['player_name'].tolist() for _, group in lineups_df.groupby('lineup_id')]
+                            field = simulated_field(df, field_size, salary_cap_pref, rules) if field_size else None
+                            if field is not None:
+                                # Enter each lineup into a simulated ownership-based field
+                                sim = simulate_slate(df, n_sims=1000)
+                                odds = sim.score_against_field(lineups, field)
+                                summary_df['Avg Finish'] = odds['avg_finish'].round(0).astype(int).to_numpy()
+                                summary_df['Field Dupes'] = odds['field_dupes'].to_numpy()
+                            elif not rules.has_captain:
+                                # Simulated outcomes: each lineup's odds of topping the set / finishing top 20%
+                                sim = simulate_slate(df[df['player_name'].isin(lineups_df['player_name'])], n_sims=10000)
+                                odds = sim.lineup_probabilities(lineups)
+                            if not rules.has_captain:
+                                summary_df['Sim Avg'] = odds['sim_mean'].round(1).to_numpy()
+                                summary_df['Win %'] = odds['win_pct'].round(2).to_numpy()
+                                summary_df['Top 20 %'] = odds['cash_pct'].round(1).to_numpy()
+                            st.dataframe(summary_df, use_container_width=True)
+                            
+                            st.markdown("### 📊 Player Exposure")
+                            exposure_df = lineup_exposure(lineups_df, rules).rename(columns={
+                                'player_name': 'Player', 'position': 'Pos', 'lineups': 'Lineups', 'exposure_pct': 'Exposure %',
+                                'captain_pct': f'{rules.captain_slot} %',
+                            })
+                            st.dataframe(exposure_df, use_container_width=True)
+                            
+                            st.download_button(
+                                f"📥 Download {rules.name} CSV",
+                                lineups_to_dk_csv(lineups_df, roster_slots=rules.roster_slots),
+                                file_name=f"{rules.name.lower().replace(' ', '_')}_lineups.csv",
+                                mime="text/csv",
+                                key="download_dk_csv",
+                            )
+                            st.caption(f"Players are listed by name; map them to {rules.data_platform} IDs before bulk upload.")
+                            keep_built(ctx, lineups_df)
+                elif optimize_clicked:
+                    with st.spinner("Building optimal lineup..."):
+                        lineup_df = shared(ctx, 'optimize_lineup', run_key, lambda: optimize_lineup(
+                            df, strategy, salary_cap_pref, stacking,
+                            must_include=must_include, exclude=exclude_players,
+                            pool=derived.player_pool(strategy), platform=rules))
+                        
+                        if 'Error' in lineup_df.columns:
+                            st.error(lineup_df['Error'].iloc[0])
+                        else:
+                            st.success("✅ Lineup optimized!")
+                            keep_built(ctx, lineup_df.assign(lineup_id=1))
+                            
+                            # Display lineup table with safe column access
+                            available_cols = []
+                            col_mapping = {}
+                            
+                            # Check which columns are available and build the display
+                            if 'roster_slot' in lineup_df.columns:
+                                available_cols.append('roster_slot')
+                                col_mapping['roster_slot'] = 'Slot'
+                            
+                            if 'player_name' in lineup_df.columns:
+                                available_cols.append('player_name')
+                                col_mapping['player_name'] = 'Player'
+                            
+                            if 'position' in lineup_df.columns:
+                                available_cols.append('position')
+                                col_mapping['position'] = 'Pos'
+                            
+                            if derived.has_teams:
+                                available_cols += ['team', 'opponent']
+                                col_mapping.update({'team': 'Team', 'opponent': 'Opp'})
+                            
+                            numeric_cols = ['player_rank', 'ownership_pct', 'projected_points', 'estimated_salary', 'play_type']
+                            for col in numeric_cols:
+                                if col in lineup_df.columns:
+                                    available_cols.append(col)
+                                    col_mapping[col] = col.replace('_', ' ').title()
+                            
+                            if available_cols:
+                                display_df = lineup_df[available_cols].copy()
+                                
+                                # Rename columns for better display
+                                display_df = display_df.rename(columns=col_mapping)
+                                
+                                st.dataframe(display_df, use_container_width=True)
+                                
+                                # Show lineup summary
+                                total_salary = lineup_df['estimated_salary'].sum() if 'estimated_salary' in lineup_df.columns else 0
+                                total_points = lineup_df['projected_points'].sum() if 'projected_points' in lineup_df.columns else 0
+                                
+                                col1, col2, col3 = st.columns(3)
+                                with col1:
+                                    st.metric("💰 Total Salary", f"${total_salary:,.0f}")
+                                with col2:
+                                    st.metric("📊 Projected Points", f"{total_points:.1f}")
+                                with col3:
+                                    st.metric("💵 Remaining", f"${salary_cap_pref - total_salary:,.0f}")
+
+                                field = simulated_field(df, field_size, salary_cap_pref, rules) if field_size else None
+                                if field is not None:
+                                    sim = simulate_slate(df, n_sims=1000)
+                                    odds = sim.score_against_field([lineup_df['player_name'].tolist()], field).iloc[0]
+
+                                    col1, col2, col3 = st.columns(3)
+                                    with col1:
+                                        st.metric("🏁 Avg Finish", f"{odds['avg_finish']:,.0f} / {len(field) + 1:,}")
+                                    with col2:
+                                        st.metric("💵 Top 20 %", f"{odds['cash_pct']:.1f}%")
+                                    with col3:
+                                        st.metric("👯 Field Duplicates", f"{int(odds['field_dupes']):,}")
+                            else:
+                                st.error("Unable to display lineup - missing required columns")
+                render_mark_played(ctx)
+        else:
+            st.info("📊 Please ensure you have valid player data to optimize lineups")
+    
+    else:
+        st.info("📊 Load player data to enable lineup optimization")
@@ -0,0 +1,65 @@
+# TOURNAMENT TOOLS PAGE
+# Play recommendations for each contest field size.
+
+import streamlit as st
+
+from shared_compute import shared
+from tables import player_table, render_player_table
+
+# Small fields treat chalk as the safe core
+SAFE_LABELS = {'CHALK_PLAY': '📍 SAFE PLAY'}
+
+def render(ctx):
+    """Tournament Tools page"""
+    df, derived = ctx.df, ctx.derived
+
+    st.markdown("## 🎯 Tournament Strategy Tools")
+    
+    # Page explanation
+    st.markdown("""
+    **What this page shows:** Advanced tournament strategy based on field size and prize structure.
+    
+    **Field Size Strategy:**
+    - **Large Field (10K+):** Maximum contrarian plays needed
+    - **Mid Field (1K-10K):** Balanced approach with some contrarian
+    - **Small Field (<1K):** Safer plays with selective contrarian spots
+    """)
+    
+    # Tournament strategy selector
+    tournament_type = st.selectbox("Tournament Type", 
+                                  ["Large Field GPP (10K+ entries)", "Mid-Field Tournament (1K-10K)", "Small Field (Under 1K)", "Single Entry Max"],
+                                  key="tournament_type_selector")
+    
+    if len(df) > 0:
+        # Strategy recommendations based on field size
+        if "Large Field" in tournament_type:
+            st.markdown("### 🎯 Large Field Strategy")
+            st.info("🔥 Go FULL contrarian - you need maximum differentiation!")
+            
+            play_types = ['SMASH_PLAY', 'LEVERAGE_PLAY']
+            
+        elif "Mid-Field" in tournament_type:
+            st.markdown("### ⚡ Mid-Field Strategy") 
+            st.info("🎯 Balanced approach - mix safe plays with contrarian spots")
+            
+            play_types = ['CHALK_PLAY', 'SMASH_PLAY']
+            
+        else:
+            st.markdown("### 💰 Small Field Strategy")
+            st.info("📍 Safer approach - use chalk with 1-2 contrarian spots")
+            
+            play_types = ['CHALK_PLAY', 'LEVERAGE_PLAY']
+        
+        # Same recommendations for everyone on this slate, so they're built once per tournament type
+        recommended_plays = shared(ctx, 'tournament_table', tuple(play_types),
+                                   lambda: player_table(derived.view(play_types=play_types, by_contrarian=True),
+                                                        SAFE_LABELS, notes=False))
+        
+        # Display recommendations
+        if len(recommended_plays) > 0:
+            st.markdown("### 🏆 Recommended Strategy")
+            
+            render_player_table(None, key="tournament_table", table=recommended_plays)
+    
+    else:
+        st.info("📊 Load tournament data to see strategy recommendations")
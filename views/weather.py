@@ -0,0 +1,89 @@
+# WEATHER ANALYSIS PAGE
+# This week's game conditions and the players in the games they affect.
+
+import pandas as pd
+import streamlit as st
+
+from data_loader import game_key
+
+def render(ctx):
+    """Weather Analysis page"""
+    df, derived = ctx.df, ctx.derived
+
+    st.markdown("## 🌤️ Weather Impact Analysis")
+    
+    # Page explanation
+    st.markdown("""
+    **What this page shows:** How weather conditions affect player performance and strategy.
+    
+    **Weather Factors:**
+    - **Wind:** Affects passing accuracy and kicking
+    - **Precipitation:** Reduces passing efficiency, increases fumbles
+    - **Temperature:** Extreme cold favors running games
+    - **Dome vs Outdoor:** Consistent conditions vs weather variables
+    """)
+    
+    # Sample weather data (in real app, this would come from weather API)
+    weather_data = {
+        'game': ['KC @ BUF', 'GB @ MIN', 'MIA @ NE', 'LAR @ SEA'],
+        'team': ['KC', 'GB', 'MIA', 'LAR'],
+        'opponent': ['BUF', 'MIN', 'NE', 'SEA'],
+        'conditions': ['Clear', 'Dome', 'Snow', 'Rain'],
+        'temperature': [45, 72, 28, 52],
+        'wind': [12, 0, 8, 18],
+        'precipitation': [0, 0, 0.2, 0.1]
+    }
+    
+    weather_df = pd.DataFrame(weather_data)
+    
+    st.markdown("### 🌡️ This Week's Weather Report")
+    st.dataframe(weather_df, use_container_width=True)
+    
+    # Weather strategy recommendations
+    st.markdown("### 🎯 Weather-Based Strategy")
+    
+    severe_weather_games = weather_df[weather_df['wind'] > 15]
+    if not severe_weather_games.empty:
+        st.markdown("#### 🌪️ High Wind Games")
+        for _, game in severe_weather_games.iterrows():
+            st.warning(f"⚠️ {game['game']}: {game['wind']} mph winds - Consider RBs over WRs")
+    
+    cold_games = weather_df[weather_df['temperature'] < 35]
+    if not cold_games.empty:
+        st.markdown("#### 🧊 Cold Weather Games")
+        for _, game in cold_games.iterrows():
+            st.info(f"❄️ {game['game']}: {game['temperature']}°F - Favor running attacks")
+    
+    # Show affected players if we have team data
+    if len(df) > 0 and derived.has_teams:
+        st.markdown("### 🏈 Affected Players")
+        
+        for _, game in weather_df.iterrows():
+            if game['wind'] > 15 or game['temperature'] < 35:
+                # Both sides of the game, best contrarian plays first
+                affected_players = derived.view(game=game_key(game['team'], game['opponent']), by_contrarian=True)
+                if len(affected_players) > 0:
+                    st.markdown(f"**{game['game']}** - Weather concerns:")
+                    for _, player in affected_players.head(3).iterrows():
+                        st.write(f"• {player['player_name']} ({player['position']}, {player['team']})")
+    elif len(df) > 0:
+        st.info("🏈 Add team and opponent columns to your data to see which players each game affects")
+    
+    # Weather strategy tips
+    st.markdown("### 💡 Weather Strategy Tips")
+    st.markdown("""
+    **High Wind (15+ mph):**
+    - ✅ Target RBs and short-passing offenses
+    - ❌ Avoid deep-ball WRs and kickers
+    - ⚡ Consider under bets in betting markets
+    
+    **Rain/Snow:**
+    - ✅ Running backs get more volume
+    - ❌ Passing efficiency drops significantly  
+    - ✅ Defense/ST can provide value
+    
+    **Extreme Cold (Under 35°F):**
+    - ✅ Ground-and-pound offenses thrive
+    - ❌ Dome team players struggle outdoors
+    - ✅ Look for pace-of-play decreases
+    """)